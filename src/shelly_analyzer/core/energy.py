@@ -128,6 +128,16 @@ def calculate_energy(
 def filter_by_time(df: pd.DataFrame, start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
     if start is None and end is None:
         return df.copy()
+    # calculate_energy() output is sorted by timestamp: bisect and take one
+    # positional slice instead of building comparison masks over every row.
+    ts = df["timestamp"]
+    if pd.api.types.is_datetime64_any_dtype(ts) and ts.is_monotonic_increasing:
+        try:
+            lo = 0 if start is None else int(ts.searchsorted(start, side="left"))
+            hi = len(ts) if end is None else int(ts.searchsorted(end, side="right"))
+            return df.iloc[lo:max(lo, hi)].copy()
+        except (TypeError, ValueError):
+            pass  # e.g. tz-aware bound vs naive column: let the masks decide
     if start is None:
         return df.loc[df["timestamp"] <= end].copy()
     if end is None:
@@ -11,7 +11,6 @@ import io
 import logging
 import sqlite3
 import threading
-import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -306,6 +305,11 @@ class EnergyDB:
         # sorted ascending. _comp_factor_at(key, ts) returns the right value.
         self._comp_factors: dict = {}
         self._comp_history: dict = {}
+        # Change counters for read-side caches (see samples_version()). Bumped on
+        # every write to a device's samples; the compensation epoch is bumped
+        # when factors change because those scale every read.
+        self._samples_gen: Dict[str, int] = {}
+        self._comp_epoch = 0
         # Ensure schema exists (uses the writer connection).
         conn = self._conn()
         with conn:
@@ -558,6 +562,7 @@ class EnergyDB:
                 conn.executemany(sql, insert_rows)
                 # Update hourly aggregation inside the same transaction.
                 self._update_hourly_inner(conn, device_key, ts_min, ts_max)
+            self._bump_samples(device_key)
 
         return len(insert_rows)
 
@@ -646,6 +651,7 @@ class EnergyDB:
                 conn.executemany(sql, rows)
                 # Update hourly aggregation inside the same transaction.
                 self._update_hourly_inner(conn, device_key, ts_min, ts_max)
+            self._bump_samples(device_key)
 
         return len(rows)
 
@@ -658,6 +664,7 @@ class EnergyDB:
         and is the only factor used when no history exists. A factor of 1.0
         (or missing) is a no-op."""
         self._comp_factors = {str(k): float(v) for k, v in (factors or {}).items()}
+        self._comp_epoch += 1
 
     def set_compensation_history(self, history: dict) -> None:
         """Set per-device time-stamped compensation step function.
@@ -675,6 +682,17 @@ class EnergyDB:
             rows.sort(key=lambda r: r[0])
             cleaned[str(k)] = rows
         self._comp_history = cleaned
+        self._comp_epoch += 1
+
+    def _bump_samples(self, device_key: str) -> None:
+        key = str(device_key)
+        self._samples_gen[key] = self._samples_gen.get(key, 0) + 1
+
+    def samples_version(self, device_key: str) -> Tuple[int, int]:
+        """Opaque token that changes whenever ``query_samples(device_key)`` could
+        return different data (new/deleted samples, changed compensation).
+        Only tracks writes made through this process."""
+        return (self._samples_gen.get(str(device_key), 0), self._comp_epoch)
 
     def _comp_factor(self, device_key: str) -> float:
         """Return the *current* factor — the latest history entry, or the
@@ -1159,6 +1177,7 @@ class EnergyDB:
                     "DELETE FROM hourly_energy WHERE device_key = ? AND hour_ts < ?",
                     (device_key, cutoff_ts),
                 )
+            self._bump_samples(device_key)
 
         return deleted
 
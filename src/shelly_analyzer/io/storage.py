@@ -8,8 +8,6 @@ import shutil
 import time
 from typing import Callable, Dict, List, Optional, Tuple
 
-import pandas as pd
-
 from shelly_analyzer.core.csv_read import read_csv_files
 
 logger = logging.getLogger(__name__)
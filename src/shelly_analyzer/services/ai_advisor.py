@@ -1,8 +1,8 @@
 from __future__ import annotations
 import logging
 import time
-from dataclasses import dataclass, field
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import List
 
 _log = logging.getLogger(__name__)
 
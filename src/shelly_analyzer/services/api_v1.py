@@ -1,8 +1,7 @@
 from __future__ import annotations
-import json
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict
 
 _log = logging.getLogger(__name__)
 
@@ -2,7 +2,7 @@ from __future__ import annotations
 import logging
 import time
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import List, Tuple
 
 _log = logging.getLogger(__name__)
 
@@ -165,7 +165,6 @@ def get_battery_status(db, cfg) -> BatteryStatus:
         # slowly, and mean-power-per-minute preserves the energy integral, so the
         # SOC estimate and cycle detection are unchanged while the point count
         # (and the JSON payload) drops ~30×.
-        import numpy as np
         import pandas as pd
         try:
             _ts_col = df["timestamp"]
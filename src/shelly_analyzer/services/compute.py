@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Optional, Tuple
 
 import pandas as pd
 
@@ -17,24 +17,52 @@ class ComputedDevice:
     df: pd.DataFrame  # includes timestamp, energy_kwh, total_power
 
 
-def load_device(storage: Storage, device: DeviceConfig) -> ComputedDevice:
+# Extra history read in front of a ranged load so the first in-range sample
+# still gets its interval delta from the preceding one.
+RANGE_LOOKBACK_SECONDS = 86400
+
+
+def _empty_device(device: DeviceConfig) -> ComputedDevice:
+    empty = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime([], unit="s"),
+            "total_power": pd.Series([], dtype="float64"),
+            "energy_kwh": pd.Series([], dtype="float64"),
+        }
+    )
+    return ComputedDevice(device_key=device.key, device_name=device.name, df=empty)
+
+
+def load_device(
+    storage: Storage,
+    device: DeviceConfig,
+    start_ts: Optional[int] = None,
+    end_ts: Optional[int] = None,
+) -> ComputedDevice:
+    """Load and compute a device's samples.
+
+    ``start_ts``/``end_ts`` (unix seconds) narrow the storage read instead of
+    parsing the whole history. The result may still contain up to
+    :data:`RANGE_LOOKBACK_SECONDS` of rows before ``start_ts``; callers filter
+    to the exact window with ``filter_by_time``.
+    """
+    ranged = start_ts is not None or end_ts is not None
+    read_start = None if start_ts is None else max(0, int(start_ts) - RANGE_LOOKBACK_SECONDS)
     # Devices without EMData CSV support (e.g. switch/plug devices) should still
     # be usable in Live mode. For these, CSV-based stats/plots are simply empty.
     try:
-        df_raw = storage.read_device_df(device.key)
+        if ranged:
+            df_raw = storage.read_device_df(device.key, start_ts=read_start, end_ts=end_ts)
+        else:
+            df_raw = storage.read_device_df(device.key)
     except Exception:
         if not bool(getattr(device, "supports_emdata", True)):
             # Live-only device (no CSV import). Return an empty frame with the
             # expected columns so plots/summaries can still render as 0.
-            empty = pd.DataFrame(
-                {
-                    "timestamp": pd.to_datetime([], unit="s"),
-                    "total_power": pd.Series([], dtype="float64"),
-                    "energy_kwh": pd.Series([], dtype="float64"),
-                }
-            )
-            return ComputedDevice(device_key=device.key, device_name=device.name, df=empty)
+            return _empty_device(device)
         raise
+    if ranged and df_raw.empty:
+        return _empty_device(device)
 
     df = calculate_energy(df_raw)
     # Ensure numeric
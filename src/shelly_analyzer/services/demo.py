@@ -4,8 +4,7 @@ import math
 import random
 import time
 from dataclasses import dataclass, field
-from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Tuple
 
 from shelly_analyzer.io.config import DeviceConfig, DemoConfig
 from shelly_analyzer.io.storage import Storage
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
 
 from shelly_analyzer.io.http import HttpConfig, ShellyHttp, rpc_call
-from shelly_analyzer.services.device_registry import lookup_by_model_id, lookup_by_mdns
+from shelly_analyzer.services.device_registry import lookup_by_model_id
 
 
 @dataclass(frozen=True)
@@ -258,3 +260,58 @@ def probe_device(
 
     # No Shelly signature matched
     raise ValueError("not a Shelly")
+
+
+# Shared pool for multi-host probes (Settings → "probe all devices"). Bounded
+# so a long host list can't flood the LAN; kept alive across requests so
+# threads aren't respawned.
+_PROBE_POOL_WORKERS = 16
+_probe_pool: Optional[ThreadPoolExecutor] = None
+_probe_pool_lock = threading.Lock()
+
+
+def _get_probe_pool() -> ThreadPoolExecutor:
+    global _probe_pool
+    with _probe_pool_lock:
+        if _probe_pool is None:
+            _probe_pool = ThreadPoolExecutor(
+                max_workers=_PROBE_POOL_WORKERS, thread_name_prefix="ShellyProbe"
+            )
+        return _probe_pool
+
+
+def probe_devices(
+    hosts: Iterable[str],
+    timeout_seconds: float = 2.0,
+    username: str = "",
+    password: str = "",
+) -> Dict[str, Union[DiscoveredDevice, Exception]]:
+    """Probe several hosts concurrently.
+
+    Returns a mapping host -> DiscoveredDevice, or host -> the exception
+    raised by :func:`probe_device` (e.g. ``ValueError("auth_required")``).
+    Total wait is ~one timeout for up to ``_PROBE_POOL_WORKERS`` hosts
+    instead of ``N × timeout`` when probed one after another.
+    """
+    parts: list = []
+    for h in hosts:
+        h = str(h or "").strip()
+        if h and h not in parts:
+            parts.append(h)
+    if not parts:
+        return {}
+
+    ex = _get_probe_pool()
+    futs = {
+        ex.submit(probe_device, h, timeout_seconds, username, password): h
+        for h in parts
+    }
+    results: Dict[str, Union[DiscoveredDevice, Exception]] = {}
+    for fut in as_completed(futs):
+        h = futs[fut]
+        try:
+            results[h] = fut.result()
+        except Exception as e:
+            results[h] = e
+    # Preserve the caller's host order
+    return {h: results[h] for h in parts}
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import date, timedelta, datetime
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Iterable, Optional, Sequence, Tuple, List
+from typing import Dict, Optional, Sequence, Tuple, List
 
 import pandas as pd
 
@@ -423,17 +423,36 @@ def export_pdf_invoice(
     return out_path
 
 
-def export_figure_png(fig, out_path: Path, dpi: int = 150) -> Path:
+def export_figure_png(fig, out_path: Path, dpi: int = 150, tight: bool = True) -> Path:
     """Save a matplotlib Figure as PNG.
 
     This is kept in services/export.py so the UI can reuse it and we have one place
-    that ensures the output directory exists.
+    that ensures the output directory exists. ``tight=False`` skips the extra
+    draw ``bbox_inches="tight"`` needs for figures already laid out with
+    ``tight_layout()``.
     """
     out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(out_path, dpi=int(dpi), bbox_inches="tight")
+    fig.savefig(out_path, dpi=int(dpi), bbox_inches="tight" if tight else None)
     return out_path
 
+
+def tight_layout_once(fig, **kwargs) -> None:
+    """Fit the figure margins with ``tight_layout()`` as its only layout pass.
+
+    ``Figure.tight_layout`` leaves a placeholder layout engine behind, and
+    ``savefig`` runs an extra (non-rasterizing) draw of every artist for any
+    figure that has an engine. The margins are final at this point, so the
+    placeholder is dropped and the save draws the figure exactly once.
+    With ``figure.autolayout`` / ``figure.constrained_layout.use`` set in
+    rcParams, ``set_layout_engine(None)`` installs a real engine that would
+    redo the layout on save; fall back to the inert ``"none"`` placeholder.
+    """
+    fig.tight_layout(**kwargs)
+    fig.set_layout_engine(None)
+    if fig.get_layout_engine() is not None:
+        fig.set_layout_engine("none")
+
 # ---------------- Etappe 6: Energy Report (Variante 1) ----------------
 
 @dataclass(frozen=True)
@@ -721,15 +740,23 @@ def export_pdf_energy_report_variant1(
             c.setFont("Helvetica", 10)
 
     # -------- Device pages --------
+    # Labels are identical on every device page → translate once.
+    lbl_overview = t(lang, 'pdf.report.device_overview')
+    lbl_energy = t(lang, 'pdf.report.energy')
+    lbl_cost = t(lang, 'pdf.report.cost')
+    lbl_peak = t(lang, 'pdf.report.peak')
+    lbl_v_minmax = t(lang, 'pdf.report.v_minmax')
+    lbl_top_hours = t(lang, 'pdf.report.top_hours')
+    lbl_hour = t(lang, 'pdf.col.hour')
     for rep in per_device:
         c.showPage()
         y = _header(f"{title} – {rep.device_name}")
         c.setFont("Helvetica-Bold", 12)
-        c.drawString(2.0 * cm, y, t(lang, 'pdf.report.device_overview'))
+        c.drawString(2.0 * cm, y, lbl_overview)
         y -= 0.7 * cm
         c.setFont("Helvetica", 11)
-        c.drawString(2.0 * cm, y, f"{t(lang, 'pdf.report.energy')}: {_fmt_kwh(rep.kwh_total, lang)} kWh")
-        c.drawString(8.5 * cm, y, f"{t(lang, 'pdf.report.cost')}: {_fmt_money(rep.cost_eur, lang)} €")
+        c.drawString(2.0 * cm, y, f"{lbl_energy}: {_fmt_kwh(rep.kwh_total, lang)} kWh")
+        c.drawString(8.5 * cm, y, f"{lbl_cost}: {_fmt_money(rep.cost_eur, lang)} €")
         y -= 0.6 * cm
         peak_txt = f"{rep.peak_w:,.0f} W"
         if rep.peak_ts is not None:
@@ -737,19 +764,19 @@ def export_pdf_energy_report_variant1(
                 peak_txt += " (" + format_datetime_local(lang, pd.Timestamp(rep.peak_ts)) + ")"
             except Exception:
                 peak_txt += f" ({rep.peak_ts})"
-        c.drawString(2.0 * cm, y, f"{t(lang, 'pdf.report.peak')}: {peak_txt}")
+        c.drawString(2.0 * cm, y, f"{lbl_peak}: {peak_txt}")
         y -= 0.6 * cm
         vtxt = "—"
         if rep.v_min is not None and rep.v_max is not None:
             vtxt = f"{rep.v_min:,.1f} V / {rep.v_max:,.1f} V"
-        c.drawString(2.0 * cm, y, f"{t(lang, 'pdf.report.v_minmax')}: {vtxt}")
+        c.drawString(2.0 * cm, y, f"{lbl_v_minmax}: {vtxt}")
         y -= 0.9 * cm
 
         c.setFont("Helvetica-Bold", 11)
-        c.drawString(2.0 * cm, y, t(lang, 'pdf.report.top_hours'))
+        c.drawString(2.0 * cm, y, lbl_top_hours)
         y -= 0.6 * cm
         c.setFont("Helvetica-Bold", 10)
-        c.drawString(2.0 * cm, y, t(lang, 'pdf.col.hour'))
+        c.drawString(2.0 * cm, y, lbl_hour)
         c.drawRightString(11.0 * cm, y, "kWh")
         c.drawRightString(13.6 * cm, y, "€")
         y -= 0.4 * cm
@@ -837,6 +864,17 @@ class EmailReportData:
 
 # ---------- Matplotlib chart helpers ----------
 
+# Hour-of-day tick labels shared by the 24-bar charts.
+_HOUR_TICK_LABELS = tuple(f"{h:02d}" for h in range(24))
+
+
+def _save_chart_png(fig, out: Path, dpi: int) -> None:
+    """Write a report chart PNG. These are temporary: reportlab decodes them
+    and re-compresses the pixels into the PDF before they are deleted, so the
+    fastest zlib level is used instead of the default 6."""
+    fig.savefig(str(out), dpi=dpi, bbox_inches="tight", facecolor=fig.get_facecolor(),
+                pil_kwargs={"compress_level": 1})
+
 def _make_hourly_chart(hourly_kwh: List[float], lang: str, tmp_dir: Path) -> Optional[Path]:
     """Render a 24-hour bar chart to a temp PNG and return its path."""
     try:
@@ -857,16 +895,15 @@ def _make_hourly_chart(hourly_kwh: List[float], lang: str, tmp_dir: Path) -> Opt
         ax.set_xlabel("Hour", fontsize=8)
         ax.set_ylabel("kWh", fontsize=8)
         ax.set_xticks(hours)
-        ax.set_xticklabels([f"{h:02d}" for h in hours], fontsize=6)
+        ax.set_xticklabels(_HOUR_TICK_LABELS, fontsize=6)
         ax.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.2f"))
         ax.tick_params(axis="y", labelsize=7)
         ax.grid(axis="y", color="#D0DDE8", linewidth=0.6, zorder=0)
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
+        ax.spines[["top", "right"]].set_visible(False)
         fig.tight_layout(pad=0.4)
 
         out = tmp_dir / "_chart_hourly.png"
-        fig.savefig(str(out), dpi=110, bbox_inches="tight", facecolor=fig.get_facecolor())
+        _save_chart_png(fig, out, dpi=110)
         plt.close(fig)
         return out
     except Exception:
@@ -901,12 +938,11 @@ def _make_daily_chart(daily_kwh: List[Tuple[date, float]], lang: str, tmp_dir: P
         ax.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.2f"))
         ax.tick_params(axis="y", labelsize=7)
         ax.grid(axis="y", color="#D0DDE8", linewidth=0.6, zorder=0)
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
+        ax.spines[["top", "right"]].set_visible(False)
         fig.tight_layout(pad=0.4)
 
         out = tmp_dir / "_chart_daily.png"
-        fig.savefig(str(out), dpi=110, bbox_inches="tight", facecolor=fig.get_facecolor())
+        _save_chart_png(fig, out, dpi=110)
         plt.close(fig)
         return out
     except Exception:
@@ -960,17 +996,16 @@ def _make_stacked_hourly_chart(
         ax.set_xlabel("Hour", fontsize=8)
         ax.set_ylabel("kWh", fontsize=8)
         ax.set_xticks(hours)
-        ax.set_xticklabels([f"{h:02d}" for h in hours], fontsize=6)
+        ax.set_xticklabels(_HOUR_TICK_LABELS, fontsize=6)
         ax.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.2f"))
         ax.tick_params(axis="y", labelsize=7)
         ax.grid(axis="y", color="#D0DDE8", linewidth=0.6, zorder=0)
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
+        ax.spines[["top", "right"]].set_visible(False)
         if len(names) > 1:
             ax.legend(fontsize=6, loc="upper right", framealpha=0.7)
         fig.tight_layout(pad=0.4)
         out = tmp_dir / "_chart_stacked_hourly.png"
-        fig.savefig(str(out), dpi=110, bbox_inches="tight", facecolor=fig.get_facecolor())
+        _save_chart_png(fig, out, dpi=110)
         plt.close(fig)
         return out
     except Exception:
@@ -989,7 +1024,6 @@ def _make_stacked_daily_chart(
         import matplotlib.pyplot as plt
         import matplotlib.ticker as mticker
         import numpy as np
-        from datetime import date as _date
 
         names = list(per_device_daily.keys())
         if not names:
@@ -1020,13 +1054,12 @@ def _make_stacked_daily_chart(
         ax.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.2f"))
         ax.tick_params(axis="y", labelsize=7)
         ax.grid(axis="y", color="#D0DDE8", linewidth=0.6, zorder=0)
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
+        ax.spines[["top", "right"]].set_visible(False)
         if len(names) > 1:
             ax.legend(fontsize=6, loc="upper right", framealpha=0.7)
         fig.tight_layout(pad=0.4)
         out = tmp_dir / "_chart_stacked_daily.png"
-        fig.savefig(str(out), dpi=110, bbox_inches="tight", facecolor=fig.get_facecolor())
+        _save_chart_png(fig, out, dpi=110)
         plt.close(fig)
         return out
     except Exception:
@@ -1054,15 +1087,14 @@ def _make_device_mini_chart_hourly(
         ax.set_facecolor("#F8FBFD")
         ax.bar(hours, vals, color=color, width=0.7, zorder=3)
         ax.set_xticks(range(0, 24, 3))
-        ax.set_xticklabels([f"{h:02d}" for h in range(0, 24, 3)], fontsize=6)
+        ax.set_xticklabels(_HOUR_TICK_LABELS[::3], fontsize=6)
         ax.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.2f"))
         ax.tick_params(axis="y", labelsize=6)
         ax.grid(axis="y", color="#D0DDE8", linewidth=0.5, zorder=0)
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
+        ax.spines[["top", "right"]].set_visible(False)
         fig.tight_layout(pad=0.2)
         out = tmp_dir / f"_mini_h_{suffix}.png"
-        fig.savefig(str(out), dpi=100, bbox_inches="tight", facecolor=fig.get_facecolor())
+        _save_chart_png(fig, out, dpi=100)
         plt.close(fig)
         return out
     except Exception:
@@ -1099,11 +1131,10 @@ def _make_device_mini_chart_daily(
         ax.yaxis.set_major_formatter(mticker.FormatStrFormatter("%.2f"))
         ax.tick_params(axis="y", labelsize=6)
         ax.grid(axis="y", color="#D0DDE8", linewidth=0.5, zorder=0)
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
+        ax.spines[["top", "right"]].set_visible(False)
         fig.tight_layout(pad=0.2)
         out = tmp_dir / f"_mini_d_{suffix}.png"
-        fig.savefig(str(out), dpi=100, bbox_inches="tight", facecolor=fig.get_facecolor())
+        _save_chart_png(fig, out, dpi=100)
         plt.close(fig)
         return out
     except Exception:
@@ -1139,15 +1170,14 @@ def _make_top5_bar_chart(
         ax.xaxis.set_major_formatter(mticker.FormatStrFormatter("%.2f"))
         ax.tick_params(axis="x", labelsize=8)
         ax.grid(axis="x", color="#D0DDE8", linewidth=0.6, zorder=0)
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
+        ax.spines[["top", "right"]].set_visible(False)
         # Value labels on bars
         for bar, v in zip(bars, vals):
             ax.text(bar.get_width() * 1.01, bar.get_y() + bar.get_height() / 2,
                     f"{v:.2f}", va="center", fontsize=7)
         fig.tight_layout(pad=0.4)
         out = tmp_dir / "_chart_top5.png"
-        fig.savefig(str(out), dpi=110, bbox_inches="tight", facecolor=fig.get_facecolor())
+        _save_chart_png(fig, out, dpi=110)
         plt.close(fig)
         return out
     except Exception:
@@ -1208,18 +1238,17 @@ def _make_co2_hourly_chart(
         ax.set_xlabel("Hour", fontsize=8)
         ax.set_ylabel("kg CO₂", fontsize=8)
         ax.set_xticks(hours)
-        ax.set_xticklabels([f"{h:02d}" for h in hours], fontsize=6)
+        ax.set_xticklabels(_HOUR_TICK_LABELS, fontsize=6)
         ax.tick_params(axis="y", labelsize=7)
         ax.grid(axis="y", color="#D0DDE8", linewidth=0.6, zorder=0)
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
+        ax.spines[["top", "right"]].set_visible(False)
         title = f"CO₂ Emissions (ENTSO-E) – {total_kg:.3f} kg" if normalize_lang(lang) == "en" \
             else f"CO₂-Emissionen (ENTSO-E) – {total_kg:.3f} kg"
         ax.set_title(title, fontsize=9)
         fig.tight_layout(pad=0.4)
 
         out = tmp_dir / "_chart_co2_hourly.png"
-        fig.savefig(str(out), dpi=110, bbox_inches="tight", facecolor=fig.get_facecolor())
+        _save_chart_png(fig, out, dpi=110)
         plt.close(fig)
         return out
     except Exception:
@@ -1264,15 +1293,14 @@ def _make_co2_daily_chart(
         ax.set_xticklabels(labels, fontsize=6, rotation=45, ha="right")
         ax.tick_params(axis="y", labelsize=7)
         ax.grid(axis="y", color="#D0DDE8", linewidth=0.6, zorder=0)
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
+        ax.spines[["top", "right"]].set_visible(False)
         title = f"CO₂ Emissions (ENTSO-E) – {total_kg:.3f} kg" if normalize_lang(lang) == "en" \
             else f"CO₂-Emissionen (ENTSO-E) – {total_kg:.3f} kg"
         ax.set_title(title, fontsize=9)
         fig.tight_layout(pad=0.4)
 
         out = tmp_dir / "_chart_co2_daily.png"
-        fig.savefig(str(out), dpi=110, bbox_inches="tight", facecolor=fig.get_facecolor())
+        _save_chart_png(fig, out, dpi=110)
         plt.close(fig)
         return out
     except Exception:
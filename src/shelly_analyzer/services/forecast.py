@@ -3,9 +3,8 @@ from __future__ import annotations
 
 import datetime
 import logging
-import math
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 
 import numpy as np
 import pandas as pd
@@ -6,12 +6,14 @@ import time
 import logging
 import concurrent.futures
 import math
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Any, Dict, Iterable, List, Optional
 
 from shelly_analyzer.io.http import ShellyHttp, HttpConfig, get_em_status, get_switch_status
 from shelly_analyzer.io.config import DeviceConfig, DownloadConfig
 
+logger = logging.getLogger(__name__)
+
 
 def _safe_float(x: Any, default: float = 0.0) -> float:
     try:
@@ -169,7 +171,6 @@ class LivePoller:
         self._stop.set()
 
     def _run(self) -> None:
-        log = logging.getLogger(__name__)
         err_count = 0
         while not self._stop.is_set():
             ts = int(time.time())
@@ -204,7 +205,7 @@ class LivePoller:
                     pass
                 err_count += 1
                 try:
-                    log.warning("Live poll failed for %s (%s): %s", self.device.name, self.device.host, e)
+                    logger.warning("Live poll failed for %s (%s): %s", self.device.name, self.device.host, e)
                 except Exception:
                     pass
 
@@ -314,7 +315,6 @@ class MultiLivePoller:
         return min(30.0, float(base) * (2.0 ** min(err_count - 1, 5)))
 
     def _run(self) -> None:
-        log = logging.getLogger(__name__)
         poll = max(0.2, float(self.poll_seconds))
 
         while not self._stop.is_set():
@@ -358,7 +358,7 @@ class MultiLivePoller:
                             except queue.Full:
                                 pass
                             try:
-                                log.warning("Live poll failed for %s (%s): %s", d.name, d.host, e)
+                                logger.warning("Live poll failed for %s (%s): %s", d.name, d.host, e)
                             except Exception:
                                 pass
                 except concurrent.futures.TimeoutError:
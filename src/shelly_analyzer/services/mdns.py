@@ -4,7 +4,7 @@ import re
 import time
 import threading
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List
 
 try:
     # zeroconf is the de-facto Python mDNS/DNS-SD implementation
@@ -10,7 +10,7 @@ import logging
 import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -112,6 +112,16 @@ class MqttPublisher:
         if rc != 0:
             logger.warning("MQTT: unexpected disconnect (rc=%d)", rc)
 
+    def is_due(self, key: str) -> bool:
+        """True if a publish for ``key`` (a device key, or ``"__netz__"`` for
+        the grid data) would be sent now: connected and outside the rate limit.
+
+        Lets callers skip building payloads that would only be dropped.
+        """
+        if not self._connected or self._client is None:
+            return False
+        return (time.time() - self._last_publish.get(key, 0)) >= self.config.publish_interval_seconds
+
     def publish_device_data(
         self,
         device_key: str,
@@ -124,19 +134,15 @@ class MqttPublisher:
             power_w, voltage_v, current_a, energy_kwh,
             power_l1, power_l2, power_l3, freq_hz, cosphi, etc.
         """
-        if not self._connected or self._client is None:
+        # Connected + rate limit
+        if not self.is_due(device_key):
             return
+        now = time.time()
+        self._last_publish[device_key] = now
 
         prefix = self.config.topic_prefix
         dev_topic = f"{prefix}/{device_key}"
 
-        # Rate limit
-        now = time.time()
-        last = self._last_publish.get(device_key, 0)
-        if (now - last) < self.config.publish_interval_seconds:
-            return
-        self._last_publish[device_key] = now
-
         # Send HA discovery configs (once per session)
         if self.config.ha_discovery and device_key not in self._discovery_sent:
             self._send_ha_discovery(device_key, device_name)
@@ -230,12 +236,9 @@ class MqttPublisher:
     def publish_grid_data(self, data: Dict[str, Any]) -> None:
         """Publish grid-wide metrics (spot price, grid CO2 intensity) as a
         synthetic 'Netz' device for Home Assistant auto-discovery."""
-        if not self._connected or self._client is None:
+        if not self.is_due("__netz__"):
             return
         now = time.time()
-        last = self._last_publish.get("__netz__", 0)
-        if (now - last) < self.config.publish_interval_seconds:
-            return
         self._last_publish["__netz__"] = now
         if self.config.ha_discovery and "__netz__" not in self._discovery_sent:
             self._send_grid_discovery()
@@ -1,15 +1,28 @@
 from __future__ import annotations
 import logging
 import time
-from typing import Dict, List, Optional
+from typing import List
 
 _log = logging.getLogger(__name__)
 
+# Sample lines are emitted per device and phase on every scrape; pre-bound
+# str.format callables skip re-parsing the template each time.
+_FMT_DEVICE = '{}{{device="{}",name="{}"}} {}'.format
+_FMT_PHASE = '{}{{device="{}",name="{}",phase="{}"}} {}'.format
+
+# (metric, snapshot row key per phase a/b/c)
+_PHASE_METRICS = (
+    ("shelly_power_watts", ("pa", "pb", "pc")),
+    ("shelly_voltage_volts", ("va", "vb", "vc")),
+    ("shelly_current_amps", ("ia", "ib", "ic")),
+)
+
 
 def generate_metrics(live_state_store, devices, cfg) -> str:
     """Generate Prometheus text exposition format metrics.
 
-    Returns a string in Prometheus text format.
+    ``live_state_store`` is a LiveStateStore or a snapshot already taken from
+    one. Returns a string in Prometheus text format.
     """
     lines: List[str] = []
     now = int(time.time())
@@ -28,10 +41,13 @@ def generate_metrics(live_state_store, devices, cfg) -> str:
     if live_state_store is None:
         return "\n".join(lines) + "\n"
 
-    try:
-        snapshot = live_state_store.snapshot()
-    except Exception:
-        return "\n".join(lines) + "\n"
+    if isinstance(live_state_store, dict):
+        snapshot = live_state_store
+    else:
+        try:
+            snapshot = live_state_store.snapshot()
+        except Exception:
+            return "\n".join(lines) + "\n"
 
     for dev in (devices or []):
         key = dev.key if hasattr(dev, 'key') else str(dev)
@@ -45,31 +61,21 @@ def generate_metrics(live_state_store, devices, cfg) -> str:
         # Total power
         power = last.get("power_total_w")
         if power is not None:
-            lines.append(f'shelly_power_watts{{device="{key}",name="{name}"}} {float(power)}')
-
-        # Per-phase metrics
-        phases = last.get("phases", [])
-        for i, ph in enumerate(phases):
-            if not isinstance(ph, dict):
-                continue
-            phase_label = chr(ord('a') + i)
-
-            p = ph.get("power_w")
-            if p is not None:
-                lines.append(f'shelly_power_watts{{device="{key}",name="{name}",phase="{phase_label}"}} {float(p)}')
-
-            v = ph.get("voltage_v")
-            if v is not None:
-                lines.append(f'shelly_voltage_volts{{device="{key}",name="{name}",phase="{phase_label}"}} {float(v)}')
+            lines.append(_FMT_DEVICE("shelly_power_watts", key, name, float(power)))
 
-            a = ph.get("current_a")
-            if a is not None:
-                lines.append(f'shelly_current_amps{{device="{key}",name="{name}",phase="{phase_label}"}} {float(a)}')
+        # Per-phase metrics (3-phase energy meters only; switches have no phases)
+        if getattr(dev, "kind", "em") == "em":
+            n_phases = max(1, min(3, int(getattr(dev, "phases", 3) or 3)))
+            for metric, row_keys in _PHASE_METRICS:
+                for phase_label, row_key in zip("abc"[:n_phases], row_keys):
+                    v = last.get(row_key)
+                    if v is not None:
+                        lines.append(_FMT_PHASE(metric, key, name, phase_label, float(v)))
 
         # Frequency
         freq = last.get("freq_hz")
         if freq is not None:
-            lines.append(f'shelly_frequency_hz{{device="{key}",name="{name}"}} {float(freq)}')
+            lines.append(_FMT_DEVICE("shelly_frequency_hz", key, name, float(freq)))
 
     # Spot price if available
     if hasattr(cfg, 'spot_price') and cfg.spot_price.enabled:
@@ -4,7 +4,7 @@ import threading
 import time
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Callable
+from typing import List, Optional, Callable
 
 _log = logging.getLogger(__name__)
 
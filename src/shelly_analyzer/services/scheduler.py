@@ -14,9 +14,8 @@ from __future__ import annotations
 
 import logging
 import threading
-import time
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 from shelly_analyzer.io.config import AppConfig, DeviceSchedule
 from shelly_analyzer.io.http import ShellyHttp, set_switch_state
@@ -102,14 +101,14 @@ class LocalScheduler:
         except Exception:
             return
 
-        schedules: List[DeviceSchedule] = list(getattr(cfg, "schedules", []) or [])
+        schedules: Sequence[DeviceSchedule] = getattr(cfg, "schedules", None) or ()
         if not schedules:
             return
 
         # Build a host lookup from device_key -> (host, gen, switch_id_default)
         dev_map: Dict[str, Any] = {}
         for d in getattr(cfg, "devices", []):
-            dev_map[d.key] = d
+            dev_map.setdefault(d.key, d)  # first match wins, like AppState.device_by_key
 
         for sched in schedules:
             if not sched.enabled:
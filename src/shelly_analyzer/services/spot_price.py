@@ -12,10 +12,9 @@ Both APIs are free, public, and require no authentication.
 from __future__ import annotations
 
 import logging
-import math
 import threading
 import time
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 
 import requests
@@ -2,17 +2,10 @@
 from __future__ import annotations
 
 import json
-import os
-import platform
 import re
-import shutil
 import sys
-import tempfile
-import threading
-import time
 import urllib.request
 from dataclasses import dataclass
-from pathlib import Path
 from typing import Optional, Tuple
 
 DEFAULT_TIMEOUT_S = 3.0
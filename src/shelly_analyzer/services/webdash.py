@@ -4,15 +4,16 @@ import gzip
 import json
 import logging
 import html
+import importlib.util
 import inspect
 import time
-import zipfile
 import socket
 import math
 import pkgutil
 import threading
 import sys
 from collections import deque
+from itertools import islice
 from dataclasses import dataclass, field
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
@@ -93,8 +94,10 @@ def _local_ip_guess() -> str:
         return "127.0.0.1"
 
 
-@dataclass
+@dataclass(slots=True)
 class LivePoint:
+    # slots: hundreds of points per device sit in LiveStateStore at any time,
+    # and snapshot()/dump_to_path() read every field of each one.
     ts: int
     power_total_w: float
     va: float
@@ -127,6 +130,37 @@ def _safe_f(v: float) -> float:
     return v if math.isfinite(v) else 0.0
 
 
+def _point_row(p: LivePoint) -> Dict[str, Any]:
+    """JSON row for one point as served by ``LiveStateStore.snapshot``."""
+    return {
+        "ts": p.ts,
+        # Ensure JSON-safe floats (no NaN/Inf) because browsers reject them.
+        "power_total_w": _safe_f(p.power_total_w),
+        "pa": _safe_f(p.pa),
+        "pb": _safe_f(p.pb),
+        "pc": _safe_f(p.pc),
+        "va": _safe_f(p.va),
+        "vb": _safe_f(p.vb),
+        "vc": _safe_f(p.vc),
+        "ia": _safe_f(p.ia),
+        "ib": _safe_f(p.ib),
+        "ic": _safe_f(p.ic),
+        "q_total_var": _safe_f(p.q_total_var),
+        "qa": _safe_f(p.qa),
+        "qb": _safe_f(p.qb),
+        "qc": _safe_f(p.qc),
+        "cosphi_total": _safe_f(p.cosphi_total),
+        "pfa": _safe_f(p.pfa),
+        "pfb": _safe_f(p.pfb),
+        "pfc": _safe_f(p.pfc),
+        "kwh_today": _safe_f(p.kwh_today),
+        "cost_today": _safe_f(p.cost_today),
+        "freq_hz": _safe_f(p.freq_hz),
+        "i_n": _safe_f(p.i_n),
+        "soc_pct": _safe_f(p.soc_pct),
+    }
+
+
 class LiveStateStore:
     """Thread-safe in-memory store for the web dashboard."""
 
@@ -135,6 +169,17 @@ class LiveStateStore:
         self._lock = threading.Lock()
         # deque with maxlen: O(1) append + automatic truncation, no manual slice needed.
         self._by_device: Dict[str, Deque[LivePoint]] = {}
+        # Parallel deques of the JSON rows snapshot() serves. Each row is built
+        # once, lazily: update() only counts the points not serialized yet, so a
+        # headless service with no dashboard open never formats them. Rows are
+        # shared between snapshots and must be treated as read-only.
+        self._rows_by_device: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._rows_pending: Dict[str, int] = {}
+        # NILM results, replaced wholesale by the background service.
+        self._nilm_clusters: List[Dict[str, Any]] = []
+        self._nilm_transition_count: int = 0
+        self._nilm_transitions: List[Dict[str, Any]] = []
+        self._nilm_device_count: int = 0
 
     def set_max_points(self, max_points: int) -> None:
         """Adjust the in-memory retention size.
@@ -147,12 +192,34 @@ class LiveStateStore:
             for k, dq in self._by_device.items():
                 if dq.maxlen != max_points:
                     self._by_device[k] = deque(dq, maxlen=max_points)
+            for k, rows in self._rows_by_device.items():
+                if rows.maxlen != max_points:
+                    self._rows_by_device[k] = deque(rows, maxlen=max_points)
 
     def update(self, device_key: str, point: LivePoint) -> None:
         with self._lock:
-            if device_key not in self._by_device:
-                self._by_device[device_key] = deque(maxlen=self.max_points)
-            self._by_device[device_key].append(point)
+            dq = self._by_device.get(device_key)
+            if dq is None:
+                dq = self._by_device[device_key] = deque(maxlen=self.max_points)
+                self._rows_by_device[device_key] = deque(maxlen=self.max_points)
+                self._rows_pending[device_key] = 0
+            dq.append(point)
+            self._rows_pending[device_key] += 1
+
+    def _rows_locked(self, device_key: str, dq: Deque[LivePoint]) -> Deque[Dict[str, Any]]:
+        """JSON rows for ``dq``, serializing only the points appended since the
+        last call. Both deques share maxlen, so the rows stay aligned with the
+        newest points. Caller holds ``self._lock``."""
+        rows = self._rows_by_device[device_key]
+        n = min(self._rows_pending[device_key], len(dq))
+        if n:
+            if n == len(dq):
+                rows.clear()
+                rows.extend(map(_point_row, dq))
+            else:
+                rows.extend(map(_point_row, reversed(list(islice(reversed(dq), n)))))
+            self._rows_pending[device_key] = 0
+        return rows
 
     # ── Persistence (across restarts / in-app updates) ────────────────
 
@@ -284,48 +351,22 @@ class LiveStateStore:
                         continue
                 if dq:
                     self._by_device[k] = dq
+                    self._rows_by_device[k] = deque(maxlen=self.max_points)
+                    self._rows_pending[k] = len(dq)
                     loaded += len(dq)
         return loaded
 
     def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
-        # Hold lock only long enough to copy references — serialize outside.
+        # Only points added since the last poll get serialized; the rest are
+        # reference copies of cached rows.
         with self._lock:
             snap = {k: list(dq) for k, dq in self._by_device.items()}
-        out: Dict[str, List[Dict[str, Any]]] = {}
-        for k, arr in snap.items():
-            out[k] = [
-                {
-                    "ts": p.ts,
-                    # Ensure JSON-safe floats (no NaN/Inf) because browsers reject them.
-                    "power_total_w": _safe_f(p.power_total_w),
-                    "pa": _safe_f(p.pa),
-                    "pb": _safe_f(p.pb),
-                    "pc": _safe_f(p.pc),
-                    "va": _safe_f(p.va),
-                    "vb": _safe_f(p.vb),
-                    "vc": _safe_f(p.vc),
-                    "ia": _safe_f(p.ia),
-                    "ib": _safe_f(p.ib),
-                    "ic": _safe_f(p.ic),
-                    "q_total_var": _safe_f(p.q_total_var),
-                    "qa": _safe_f(p.qa),
-                    "qb": _safe_f(p.qb),
-                    "qc": _safe_f(p.qc),
-                    "cosphi_total": _safe_f(p.cosphi_total),
-                    "pfa": _safe_f(p.pfa),
-                    "pfb": _safe_f(p.pfb),
-                    "pfc": _safe_f(p.pfc),
-                    "kwh_today": _safe_f(p.kwh_today),
-                    "cost_today": _safe_f(p.cost_today),
-                    "freq_hz": _safe_f(p.freq_hz),
-                    "i_n": _safe_f(p.i_n),
-                    "soc_pct": _safe_f(p.soc_pct),
-                }
-                for p in arr
-            ]
+            out: Dict[str, List[Dict[str, Any]]] = {
+                k: list(self._rows_locked(k, dq)) for k, dq in self._by_device.items()
+            }
         # Appliance hints for the latest reading per device
         appliances: Dict[str, List[Dict[str, Any]]] = {}
-        _ml_clusters = getattr(self, "_nilm_clusters", [])
+        _ml_clusters = self._nilm_clusters
         for k, arr in snap.items():
             if arr:
                 try:
@@ -405,6 +446,33 @@ def _render_template_tokens(tpl: str, values: Dict[str, str]) -> str:
     return out
 
 
+_PLOTLY_JS_UNPROBED = object()
+_PLOTLY_JS_PATH: Any = _PLOTLY_JS_UNPROBED
+
+
+def _probe_plotly_js() -> Optional[Path]:
+    """Locate plotly.min.js inside the installed `plotly` package.
+
+    Uses importlib.util.find_spec so the plotly package itself is never
+    imported just to read a data file. The result is resolved once per process.
+    """
+    global _PLOTLY_JS_PATH
+    if _PLOTLY_JS_PATH is not _PLOTLY_JS_UNPROBED:
+        return _PLOTLY_JS_PATH
+    path: Optional[Path] = None
+    try:
+        spec = importlib.util.find_spec("plotly")
+        for loc in (spec.submodule_search_locations or []) if spec else []:
+            cand = Path(loc) / "package_data" / "plotly.min.js"
+            if cand.is_file():
+                path = cand
+                break
+    except Exception:
+        path = None
+    _PLOTLY_JS_PATH = path
+    return path
+
+
 def _plotly_min_js_bytes() -> bytes:
     """Return plotly.min.js bytes from the python `plotly` package.
 
@@ -412,7 +480,12 @@ def _plotly_min_js_bytes() -> bytes:
     or extra Chrome/Kaleido installs.
     """
     try:
-        data = pkgutil.get_data("plotly", "package_data/plotly.min.js")
+        path = _probe_plotly_js()
+        if path is not None:
+            data = path.read_bytes()
+        else:
+            # Zipped or otherwise non-filesystem installs: let the loader read it.
+            data = pkgutil.get_data("plotly", "package_data/plotly.min.js")
         if data:
             try:
                 # Some plotly distributions ship a UMD wrapper that assigns the factory
@@ -2361,8 +2434,9 @@ document.getElementById('btn-theme').addEventListener('click', function() {{
   root.dataset.theme = next;
   localStorage.setItem('sea_theme', next);
   this.textContent = next === 'dark' ? '☀' : '🌙';
-  // Redraw spot chart with new theme colours
-  if (window._lastSpotChart && window._lastSpotFixedCt != null) {{
+  // Redraw spot chart with new theme colours. Only while its pane is shown:
+  // a hidden canvas measures 0×0, and loadCosts redraws it on activation.
+  if (currentPane === 'costs' && window._lastSpotChart && window._lastSpotFixedCt != null) {{
     _drawSpotChart(window._lastSpotChart, window._lastSpotFixedCt);
   }}
 }});
@@ -2381,6 +2455,7 @@ function switchPaneFromDrawer(name, el) {{
   const btn = document.querySelector('.nav-btn[onclick*="\\'' + name + '\\'"]');
   switchPane(name, btn || null);
 }}
+let _paneActivateTimer = null;
 function switchPane(name, btn) {{
   document.querySelectorAll('.pane').forEach(p => p.classList.remove('active'));
   document.querySelectorAll('.nav-btn').forEach(b => b.classList.remove('active'));
@@ -2396,7 +2471,13 @@ function switchPane(name, btn) {{
   // Scroll to top when switching tabs so content starts at the top
   const pc = document.getElementById('panes');
   if (pc) pc.scrollTop = 0;
-  onPaneActivated(name);
+  // The pane itself switches at once; its data load is deferred briefly so
+  // clicking through several tabs only loads (and renders) the one landed on.
+  clearTimeout(_paneActivateTimer);
+  _paneActivateTimer = setTimeout(function() {{
+    _paneActivateTimer = null;
+    onPaneActivated(currentPane);
+  }}, 50);
 }}
 
 function onPaneActivated(name) {{
@@ -3857,17 +3938,17 @@ async function loadHistory() {{
         if (!buf || !buf.length) continue;
         const bt = wndTimes(buf);
         const sp = document.getElementById('sp-' + key);
-        if (sp) {{ const sa = _sparkArgs(key, buf); drawSparkline(sp, sa.vals, sa.color, false, sa.sign, bt, sa.share); }}
+        if (sp) {{ const sa = _sparkArgs(key, buf); _queueSparkline(sp, sa.vals, sa.color, false, sa.sign, bt, sa.share); }}
         const spv = document.getElementById('sp-v-' + key);
-        if (spv) drawSparkline(spv, wndVals(buf, 'v'), '#f59e0b', true, false, bt);
+        if (spv) _queueSparkline(spv, wndVals(buf, 'v'), '#f59e0b', true, false, bt);
         const spa = document.getElementById('sp-a-' + key);
-        if (spa) drawSparkline(spa, wndVals(buf, 'a'), '#10b981', true, false, bt);
+        if (spa) _queueSparkline(spa, wndVals(buf, 'a'), '#10b981', true, false, bt);
         const spq = document.getElementById('sp-q-' + key);
-        if (spq) drawSparkline(spq, wndVals(buf, 'q'), '#ef4444', true, false, bt);
+        if (spq) _queueSparkline(spq, wndVals(buf, 'q'), '#ef4444', true, false, bt);
         const spin = document.getElementById('sp-in-' + key);
-        if (spin) drawSparkline(spin, wndVals(buf, 'i_n'), '#a855f7', true, false, bt);
+        if (spin) _queueSparkline(spin, wndVals(buf, 'i_n'), '#a855f7', true, false, bt);
         const sphz = document.getElementById('sp-hz-' + key);
-        if (sphz) drawSparkline(sphz, wndVals(buf, 'hz'), '#06b6d4', true, false, bt);
+        if (sphz) _queueSparkline(sphz, wndVals(buf, 'hz'), '#06b6d4', true, false, bt);
       }}
     }}
   }} catch(e) {{ /* silent */ }} finally {{ _historyLoading = false; }}
@@ -3957,10 +4038,14 @@ function toggleRawView() {{
   tick(true);
   // Single control: also drive the embedded Plots iframe (its own checkbox is
   // hidden when embedded, so this pill is the one switch for Live + Plots).
-  try {{
-    var _pf = document.getElementById('plots-frame');
-    if (_pf && _pf.contentWindow && _pf.contentWindow.__setPlotsRaw) _pf.contentWindow.__setPlotsRaw(_rawView);
-  }} catch(e){{}}
+  // While the Plots pane is hidden nothing is pushed: onPaneActivated syncs the
+  // iframe to the pill when the pane is opened, so it is only rebuilt once.
+  if (currentPane === 'plots') {{
+    try {{
+      var _pf = document.getElementById('plots-frame');
+      if (_pf && _pf.contentWindow && _pf.contentWindow.__setPlotsRaw) _pf.contentWindow.__setPlotsRaw(_rawView);
+    }} catch(e){{}}
+  }}
   // The heatmap and the energy-flow (sankey) also net meter-behind-meter —
   // reload whichever is the open pane so it switches net<->gross with the pill.
   try {{
@@ -4120,7 +4205,7 @@ function renderLive(data, first) {{
       updateDeviceCard(grid.children[i], d);
     }});
   }}
-  if (_cdState) requestAnimationFrame(_drawDetailChart);
+  if (_cdState) _cdScheduleDraw();
 }}
 
 // Subtle per-device card tints — same palette/idea as the Plots page groups,
@@ -4345,22 +4430,22 @@ function updateDeviceCard(card, d) {{
   const bt = buf ? wndTimes(buf) : null;
   // Main power sparkline (flow-role coloured: PV green, battery/grid signed)
   const sp = document.getElementById('sp-' + d.key);
-  if (sp && buf) {{ const sa = _sparkArgs(d.key, buf); drawSparkline(sp, sa.vals, sa.color, false, sa.sign, bt, sa.share); }}
+  if (sp && buf) {{ const sa = _sparkArgs(d.key, buf); _queueSparkline(sp, sa.vals, sa.color, false, sa.sign, bt, sa.share); }}
   // Voltage sparkline (relative scale so variation is visible)
   const spv = document.getElementById('sp-v-' + d.key);
-  if (spv && buf) drawSparkline(spv, wndVals(buf, 'v'), '#f59e0b', true, false, bt);
+  if (spv && buf) _queueSparkline(spv, wndVals(buf, 'v'), '#f59e0b', true, false, bt);
   // Current sparkline
   const spa = document.getElementById('sp-a-' + d.key);
-  if (spa && buf) drawSparkline(spa, wndVals(buf, 'a'), '#10b981', true, false, bt);
+  if (spa && buf) _queueSparkline(spa, wndVals(buf, 'a'), '#10b981', true, false, bt);
   // Reactive power sparkline
   const spq = document.getElementById('sp-q-' + d.key);
-  if (spq && buf) drawSparkline(spq, wndVals(buf, 'q'), '#ef4444', true, false, bt);
+  if (spq && buf) _queueSparkline(spq, wndVals(buf, 'q'), '#ef4444', true, false, bt);
   // Neutral current sparkline
   const spin = document.getElementById('sp-in-' + d.key);
-  if (spin && buf) drawSparkline(spin, wndVals(buf, 'i_n'), '#a855f7', true, false, bt);
+  if (spin && buf) _queueSparkline(spin, wndVals(buf, 'i_n'), '#a855f7', true, false, bt);
   // Frequency (Hz) sparkline – relative scale (grid freq varies narrowly)
   const sphz = document.getElementById('sp-hz-' + d.key);
-  if (sphz && buf) drawSparkline(sphz, wndVals(buf, 'hz'), '#06b6d4', true, false, bt);
+  if (sphz && buf) _queueSparkline(sphz, wndVals(buf, 'hz'), '#06b6d4', true, false, bt);
   // Update expand section detail values (voltage, current, cos φ, freq, phases)
   const exp = card.querySelector('.dev-expand');
   if (exp) {{
@@ -4436,14 +4521,59 @@ function updateDeviceCard(card, d) {{
 /* ──────────────────────────────────────────────
    SPARKLINE
 ────────────────────────────────────────────── */
-function drawSparkline(canvas, values, color, relMin, signColor, times, shareArr) {{
+// Size the backing store to whole device pixels so the browser shows it 1:1
+// instead of resampling a fractional buffer; at dpr 1 no transform is needed.
+// Assigning width/height reallocates the buffer even for the same value, so
+// live redraws at an unchanged size keep it (callers clearRect themselves).
+function _fitCanvas(canvas, W, H) {{
   const dpr = window.devicePixelRatio || 1;
+  const bw = Math.round(W * dpr), bh = Math.round(H * dpr);
+  if (canvas.width !== bw || canvas.height !== bh) {{
+    canvas.width = bw;
+    canvas.height = bh;
+  }}
+  const ctx = canvas.getContext('2d');
+  if (dpr !== 1) ctx.setTransform(W ? bw / W : dpr, 0, 0, H ? bh / H : dpr, 0, 0);
+  return ctx;
+}}
+
+// Theme colours for the live canvases, probed once per data-theme instead of
+// via getComputedStyle (a forced style recalc) on every sparkline and frame.
+let _liveColors = null, _liveColorsFor = null;
+function liveColors() {{
+  const theme = document.documentElement.dataset.theme || '';
+  if (_liveColors === null || _liveColorsFor !== theme) {{
+    const cs = getComputedStyle(document.documentElement);
+    _liveColors = {{
+      accent: cs.getPropertyValue('--accent').trim() || '#2563eb',
+      muted: cs.getPropertyValue('--muted').trim() || '#64748b',
+      border: cs.getPropertyValue('--border').trim() || '#334155',
+    }};
+    _liveColorsFor = theme;
+  }}
+  return _liveColors;
+}}
+
+// Live polls and the history merge redraw up to six sparklines per device
+// card. Draws are queued per canvas (latest arguments win) and flushed in one
+// frame, so canvases are measured after the card text updates instead of
+// forcing a layout per card, and a canvas queued twice is drawn once.
+const _sparkPending = new Map();
+let _sparkRaf = 0;
+function _queueSparkline(canvas) {{
+  _sparkPending.set(canvas, Array.prototype.slice.call(arguments, 1));
+  if (_sparkRaf) return;
+  _sparkRaf = requestAnimationFrame(function() {{
+    _sparkRaf = 0;
+    const batch = Array.from(_sparkPending);
+    _sparkPending.clear();
+    batch.forEach(function(e) {{ drawSparkline.apply(null, [e[0]].concat(e[1])); }});
+  }});
+}}
+function drawSparkline(canvas, values, color, relMin, signColor, times, shareArr) {{
   const W = canvas.offsetWidth || 200;
   const H = canvas.offsetHeight || 56;
-  canvas.width = W * dpr;
-  canvas.height = H * dpr;
-  const ctx = canvas.getContext('2d');
-  ctx.scale(dpr, dpr);
+  const ctx = _fitCanvas(canvas, W, H);
   ctx.clearRect(0, 0, W, H);
   if (!values || values.length < 2) return;
   const dMax = Math.max(...values);
@@ -4457,8 +4587,7 @@ function drawSparkline(canvas, values, color, relMin, signColor, times, shareArr
   const pad = 4;
   const sx = (W - pad*2) / (values.length - 1);
   const zeroY = H - pad - ((0 - min) / range) * (H - pad*2);
-  const cs = getComputedStyle(document.documentElement);
-  const accent = color || cs.getPropertyValue('--accent').trim() || '#2563eb';
+  const accent = color || liveColors().accent;
   const _y = function(v) {{ return H - pad - ((v - min) / range) * (H - pad*2); }};
   // Time-based x-axis when timestamps are supplied: every series maps onto the
   // SAME fixed window [now − liveWindowSec, now], so plots with different sample
@@ -4563,13 +4692,9 @@ function drawSparkline(canvas, values, color, relMin, signColor, times, shareArr
   ctx.stroke();
 }}
 function drawMultiSparkline(canvas, seriesArr, colors) {{
-  const dpr = window.devicePixelRatio || 1;
   const W = canvas.offsetWidth || 200;
   const H = canvas.offsetHeight || 40;
-  canvas.width = W * dpr;
-  canvas.height = H * dpr;
-  const ctx = canvas.getContext('2d');
-  ctx.scale(dpr, dpr);
+  const ctx = _fitCanvas(canvas, W, H);
   ctx.clearRect(0, 0, W, H);
   if (!seriesArr || !seriesArr.length) return;
   const n = seriesArr[0].length;
@@ -4602,6 +4727,16 @@ function drawMultiSparkline(canvas, seriesArr, colors) {{
 ────────────────────────────────────────────── */
 const _PHASE_COLORS = ['#e05c5c','#5ca0e0','#5ce077'];
 let _cdState = null;
+// Pointer moves, resize-observer ticks and live updates can all land within
+// one frame; they share a single pending frame so the chart is drawn once.
+let _cdDrawRaf = 0;
+function _cdScheduleDraw() {{
+  if (_cdDrawRaf) return;
+  _cdDrawRaf = requestAnimationFrame(function() {{
+    _cdDrawRaf = 0;
+    _drawDetailChart();
+  }});
+}}
 
 function openDetailChart(devKey, metric, title) {{
   const buf = sparkData[devKey];
@@ -4611,7 +4746,7 @@ function openDetailChart(devKey, metric, title) {{
   document.getElementById('chart-detail-title').textContent = title;
   _buildDetailLegend(devKey, metric);
   document.getElementById('chart-detail-modal').classList.add('open');
-  requestAnimationFrame(_drawDetailChart);
+  _cdScheduleDraw();
 }}
 
 function closeDetailChart() {{
@@ -4633,13 +4768,13 @@ function toggleDetailFullscreen() {{
   const btn = document.getElementById('chart-detail-fs-btn');
   panel.classList.toggle('fullscreen');
   if (btn) btn.textContent = panel.classList.contains('fullscreen') ? '⊡' : '⛶';
-  requestAnimationFrame(_drawDetailChart);
+  _cdScheduleDraw();
 }}
 
 // Redraw chart when panel is resized (drag handle or fullscreen toggle)
 try {{
   new ResizeObserver(function() {{
-    if (_cdState) requestAnimationFrame(_drawDetailChart);
+    if (_cdState) _cdScheduleDraw();
   }}).observe(document.getElementById('chart-detail-panel') || document.body);
 }} catch(e) {{}}
 
@@ -4649,8 +4784,7 @@ function _buildDetailLegend(devKey, metric) {{
   legend.innerHTML = '';
   let maxPh = 0;
   if (buf) buf.forEach(function(p) {{ if (p.phases && p.phases.length > maxPh) maxPh = p.phases.length; }});
-  const cs = getComputedStyle(document.documentElement);
-  const accent = cs.getPropertyValue('--accent').trim() || '#2563eb';
+  const accent = liveColors().accent;
   const totalColor = metric === 'v' ? '#f59e0b' : metric === 'a' ? '#10b981' : metric === 'q' ? '#ef4444' : accent;
   const items = [];
   if (metric === 'ph' || metric === 'v') {{
@@ -4680,18 +4814,14 @@ function _drawDetailChart() {{
   if (!canvas || !canvas.offsetWidth) return;
   const buf = sparkData[_cdState.devKey];
   if (!buf || buf.length < 2) return;
-  const dpr = window.devicePixelRatio || 1;
   const W = canvas.offsetWidth;
   const H = canvas.offsetHeight || 300;
-  canvas.width = W * dpr;
-  canvas.height = H * dpr;
-  const ctx = canvas.getContext('2d');
-  ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+  const ctx = _fitCanvas(canvas, W, H);
   ctx.clearRect(0, 0, W, H);
-  const cs = getComputedStyle(document.documentElement);
-  const mutedColor = cs.getPropertyValue('--muted').trim() || '#64748b';
-  const borderColor = cs.getPropertyValue('--border').trim() || '#334155';
-  const accent = cs.getPropertyValue('--accent').trim() || '#2563eb';
+  const lc = liveColors();
+  const mutedColor = lc.muted;
+  const borderColor = lc.border;
+  const accent = lc.accent;
   const metric = _cdState.metric;
   const n = buf.length;
   const xScale = Math.max(1.0, Math.min(n/2, _cdState.xScale));
@@ -4747,6 +4877,9 @@ function _drawDetailChart() {{
   const yMin = allMin-yPad, yMax = allMax+yPad, yRange = yMax-yMin||1;
   const padL=52, padR=12, padT=12, padB=34;
   const cW=W-padL-padR, cH=H-padT-padB;
+  // Pan handlers convert pixels to points with this; reading offsetWidth on
+  // every pointer move would force a layout per event.
+  _cdState.plotW = cW;
   function toX(i) {{ return padL+(i/(visPts.length-1))*cW; }}
   function toY(v) {{ return padT+cH-((v-yMin)/yRange)*cH; }}
   // Grid + Y-axis labels
@@ -4770,12 +4903,19 @@ function _drawDetailChart() {{
   }});
   // Series lines — only dash si===0 when it is the aggregate total (w/a), not a phase line (v/ph/in)
   const _hasTotalSeries = (metric==='w'||metric==='a'||metric==='q') && maxPh>0;
+  // While dragging/pinching, stride down to about one point per pixel column;
+  // the settled frame after release draws every sample again.
+  const interacting = _cdState.dragging || !!_cdState.pinchDist;
+  const step = interacting ? Math.max(1, Math.floor(visPts.length / Math.max(1, cW))) : 1;
   series.forEach(function(s, si) {{
     ctx.setLineDash((si===0&&_hasTotalSeries) ? [5,3] : []);
     ctx.strokeStyle=colors[si];
     ctx.lineWidth=(si===0&&_hasTotalSeries) ? 1.5 : 2;
     ctx.beginPath();
-    s.forEach(function(v,i) {{ i===0 ? ctx.moveTo(toX(i),toY(v)) : ctx.lineTo(toX(i),toY(v)); }});
+    const last = s.length - 1;
+    ctx.moveTo(toX(0), toY(s[0]));
+    for (let i = step; i < last; i += step) ctx.lineTo(toX(i), toY(s[i]));
+    ctx.lineTo(toX(last), toY(s[last]));
     ctx.stroke();
   }});
   ctx.setLineDash([]);
@@ -4812,7 +4952,7 @@ function _fmtAxisVal(v, metric) {{
       const oldVis = n/oldScale, newVis = n/newScale;
       _cdState.xOffset = (_cdState.xOffset||0) + cx*(oldVis-newVis);
       _cdState.xScale = newScale;
-      requestAnimationFrame(_drawDetailChart);
+      _cdScheduleDraw();
     }}, {{passive: false}});
     canvas.addEventListener('mousedown', function(e) {{
       if (!_cdState) return;
@@ -4823,11 +4963,13 @@ function _fmtAxisVal(v, metric) {{
       const buf = sparkData[_cdState.devKey]; if (!buf) return;
       const n = buf.length;
       const visCount = n/Math.max(1.0, _cdState.xScale||1);
-      const pxPerPt = (canvas.offsetWidth-64)/visCount;
+      const pxPerPt = (_cdState.plotW || (canvas.offsetWidth-64))/visCount;
       _cdState.xOffset = (_cdState.dragOff||0) - (e.clientX-_cdState.dragX)/pxPerPt;
-      requestAnimationFrame(_drawDetailChart);
+      _cdScheduleDraw();
+    }});
+    window.addEventListener('mouseup', function() {{
+      if (_cdState && _cdState.dragging) {{ _cdState.dragging = false; _cdScheduleDraw(); }}
     }});
-    window.addEventListener('mouseup', function() {{ if (_cdState) _cdState.dragging = false; }});
     canvas.addEventListener('touchstart', function(e) {{
       if (!_cdState) return;
       if (e.touches.length === 1) {{
@@ -4845,18 +4987,23 @@ function _fmtAxisVal(v, metric) {{
         const buf = sparkData[_cdState.devKey]; if (!buf) return;
         const n = buf.length;
         const visCount = n/Math.max(1.0, _cdState.xScale||1);
-        const pxPerPt = (canvas.offsetWidth-64)/visCount;
+        const pxPerPt = (_cdState.plotW || (canvas.offsetWidth-64))/visCount;
         _cdState.xOffset = (_cdState.dragOff||0) - (e.touches[0].clientX-_cdState.dragX)/pxPerPt;
-        requestAnimationFrame(_drawDetailChart);
+        _cdScheduleDraw();
       }} else if (e.touches.length === 2 && _cdState.pinchDist) {{
         const dist = Math.hypot(e.touches[0].clientX-e.touches[1].clientX, e.touches[0].clientY-e.touches[1].clientY);
         const buf = sparkData[_cdState.devKey]; if (!buf) return;
         const n = buf.length;
         _cdState.xScale = Math.min(n/2, Math.max(1.0, (_cdState.pinchScale||1)*(dist/_cdState.pinchDist)));
-        requestAnimationFrame(_drawDetailChart);
+        _cdScheduleDraw();
       }}
     }}, {{passive: true}});
-    canvas.addEventListener('touchend', function() {{ if (_cdState) {{ _cdState.dragging = false; _cdState.pinchDist = null; }} }}, {{passive: true}});
+    canvas.addEventListener('touchend', function() {{
+      if (!_cdState) return;
+      const settled = _cdState.dragging || _cdState.pinchDist;
+      _cdState.dragging = false; _cdState.pinchDist = null;
+      if (settled) _cdScheduleDraw();
+    }}, {{passive: true}});
   }}
   if (document.readyState === 'loading') document.addEventListener('DOMContentLoaded', _cdSetup);
   else _cdSetup();
@@ -5430,6 +5577,20 @@ var _hmCache = {{}};      // key -> {{data, ts}}
 var _hmInflight = {{}};   // key -> Promise (dedupe concurrent fetches)
 var _hmPrefetching = false;
 var _HM_STALE_MS = 30000; // silently re-fetch cached entries older than this
+var _HM_CACHE_MAX = 64;   // least recently used responses are dropped beyond this
+// _hmCache keeps insertion order (keys are never numeric), so re-inserting on
+// use makes the first key the least recently used one.
+function _hmCacheGet(key) {{
+  var e = _hmCache[key];
+  if (e) {{ delete _hmCache[key]; _hmCache[key] = e; }}
+  return e;
+}}
+function _hmCachePut(key, data) {{
+  delete _hmCache[key];
+  _hmCache[key] = {{ data: data, ts: Date.now() }};
+  var ks = Object.keys(_hmCache);
+  for (var i = 0; ks.length - i > _HM_CACHE_MAX; i++) delete _hmCache[ks[i]];
+}}
 function _hmKey(device, year, unit, raw) {{
   return device + '|' + year + '|' + unit + '|' + (raw ? '1' : '0');
 }}
@@ -5448,7 +5609,7 @@ function _hmFetch(device, year, unit, raw) {{
     if (!r.ok) throw new Error(r.status);
     return r.json();
   }}).then(function(data) {{
-    _hmCache[key] = {{ data: data, ts: Date.now() }};
+    _hmCachePut(key, data);
     return data;
   }});
   // Drop the in-flight marker whether the fetch resolves or rejects.
@@ -5485,7 +5646,7 @@ async function loadHeatmap() {{
   }}
   const raw = _rawView;
   const key = _hmKey(device, year, unit, raw);
-  const cached = _hmCache[key];
+  const cached = _hmCacheGet(key);
   if (cached) {{
     // Instant render from cache — no blanking, no flicker.
     _hmRender(cached.data, unit);
@@ -10396,6 +10557,15 @@ try {
   document.documentElement.dataset.theme = theme;
 } catch (e) {}
 
+// True while embedded in a dashboard pane that is not shown (display:none on
+// the iframe or one of its ancestors); plots drawn then are never seen.
+function embeddedHidden(){
+  try {
+    const fe = window.frameElement;
+    return !!fe && fe.getClientRects().length === 0;
+  } catch (e) { return false; }
+}
+
 // Listen for theme changes made in the parent dashboard (when /plots is embedded
 // as iframe in the Plots tab). The parent writes localStorage 'sea_theme' on toggle,
 // which fires a storage event in this iframe since they share origin.
@@ -10404,8 +10574,10 @@ try {
     if (ev && ev.key === 'sea_theme' && ev.newValue) {
       document.documentElement.dataset.theme = ev.newValue;
       try { if (typeof updateThemeButton === 'function') updateThemeButton(); } catch(e){}
-      // Re-render plots so line/grid/font colours match the new theme
-      try { if (window.__scheduleApplyPlots) window.__scheduleApplyPlots(50); } catch(e){}
+      // Recolour plots so line/grid/font colours match the new theme. A hidden
+      // Plots pane is skipped: the dashboard re-applies the plots when the pane
+      // is opened again, and that rebuild picks up the new theme colours.
+      if (!embeddedHidden()) { try { restylePlotsForTheme(); } catch(e){} }
     }
   });
 } catch (e) {}
@@ -10418,8 +10590,8 @@ function toggleTheme(){
     document.documentElement.dataset.theme = nxt;
     localStorage.setItem(LS_THEME, nxt);
     updateThemeButton();
-    // re-render plots with matching colors
-    try { if (window.__scheduleApplyPlots) window.__scheduleApplyPlots(50); } catch (e) {}
+    // recolour plots with matching colors
+    try { restylePlotsForTheme(); } catch (e) {}
   } catch (e) {}
 }
 
@@ -10522,17 +10694,56 @@ async function fetchJsonWithTimeout(url, timeoutMs=60000){
   }
 }
 
-function cssVar(name){
-  try { return getComputedStyle(document.documentElement).getPropertyValue(name).trim(); } catch (e) { return ''; }
-}
 // Plots tab always uses the simple static view (no zoom/pan) regardless of
 // viewport – per user preference, identical to the mobile experience.
 function isMobileView(){
   return true;
 }
+// getComputedStyle forces a style recalc; the theme colours only change with
+// data-theme, so they are read once per theme instead of once per chart.
+let _themeColors = null, _themeColorsFor = null;
+function themeColors(){
+  const theme = document.documentElement.dataset.theme || '';
+  if (_themeColors === null || _themeColorsFor !== theme) {
+    let fg = '', border = '';
+    try {
+      const cs = getComputedStyle(document.documentElement);
+      fg = cs.getPropertyValue('--fg').trim();
+      border = cs.getPropertyValue('--border').trim();
+    } catch (e) {}
+    _themeColors = { fg: fg || '#111827', border: border || 'rgba(0,0,0,0.12)' };
+    _themeColorsFor = theme;
+  }
+  return _themeColors;
+}
+// A theme flip only changes the themed layout colours; relayout the plots in
+// place instead of refetching /api/plots_data and rebuilding every card.
+// Only keys the plot's layout already sets are touched: callers that pass their
+// own xaxis/yaxis to plotlyBaseLayout() replace the themed grid colours, and
+// those plots must keep Plotly's default grid after a theme flip too.
+const _THEMED_LAYOUT_KEYS = [
+  ['font', 'color', 'fg'], ['legend.font', 'color', 'fg'],
+  ['xaxis', 'gridcolor', 'border'], ['xaxis', 'zerolinecolor', 'border'],
+  ['yaxis', 'gridcolor', 'border'], ['yaxis', 'zerolinecolor', 'border'],
+];
+function restylePlotsForTheme(){
+  if (!window.Plotly) return;
+  const tc = themeColors();
+  document.querySelectorAll('.js-plotly-plot').forEach(function(el){
+    const lay = el.layout || {};
+    const upd = {};
+    _THEMED_LAYOUT_KEYS.forEach(function(k){
+      const obj = k[0].split('.').reduce(function(o, p){ return o ? o[p] : undefined; }, lay);
+      if (obj && obj[k[1]] !== undefined) upd[k[0] + '.' + k[1]] = tc[k[2]];
+    });
+    if (!Object.keys(upd).length) return;
+    try { Plotly.relayout(el, upd); } catch (e) {}
+  });
+}
 function plotlyBaseLayout(extra){
-  const fg = cssVar('--fg') || '#111827';
-  const border = cssVar('--border') || 'rgba(0,0,0,0.12)';
+  const tc = themeColors();
+  const fg = tc.fg;
+  const border = tc.border;
   const grid = border;
   const mobile = isMobileView();
   const base = {
@@ -10558,7 +10769,7 @@ function plotlyBaseLayout(extra){
 function plotlyConfig(extra){
   const mobile = isMobileView();
   const base = {
-    responsive: true,
+    responsive: false,  // resized by the shared handler below
     displaylogo: false,
     displayModeBar: mobile ? false : 'hover',
     scrollZoom: !mobile,
@@ -10567,6 +10778,36 @@ function plotlyConfig(extra){
   };
   return Object.assign(base, extra || {});
 }
+// One debounced pass resizes the plots whose box actually changed. Plotly's
+// responsive mode redraws every plot on every window resize, including the
+// height-only ones a mobile address bar causes (.plot height is fixed by CSS).
+let _plotsResizeTimer = null;
+window.addEventListener('resize', function(){
+  clearTimeout(_plotsResizeTimer);
+  _plotsResizeTimer = setTimeout(function(){
+    if (!window.Plotly || embeddedHidden()) return;
+    document.querySelectorAll('.js-plotly-plot').forEach(function(el){
+      const fl = el._fullLayout;
+      if (fl && fl.width === el.clientWidth && fl.height === el.clientHeight) return;
+      try { Plotly.Plots.resize(el); } catch (e) {}
+    });
+  }, 150);
+});
+// Dense line traces render through WebGL (scattergl): redrawing SVG paths with
+// many thousand points makes every responsive resize sluggish. Falls back to
+// SVG without WebGL; ?gl=0 opts out.
+const GL_MIN_POINTS = 2000;
+let _webglOk = null;
+function lineTraceType(n){
+  if (!(n > GL_MIN_POINTS) || String(qp().gl || '') === '0') return 'scatter';
+  if (_webglOk === null) {
+    try {
+      const c = document.createElement('canvas');
+      _webglOk = !!(window.WebGLRenderingContext && (c.getContext('webgl') || c.getContext('experimental-webgl')));
+    } catch (e) { _webglOk = false; }
+  }
+  return _webglOk ? 'scattergl' : 'scatter';
+}
 
 
 function refreshDevChipStyles(){
@@ -11153,7 +11394,7 @@ async function loadData() {
         const isN = (String(k).toUpperCase() === 'N');
         const label = isN ? t('web.plots.phase.n') : k;
         const tr = {
-          type:'scatter', mode:'lines',
+          type: lineTraceType((p.x || xs).length), mode:'lines',
           name: label,
           x: p.x || xs,
           y: applyVarCosphiFilters((p.x || xs), (p.y || []), metricKey, opts)
@@ -11165,7 +11406,7 @@ async function loadData() {
       });
     } else {
       // Total only (default). If phases selected but unavailable, fall back silently.
-      traces = [{type:'scatter', mode:'lines', name: t('web.plots.series.total'), x: xs, y: applyVarCosphiFilters(xs, ys, metricKey, opts)}];
+      traces = [{type: lineTraceType(xs.length), mode:'lines', name: t('web.plots.series.total'), x: xs, y: applyVarCosphiFilters(xs, ys, metricKey, opts)}];
     }
 
     Plotly.newPlot(
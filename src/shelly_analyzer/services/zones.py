@@ -24,7 +24,7 @@ present, otherwise ENTSO-E.
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Tuple
+from typing import List, Tuple
 
 # ── Spot-price zones ─────────────────────────────────────────────────
 
@@ -1,22 +1,19 @@
 """Flask web application for the Shelly Energy Analyzer."""
 from __future__ import annotations
 
-import gzip
 import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Dict, Optional
 
 from flask import Flask
 
-from shelly_analyzer.io.config import AppConfig, load_config
+from shelly_analyzer.io.config import load_config
 from shelly_analyzer.io.storage import Storage
-from shelly_analyzer.i18n import get_lang_map, normalize_lang, t as _t
+from shelly_analyzer.i18n import get_lang_map, t as _t
 from shelly_analyzer.services.webdash import (
-    LiveStateStore,
     _render_template,
     _render_template_tokens,
-    _plotly_min_js_bytes,
     _HTML_TEMPLATE,
     _PLOTS_TEMPLATE,
     _CONTROL_TEMPLATE,
@@ -359,7 +356,7 @@ def create_app(config_path: Optional[str] = None) -> Flask:
         if _healed:
             save_config(state.cfg, cfg_path)
     except Exception:
-        logging.getLogger(__name__).debug("persist meter-child heal failed", exc_info=True)
+        logger.debug("persist meter-child heal failed", exc_info=True)
 
     # Create Flask app
     app = Flask(
@@ -431,12 +428,8 @@ button{{width:100%;padding:10px;border-radius:12px;border:none;background:#6aa7f
         logger.info("Authentication disabled (no token configured)")
 
     # Pre-render HTML pages (same approach as webdash.py — render once at startup)
-    state._dashboard_html = _render_dashboard_html(state)
-    state._dashboard_html_gz = gzip.compress(state._dashboard_html, compresslevel=6)
-    state._control_html = _render_control_html(state)
-    state._control_html_gz = gzip.compress(state._control_html, compresslevel=6)
-    state._plots_html = _render_plots_html(state)
-    state._plots_html_gz = gzip.compress(state._plots_html, compresslevel=6)
+    for _page in ("dashboard", "control", "plots"):
+        state.page_html(_page)
 
     # Register blueprints
     from shelly_analyzer.web.blueprints.dashboard import bp as dashboard_bp
@@ -6,20 +6,22 @@ dashboard without any tkinter dependency.
 from __future__ import annotations
 
 import calendar
-import io
+import heapq
 import json
 import math
+import os
 import re
 import time
 import threading
 import logging
-from collections import defaultdict, deque
-from dataclasses import replace, asdict
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from zoneinfo import ZoneInfo
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
 
 import pandas as pd
 import numpy as np
@@ -32,7 +34,7 @@ from shelly_analyzer.io.http import (
     get_light_status, set_light_state, get_cover_status,
     cover_open, cover_close, cover_stop, cover_go_to_position,
 )
-from shelly_analyzer.i18n import t as _t, format_date_local, format_number_local
+from shelly_analyzer.i18n import t as _t, format_date_local
 from shelly_analyzer.core.energy import filter_by_time, calculate_energy
 from shelly_analyzer.core.stats import daily_kwh, weekly_kwh, monthly_kwh
 from shelly_analyzer.services.compute import ComputedDevice, load_device, summarize
@@ -45,11 +47,213 @@ from shelly_analyzer.services.export import (
     export_pdf_summary,
     export_pdf_invoice,
     export_figure_png,
+    tight_layout_once,
+    export_pdf_email_daily,
+    export_pdf_email_monthly,
+    export_pdf_energy_report_variant1,
 )
 from shelly_analyzer.web.utils import _parse_date_flexible, _period_bounds
 
 logger = logging.getLogger(__name__)
 
+# Per-device export work (plots, summary, invoices) runs on this many threads.
+_EXPORT_WORKERS = 2
+# Loaded device histories kept by ActionDispatcher._load_device_cached()
+# while export jobs run: at most this many entries and DataFrame bytes, each
+# reused for at most _LOADED_CACHE_TTL_S. The cache is emptied once the last
+# running export job finishes.
+_LOADED_CACHE_MAX = 16
+_LOADED_CACHE_MAX_BYTES = 128 * 1024 * 1024
+_LOADED_CACHE_TTL_S = 300.0
+# Actions that load full device histories through _load_device_cached().
+_LOADED_CACHE_ACTIONS = frozenset({"plots", "export_summary", "export_invoices", "export_excel", "report"})
+
+# Text-like bundle entries worth deflating; PDF/PNG/JPEG/XLSX are already
+# compressed and are stored as-is.
+_BUNDLE_DEFLATE_EXT = frozenset({".csv", ".json", ".txt", ".log"})
+# Bundle files are read by this many threads ahead of the single ZIP writer;
+# larger files are streamed by the writer instead of being buffered.
+_BUNDLE_READERS = min(8, os.cpu_count() or 4)
+_BUNDLE_BUFFER_MAX = 32 * 1024 * 1024
+# Cap on the bytes of buffered entries queued ahead of the writer at once.
+_BUNDLE_READAHEAD_BYTES = 64 * 1024 * 1024
+
+# Above this many points the plots action draws a filled step area without
+# per-bar value labels.
+_PLOT_MAX_BARS = 500
+# Value labels beyond this many bars only overlap; every n-th bar is labelled.
+_PLOT_MAX_BAR_LABELS = 60
+# Longer power/voltage series are reduced to at most this many points before
+# they are sent to the plots page; see _minmax_downsample().
+_PLOT_MAX_POINTS = 2500
+
+
+class _SafeNameTable(dict):
+    """``str.translate`` table for filenames: every char that is not
+    ``str.isalnum()`` or ``-``/``_`` maps to ``_``. Code points are filled in
+    on first use, so Unicode names (Küche, …) keep their letters."""
+
+    def __missing__(self, cp: int) -> str:
+        ch = chr(cp)
+        repl = ch if ch.isalnum() or ch in "-_" else "_"
+        self[cp] = repl
+        return repl
+
+
+_SAFE_NAME_TABLE = _SafeNameTable()
+
+# Device alias normalisation for plot requests: umlauts folded, separators dropped.
+_ALIAS_TRANS = str.maketrans({
+    "\u00e4": "ae", "\u00f6": "oe", "\u00fc": "ue", "\u00df": "ss",
+    " ": None, "-": None, "_": None, ".": None,
+})
+
+
+def _alias_norm(s: str) -> str:
+    return (s or "").strip().lower().translate(_ALIAS_TRANS)
+
+
+def _scan_files(root: str) -> Iterator[os.DirEntry]:
+    """Yield regular files below ``root`` via ``os.scandir`` (DirEntry caches
+    the type, and on Linux the stat result). Symlinks are not followed;
+    unreadable directories are skipped.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for e in it:
+            try:
+                if e.is_symlink():
+                    continue
+                if e.is_dir(follow_symlinks=False):
+                    yield from _scan_files(e.path)
+                elif e.is_file(follow_symlinks=False):
+                    yield e
+            except OSError:
+                continue
+
+
+def _as_str(x: Any, default: str = "") -> str:
+    """Stripped string param; ``default`` for None/empty. JSON strings skip ``str()``."""
+    if isinstance(x, str):
+        x = x.strip()
+        return x or default
+    if not x:
+        return default
+    return str(x).strip()
+
+
+# Minimum spacing of intermediate progress updates for the same key.
+_PROGRESS_MIN_INTERVAL_S = 0.1
+
+
+def _wrap_progress(
+    progress: Optional[Callable[[str, int, int, str], None]],
+) -> Optional[Callable[[str, int, int, str], None]]:
+    """Make a progress callback safe to call from hot loops.
+
+    Exceptions are swallowed once here instead of at every call site, and a
+    callback that raised is not called again. Intermediate updates for the
+    key that follow another intermediate update closer than
+    ``_PROGRESS_MIN_INTERVAL_S`` are dropped; the first (``done == 0``) and
+    last (``done >= total``) ones always go through."""
+    if progress is None:
+        return None
+    last: Dict[str, float] = {}
+    broken = [False]
+
+    def _safe(key: str, done: int, total: int, msg: str) -> None:
+        if broken[0]:
+            return
+        if 0 < done < total:
+            now = time.monotonic()
+            prev = last.get(key)
+            if prev is not None and now - prev < _PROGRESS_MIN_INTERVAL_S:
+                return
+            last[key] = now
+        else:
+            last.pop(key, None)
+        try:
+            progress(key, done, total, msg)
+        except Exception:
+            broken[0] = True
+            logger.debug("Progress callback failed; further updates dropped", exc_info=True)
+
+    return _safe
+
+
+def _series_xy(s: pd.Series) -> Tuple[List[str], List[float]]:
+    """ISO timestamps and NaN-free floats of a time series, for JSON.
+
+    Naive indexes are formatted in one vectorized ``strftime`` (samples are
+    whole seconds); NaT becomes ``""`` and NaN values ``0.0``."""
+    idx = pd.DatetimeIndex(pd.to_datetime(s.index, errors="coerce"))
+    if idx.tz is None:
+        xs = idx.strftime("%Y-%m-%dT%H:%M:%S")
+        xs = xs.where(~idx.isna(), "").tolist()
+    else:
+        xs = ["" if x is pd.NaT else x.isoformat() for x in idx]
+    arr = pd.to_numeric(s, errors="coerce").to_numpy(dtype="float64")
+    ys = np.where(np.isnan(arr), 0.0, arr).tolist()
+    return xs, ys
+
+
+def _minmax_downsample(s: pd.Series, max_points: int = _PLOT_MAX_POINTS) -> pd.Series:
+    """Reduce a time series to at most ``max_points`` for plotting.
+
+    The span is cut into ``max_points // 2`` equal time buckets and each keeps
+    its minimum and maximum sample at their own timestamps, so spikes and dips
+    survive (a per-bucket mean flattens them). Shorter series are returned
+    unchanged; NaN samples are dropped from reduced ones."""
+    if len(s) <= max_points:
+        return s
+    s = s.dropna()
+    if s.index.hasnans:
+        s = s[s.index.notna()]
+    n = len(s)
+    if n <= max_points:
+        return s
+    if not s.index.is_monotonic_increasing:
+        s = s.sort_index()
+    t = pd.DatetimeIndex(s.index).asi8
+    span = int(t[-1]) - int(t[0])
+    if span <= 0:
+        return s
+    width = span // max(1, max_points // 2) + 1
+    b = (t - t[0]) // width
+    # Sorted timestamps -> each bucket is one contiguous run.
+    starts = np.flatnonzero(np.r_[True, b[1:] != b[:-1]])
+    seg = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))
+    v = s.to_numpy(dtype=np.float64)
+    lo = np.minimum.reduceat(v, starts)[seg] == v
+    hi = np.maximum.reduceat(v, starts)[seg] == v
+    # First matching sample per bucket for both extremes.
+    _, i_lo = np.unique(seg[lo], return_index=True)
+    _, i_hi = np.unique(seg[hi], return_index=True)
+    keep = np.union1d(np.flatnonzero(lo)[i_lo], np.flatnonzero(hi)[i_hi])
+    return s.iloc[keep]
+
+
+def _net_of_children(base: pd.Series, children: List[pd.Series],
+                     tolerance: pd.Timedelta = pd.Timedelta("180s")) -> pd.Series:
+    """Subtract child power series from their parent's ("meter behind meter").
+
+    Each child is aligned to the parent's timestamps by nearest sample within
+    ``tolerance``; parent samples without a child sample nearby keep their
+    gross value. Pass full-resolution series and reduce the result afterwards:
+    min/max-reduced series keep their extremes at their own timestamps, so
+    most of them would no longer find a partner within the tolerance."""
+    for cs in children:
+        if cs is None or cs.empty:
+            continue
+        if cs.index.has_duplicates:
+            cs = cs.groupby(level=0).mean()
+        aligned = cs.reindex(base.index, method="nearest", tolerance=tolerance).fillna(0.0)
+        base = base.subtract(aligned)
+    return base
+
 
 # ---------------------------------------------------------------------------
 # Helper: extract switch on/off from Shelly RPC / REST payloads
@@ -151,6 +355,18 @@ def _extract_switch_on(raw: Dict[str, Any]) -> Optional[bool]:
     return None
 
 
+def _extract_switch_on_for_channel(raw: Any, channel: int) -> Optional[bool]:
+    """On/off of one channel (``switch:<id>`` / ``relay:<id>``) in a
+    Shelly.GetStatus payload; None if the component is missing."""
+    if not isinstance(raw, dict):
+        return None
+    for comp_key in (f"switch:{channel}", f"relay:{channel}"):
+        block = raw.get(comp_key)
+        if isinstance(block, dict):
+            return _extract_switch_on(block)
+    return None
+
+
 class ActionDispatcher:
     """Handles web dashboard actions independently of tkinter.
 
@@ -185,6 +401,23 @@ class ActionDispatcher:
         # re-read is expensive on slower disks; live values still flow via background._today_state.
         # Mapping text from last _wva_series call (debug aid)
         self._last_wva_mapping_text = ""
+        # Fresh per-device loads for exports: key -> (samples_version, ComputedDevice,
+        # df bytes, loaded_at), LRU-bounded by count and bytes. Unlike the TTL cache
+        # above this is validated against EnergyDB write counters, and it only
+        # lives while export jobs are running (_loaded_jobs > 0).
+        self._loaded: "OrderedDict[str, Tuple[Any, ComputedDevice, int, float]]" = OrderedDict()
+        self._loaded_bytes = 0
+        self._loaded_jobs = 0
+        self._loaded_lock = threading.Lock()
+        # Shared client for switch/light/cover control, rebuilt when cfg.download changes
+        self._http: Optional[ShellyHttp] = None
+        self._http_src: Any = None
+        self._http_lock = threading.Lock()
+        # key -> DeviceConfig, rebuilt when cfg.devices is a different list
+        self._dev_by_key: Optional[Tuple[Any, Dict[str, Any]]] = None
+        # Normalised key/name -> device key for plot requests, same invalidation
+        self._alias_src: Any = None
+        self._alias: Dict[str, str] = {}
         # EV-Log 24-month consumption cache: dev_key -> (built_at, monthly_kwh).
         # Sub-second response on filter-bar toggles in the EV-Log tab.
         self._ev_monthly_cache: Dict[str, tuple] = {}
@@ -192,23 +425,10 @@ class ActionDispatcher:
         self._ev_monthly_ttl: float = 600.0  # 10 min — hourly_energy grows once per hour
 
     def _current_tariff_price_eur_kwh(self) -> float:
-        """Mirror of ``LiveFeedLoop._current_tariff_price`` for use inside the
-        action dispatcher — picks the dynamic spot price if a dynamic tariff
-        is active, otherwise the scheduled fixed tariff for today (gross),
-        with a final fallback to the static config value."""
+        """Consumer tariff for use inside the action dispatcher: the scheduled
+        fixed tariff for today (gross), with a final fallback to the static
+        config value. Dynamic spot tariffs are not looked up here."""
         from datetime import date as _date
-        try:
-            sp = getattr(self.cfg, "spot_price", None)
-            if (sp and getattr(sp, "enabled", False)
-                    and str(getattr(sp, "tariff_type", "fixed")) == "dynamic"):
-                # Mirror background._current_spot_price -> _spot_prices()[1].
-                # Falls through to the fixed path on any failure.
-                from shelly_analyzer.web.background import LiveFeedLoop  # noqa
-                # Instead of standing up a LiveFeedLoop just for one number,
-                # use the same shape: latest spot row in DB, apply markup+VAT.
-                # Kept conservative — if anything is missing we drop down.
-        except Exception:
-            pass
         try:
             return float(self.cfg.pricing.effective_pricing_for_date(
                 _date.today()).unit_price_gross())
@@ -394,9 +614,8 @@ class ActionDispatcher:
     @property
     def computed(self) -> Dict[str, ComputedDevice]:
         """Lazy-load computed devices from storage, auto-refresh after TTL."""
-        import time as _time
         with self._computed_lock:
-            now = _time.time()
+            now = time.time()
             if not self._computed or (now - self._computed_ts) > self._computed_ttl:
                 self._computed.clear()
                 for d in self.cfg.devices:
@@ -407,6 +626,76 @@ class ActionDispatcher:
                 self._computed_ts = now
             return self._computed
 
+    def _samples_token(self, d: Any) -> Optional[Tuple[Any, Any]]:
+        db = getattr(self.storage, "db", None)
+        try:
+            return (d, db.samples_version(d.key)) if db is not None and db.has_data(d.key) else None
+        except Exception:
+            return None
+
+    def _loaded_hit(self, d: Any, version: Any) -> Optional[ComputedDevice]:
+        with self._loaded_lock:
+            hit = self._loaded.get(d.key)
+            if hit is None:
+                return None
+            if hit[0] == version and time.monotonic() - hit[3] <= _LOADED_CACHE_TTL_S:
+                self._loaded.move_to_end(d.key)
+                return hit[1]
+            del self._loaded[d.key]
+            self._loaded_bytes -= hit[2]
+        return None
+
+    def _loaded_clear(self) -> None:
+        """Drop every cached full-history load. Caller holds ``_loaded_lock``."""
+        self._loaded.clear()
+        self._loaded_bytes = 0
+
+    def _load_device_range(self, d: Any, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]) -> ComputedDevice:
+        """Like ``_load_device_cached`` but for a single window: reuses a fresh
+        full-history entry if there is one, otherwise reads only the window
+        (plus lookback) from storage. The result is not cached and still has
+        to go through ``filter_by_time``."""
+        version = self._samples_token(d)
+        if version is not None:
+            hit = self._loaded_hit(d, version)
+            if hit is not None:
+                return hit
+        start_s = int(start.timestamp()) if start is not None else None
+        end_s = int(end.timestamp()) if end is not None else None
+        return load_device(self.storage, d, start_ts=start_s, end_ts=end_s)
+
+    def _load_device_cached(self, d: Any) -> ComputedDevice:
+        """``load_device`` that reuses the previous result while the device's
+        samples are unchanged. Callers must not mutate ``cd.df`` in place
+        (``filter_by_time`` returns a copy)."""
+        version = self._samples_token(d)
+        if version is None:
+            # CSV fallback: no change tracking, always re-read.
+            return load_device(self.storage, d)
+        hit = self._loaded_hit(d, version)
+        if hit is not None:
+            return hit
+        cd = load_device(self.storage, d)
+        try:
+            nbytes = int(cd.df.memory_usage(index=True).sum())
+        except Exception:
+            nbytes = 0
+        if nbytes > _LOADED_CACHE_MAX_BYTES:
+            return cd
+        with self._loaded_lock:
+            if self._loaded_jobs <= 0:
+                # Called outside an export job: nothing would release the entry.
+                return cd
+            old = self._loaded.pop(d.key, None)
+            if old is not None:
+                self._loaded_bytes -= old[2]
+            self._loaded[d.key] = (version, cd, nbytes, time.monotonic())
+            self._loaded_bytes += nbytes
+            while len(self._loaded) > _LOADED_CACHE_MAX or self._loaded_bytes > _LOADED_CACHE_MAX_BYTES:
+                _k, ev = self._loaded.popitem(last=False)
+                self._loaded_bytes -= ev[2]
+        return cd
+
     def reload(self, cfg: AppConfig, lang: Optional[str] = None) -> None:
         """Hot-reload configuration."""
         self.cfg = cfg
@@ -414,6 +703,68 @@ class ActionDispatcher:
             self.lang = lang
         with self._computed_lock:
             self._computed.clear()
+        with self._loaded_lock:
+            self._loaded_clear()
+
+    def _map_devices(self, fn: Callable[[Any], Any], devices: Any) -> List[Any]:
+        """Run ``fn(d)`` per device on a small thread pool (pandas/matplotlib/
+        reportlab work mostly outside the GIL). Results keep device order; the
+        first exception is re-raised like in the sequential loop."""
+        devs = list(devices)
+        if len(devs) <= 1:
+            return [fn(d) for d in devs]
+        results: List[Any] = [None] * len(devs)
+        with ThreadPoolExecutor(max_workers=min(_EXPORT_WORKERS, len(devs))) as ex:
+            futs = {ex.submit(fn, d): i for i, d in enumerate(devs)}
+            for fut in as_completed(futs):
+                results[futs[fut]] = fut.result()
+        return results
+
+    def _control_http(self, dev: Any) -> ShellyHttp:
+        """Shared ShellyHttp for device control so the requests.Session keeps
+        its connection pool and cached auth scheme between taps."""
+        dl = self.cfg.download
+        with self._http_lock:
+            http = self._http
+            if http is None or self._http_src is not dl:
+                http = ShellyHttp(
+                    HttpConfig(
+                        timeout_seconds=float(dl.timeout_seconds),
+                        retries=int(dl.retries),
+                        backoff_base_seconds=float(dl.backoff_base_seconds),
+                    )
+                )
+                self._http = http
+                self._http_src = dl
+            # Always (re)register: an empty password drops stale credentials.
+            _pw = getattr(dev, "password", "") or ""
+            http.set_credentials(dev.host, getattr(dev, "username", "admin") or "admin", _pw)
+        return http
+
+    def _devices_by_key(self) -> Dict[str, Any]:
+        """O(1) device lookup, memoized on the identity of ``cfg.devices``."""
+        devices = self.cfg.devices
+        snap = self._dev_by_key
+        if snap is None or snap[0] is not devices:
+            by_key: Dict[str, Any] = {}
+            for d in devices:
+                by_key.setdefault(d.key, d)  # first match wins, like next(...)
+            snap = (devices, by_key)
+            self._dev_by_key = snap
+        return snap[1]
+
+    def _device_aliases(self) -> Dict[str, str]:
+        """``_alias_norm``-ed device keys and names -> device key, memoized on
+        the identity of ``cfg.devices``."""
+        devices = self.cfg.devices
+        if devices is not self._alias_src:
+            alias: Dict[str, str] = {}
+            for d in devices:
+                alias[_alias_norm(getattr(d, "key", ""))] = d.key
+                alias[_alias_norm(getattr(d, "name", ""))] = d.key
+            self._alias = alias
+            self._alias_src = devices
+        return self._alias
 
     # ------------------------------------------------------------------
     # i18n helper
@@ -784,6 +1135,9 @@ class ActionDispatcher:
                 elif mx > 1e12:
                     unit = 'ms'
                 ts = pd.to_datetime(ts_num, unit=unit, errors='coerce')
+            elif pd.api.types.is_datetime64_any_dtype(ts_raw):
+                # Storage already parsed it (SQLite path); don't parse again.
+                ts = ts_raw
             else:
                 ts = pd.to_datetime(ts_raw, errors='coerce')
         elif isinstance(df.index, pd.DatetimeIndex):
@@ -1668,9 +2022,32 @@ class ActionDispatcher:
         params: Dict[str, Any],
         progress: Optional[Callable[[str, int, int, str], None]] = None,
     ) -> Dict[str, Any]:
-        """Handle a web action -- direct copy of _web_action_dispatch logic."""
+        """Handle a web action -- direct copy of _web_action_dispatch logic.
+
+        Export actions share the full-history load cache while they run; it is
+        emptied when the last of them finishes."""
         action = str(action or "").strip()
+        if action not in _LOADED_CACHE_ACTIONS:
+            return self._dispatch_action(action, params, progress)
+        with self._loaded_lock:
+            self._loaded_jobs += 1
+        try:
+            return self._dispatch_action(action, params, progress)
+        finally:
+            with self._loaded_lock:
+                self._loaded_jobs -= 1
+                if self._loaded_jobs <= 0:
+                    self._loaded_jobs = 0
+                    self._loaded_clear()
+
+    def _dispatch_action(
+        self,
+        action: str,
+        params: Dict[str, Any],
+        progress: Optional[Callable[[str, int, int, str], None]] = None,
+    ) -> Dict[str, Any]:
         params = params if isinstance(params, dict) else {}
+        progress = _wrap_progress(progress)
         # Export root: ui.export_directory (absolute path) overrides the
         # legacy ``out_dir/exports`` default if set. Falls back silently if
         # the configured path can't be created (no surprise crashes on a
@@ -1721,35 +2098,29 @@ class ActionDispatcher:
 
         # --- Switch control (Gen2/Plus/Pro) ---
         if action in {"get_switch", "set_switch", "toggle_switch"}:
-            device_key = str(params.get("device_key") or "").strip()
-            dev = next((d for d in self.cfg.devices if d.key == device_key), None)
+            device_key = _as_str(params.get("device_key"))
+            dev = self._devices_by_key().get(device_key)
             if dev is None:
                 return {"ok": False, "error": "unknown device"}
             if str(getattr(dev, "kind", "")) != "switch":
                 return {"ok": False, "error": "not a switch"}
 
-            http = ShellyHttp(
-                HttpConfig(
-                    timeout_seconds=float(self.cfg.download.timeout_seconds),
-                    retries=int(self.cfg.download.retries),
-                    backoff_base_seconds=float(self.cfg.download.backoff_base_seconds),
-                )
-            )
-            _pw = getattr(dev, "password", "") or ""
-            if _pw:
-                http.set_credentials(dev.host, getattr(dev, "username", "admin") or "admin", _pw)
+            http = self._control_http(dev)
 
             try:
-                st = get_switch_status(http, dev.host, int(dev.em_id))
-                cur_on = _extract_switch_on(st)
-                if cur_on is not True:
-                    try:
-                        full = get_shelly_status(http, dev.host)
-                        any_on = _extract_switch_on(full)
-                        if any_on is True:
-                            cur_on = True
-                    except Exception:
-                        pass
+                # One Shelly.GetStatus answers both the channel and the
+                # device-wide "any channel on" question.
+                try:
+                    full = get_shelly_status(http, dev.host)
+                except Exception:
+                    full = None
+                cur_on = _extract_switch_on_for_channel(full, int(dev.em_id))
+                any_on = _extract_switch_on(full)
+                if cur_on is None and any_on is not True:
+                    # Gen1 / unexpected shape: component probe with its own fallbacks.
+                    cur_on = _extract_switch_on(get_switch_status(http, dev.host, int(dev.em_id)))
+                if any_on is True:
+                    cur_on = True
             except Exception as e:
                 return {"ok": False, "error": str(e)}
             if action == "get_switch":
@@ -1773,21 +2144,12 @@ class ActionDispatcher:
 
         # --- Light / Dimmer control ---
         if action in {"get_light", "set_light"}:
-            device_key = str(params.get("device_key") or "").strip()
-            dev = next((d for d in self.cfg.devices if d.key == device_key), None)
+            device_key = _as_str(params.get("device_key"))
+            dev = self._devices_by_key().get(device_key)
             if dev is None:
                 return {"ok": False, "error": "unknown device"}
 
-            http = ShellyHttp(
-                HttpConfig(
-                    timeout_seconds=float(self.cfg.download.timeout_seconds),
-                    retries=int(self.cfg.download.retries),
-                    backoff_base_seconds=float(self.cfg.download.backoff_base_seconds),
-                )
-            )
-            _pw = getattr(dev, "password", "") or ""
-            if _pw:
-                http.set_credentials(dev.host, getattr(dev, "username", "admin") or "admin", _pw)
+            http = self._control_http(dev)
 
             lid = int(params.get("light_id", dev.em_id) or 0)
             if action == "get_light":
@@ -1820,21 +2182,12 @@ class ActionDispatcher:
 
         # --- Cover / Roller shutter control ---
         if action in {"get_cover", "cover_open", "cover_close", "cover_stop", "cover_position"}:
-            device_key = str(params.get("device_key") or "").strip()
-            dev = next((d for d in self.cfg.devices if d.key == device_key), None)
+            device_key = _as_str(params.get("device_key"))
+            dev = self._devices_by_key().get(device_key)
             if dev is None:
                 return {"ok": False, "error": "unknown device"}
 
-            http = ShellyHttp(
-                HttpConfig(
-                    timeout_seconds=float(self.cfg.download.timeout_seconds),
-                    retries=int(self.cfg.download.retries),
-                    backoff_base_seconds=float(self.cfg.download.backoff_base_seconds),
-                )
-            )
-            _pw = getattr(dev, "password", "") or ""
-            if _pw:
-                http.set_credentials(dev.host, getattr(dev, "username", "admin") or "admin", _pw)
+            http = self._control_http(dev)
 
             cid = int(params.get("cover_id", dev.em_id) or 0)
             try:
@@ -1856,8 +2209,8 @@ class ActionDispatcher:
                 return {"ok": False, "error": str(e)}
 
         if action == "sync":
-            mode = str(params.get("mode") or "incremental")
-            start_date = str(params.get("start_date") or "").strip()
+            mode = _as_str(params.get("mode"), "incremental")
+            start_date = _as_str(params.get("start_date"))
             now = int(time.time())
             range_override: Optional[Tuple[int, int]] = None
             label = mode
@@ -1889,8 +2242,13 @@ class ActionDispatcher:
             )
             summary = []
             for r in results:
-                ok_chunks = sum(1 for c in r.chunks if c.ok)
-                err = next((c for c in r.chunks if not c.ok), None)
+                ok_chunks = 0
+                err = None
+                for c in r.chunks:
+                    if c.ok:
+                        ok_chunks += 1
+                    elif err is None:
+                        err = c
                 summary.append(
                     {
                         "device": r.device_name,
@@ -1904,7 +2262,7 @@ class ActionDispatcher:
             return {"ok": True, "mode": mode, "label": label, "results": summary}
 
         if action == "plots":
-            mode = str(params.get("mode") or "days")
+            mode = _as_str(params.get("mode"), "days")
             start = _pdate(params.get("start"))
             end = _pdate(params.get("end"))
             if start is not None and end is not None and end < start:
@@ -1915,18 +2273,21 @@ class ActionDispatcher:
                 if df_s is None or df_s.empty:
                     return [], []
                 if m == "all":
-                    total = float(pd.to_numeric(df_s["energy_kwh"], errors="coerce").fillna(0.0).sum())
+                    col = df_s["energy_kwh"]
+                    if not pd.api.types.is_numeric_dtype(col):
+                        col = pd.to_numeric(col, errors="coerce")
+                    total = float(np.nansum(col.to_numpy(dtype=np.float64, copy=False)))
                     return ["Total"], [total]
                 if m == "days":
                     s = daily_kwh(df_s)
-                    return [pd.Timestamp(x).strftime("%Y-%m-%d") for x in s.index], [float(v) for v in s.values]
+                    return s.index.strftime("%Y-%m-%d").tolist(), s.to_numpy(dtype=np.float64, copy=False).tolist()
                 if m == "weeks":
                     s = weekly_kwh(df_s)
-                    return [str(x) for x in s.index], [float(v) for v in s.values]
-                if m == "months":
+                elif m == "months":
                     s = monthly_kwh(df_s)
-                    return [str(x) for x in s.index], [float(v) for v in s.values]
-                return [], []
+                else:
+                    return [], []
+                return s.index.astype(str).tolist(), s.to_numpy(dtype=np.float64, copy=False).tolist()
 
             def _apply_xticks(ax, labels_t: List[str]) -> None:
                 if not labels_t:
@@ -1938,64 +2299,70 @@ class ActionDispatcher:
                     ax.set_xticklabels(labels_t, rotation=45, ha="right")
                     return
                 step = int(math.ceil(n / max_labels))
-                ticks = list(range(0, n, step))
-                ax.set_xticks(ticks)
-                ax.set_xticklabels([labels_t[i] for i in ticks], rotation=45, ha="right")
+                ticks = np.arange(0, n, step, dtype=np.int64)
+                ax.set_xticks(ticks.tolist())
+                ax.set_xticklabels(np.asarray(labels_t, dtype=object)[ticks].tolist(), rotation=45, ha="right")
 
             ts_str = time.strftime("%Y%m%d_%H%M%S")
             web_dir = out_root / "web"
             web_dir.mkdir(parents=True, exist_ok=True)
-            files: List[Dict[str, str]] = []
 
-            devs2 = list(self.cfg.devices)
-            total = max(1, len(devs2))
-            for idx, d in enumerate(devs2, start=1):
-                if progress:
-                    try:
-                        progress(d.key, idx-1, total, f"Plot {mode} \u2026")
-                    except Exception:
-                        pass
-                cd = load_device(self.storage, d)
+            devices = tuple(self.cfg.devices)
+            total = max(1, len(devices))
+            progress_lock = threading.Lock()
+            done = [0]
+
+            def _progress(key: str, msg: str, finished: bool = False) -> None:
+                if not progress:
+                    return
+                with progress_lock:
+                    if finished:
+                        done[0] += 1
+                    progress(key, done[0], total, msg)
+
+            def _render(d: Any) -> Dict[str, str]:
+                _progress(d.key, f"Plot {mode} \u2026")
+                cd = self._load_device_cached(d)
                 df_use = filter_by_time(cd.df, start=start, end=end)
                 labels_p, values = _series(df_use, mode)
-                fig = Figure(figsize=(11, 3.6), dpi=170)
+                # Lay out at a fixed low dpi (independent of rcParams); the PNG
+                # is rasterized once at dpi=180 by export_figure_png. tight_layout
+                # already fits the margins, so neither the tight-bbox nor the
+                # layout-engine pre-draw is needed at save time.
+                fig = Figure(figsize=(11, 3.6), dpi=100)
                 ax = fig.add_subplot(111)
                 ax.set_ylabel("kWh")
-                bars = ax.bar(range(len(values)), values)
+                if len(values) > _PLOT_MAX_BARS:
+                    # One filled step artist instead of N bars + N labels.
+                    ax.fill_between(range(len(values)), values, step="mid", alpha=0.6)
+                else:
+                    bars = ax.bar(range(len(values)), values)
+                    heights = np.asarray(values, dtype=np.float64)
+                    n = len(heights)
+                    step = max(1, int(math.ceil(n / _PLOT_MAX_BAR_LABELS)))
+                    keep = np.isfinite(heights)
+                    if step > 1:
+                        keep &= np.arange(n) % step == 0
+                    bar_labels = [""] * n
+                    for i in np.flatnonzero(keep).tolist():
+                        bar_labels[i] = f"{values[i]:.2f}"
+                    ax.bar_label(bars, labels=bar_labels, rotation=90, padding=3, fontsize=8)
                 _apply_xticks(ax, labels_p)
                 ax.grid(True, axis="y", alpha=0.3)
-                for b in bars:
-                    try:
-                        h = float(b.get_height())
-                    except Exception:
-                        continue
-                    ax.annotate(
-                        f"{h:.2f}",
-                        xy=(b.get_x() + b.get_width() / 2, h),
-                        xytext=(0, 3),
-                        textcoords="offset points",
-                        ha="center",
-                        va="bottom",
-                        fontsize=8,
-                        rotation=90,
-                    )
                 rng = ""
                 if start is not None or end is not None:
                     a_s = start.date().isoformat() if start is not None else "\u2026"
                     b_s = end.date().isoformat() if end is not None else "\u2026"
                     rng = f" | {a_s}\u2013{b_s}"
                 fig.suptitle(f"{d.name} \u2013 {mode}{rng}", fontsize=12)
-                fig.tight_layout()
-                safe = "".join(ch if ch.isalnum() or ch in ("-", "_") else "_" for ch in d.name).strip("_")
+                tight_layout_once(fig)
+                safe = d.name.translate(_SAFE_NAME_TABLE).strip("_")
                 out_p = web_dir / f"plot_{safe or d.key}_{mode}_{ts_str}.png"
-                export_figure_png(fig, out_p, dpi=180)
-                files.append({"name": out_p.name, "url": f"/files/web/{out_p.name}"})
-                if progress:
-                    try:
-                        progress(d.key, idx, total, "OK")
-                    except Exception:
-                        pass
+                export_figure_png(fig, out_p, dpi=180, tight=False)
+                _progress(d.key, "OK", finished=True)
+                return {"name": out_p.name, "url": f"/files/web/{out_p.name}"}
 
+            files: List[Dict[str, str]] = self._map_devices(_render, devices)
             return {"ok": True, "files": files}
 
         if action == "export_summary":
@@ -2036,19 +2403,26 @@ class ActionDispatcher:
             out_f = out_root / "web" / f"summary_{ts_str}.pdf"
 
             if report_data is not None:
-                from shelly_analyzer.services.export import export_pdf_email_daily, export_pdf_email_monthly
                 if is_monthly:
                     export_pdf_email_monthly(report_data, out_f, lang=self.lang)
                 else:
                     export_pdf_email_daily(report_data, out_f, lang=self.lang)
             else:
+                devices = tuple(self.cfg.devices)
                 unit_gross = float(self.cfg.pricing.unit_price_gross())
-                totals: List[ReportTotals] = []
-                for d in self.cfg.devices:
-                    cd = load_device(self.storage, d)
-                    df_s = filter_by_time(cd.df, start=pd.Timestamp(start_d), end=pd.Timestamp(end_excl))
+                start_ts_s = pd.Timestamp(start_d)
+                end_ts_s = pd.Timestamp(end_excl)
+
+                def _totals(d: Any) -> ReportTotals:
+                    cd = self._load_device_cached(d)
+                    # Same bounds as filter_by_time, but one slice of just the
+                    # two columns summarize() reads instead of a full-frame copy.
+                    ts = cd.df["timestamp"]
+                    df_s = cd.df.loc[(ts >= start_ts_s) & (ts <= end_ts_s), ["energy_kwh", "total_power"]]
                     kwh, avgp, maxp = summarize(df_s)
-                    totals.append(ReportTotals(name=d.name, kwh_total=kwh, cost_eur=kwh * unit_gross, avg_power_w=avgp, max_power_w=maxp))
+                    return ReportTotals(name=d.name, kwh_total=kwh, cost_eur=kwh * unit_gross, avg_power_w=avgp, max_power_w=maxp)
+
+                totals: List[ReportTotals] = self._map_devices(_totals, devices)
                 export_pdf_summary(
                     title=self.t("pdf.summary.title"),
                     period_label=f"{start_d} \u2013 {end_d}",
@@ -2061,7 +2435,7 @@ class ActionDispatcher:
         if action == "export_invoices":
             start = _pdate(params.get("start"))
             end = _pdate(params.get("end"))
-            period = str(params.get("period") or "custom")
+            period = _as_str(params.get("period"), "custom")
             anchor = _pdate(params.get("anchor"))
             if period != "custom":
                 if anchor is None and start is not None:
@@ -2070,13 +2444,17 @@ class ActionDispatcher:
                     anchor = pd.Timestamp(date.today())
                 start, end = _period_bounds(anchor, period)
 
+            devices = tuple(self.cfg.devices)
             inv_dir = out_root / "web" / "invoices"
             inv_dir.mkdir(parents=True, exist_ok=True)
             unit_net = float(self.cfg.pricing.unit_price_net())
             issue = date.today()
             due = issue + timedelta(days=int(self.cfg.billing.payment_terms_days))
             ts_str = time.strftime("%Y%m%d")
-            files: List[Dict[str, str]] = []
+            # Normalized period edges for the base-fee proration, built once per batch.
+            today_norm = pd.Timestamp(issue)
+            start_norm = pd.Timestamp(start).normalize() if start is not None else None
+            end_norm = pd.Timestamp(end).normalize() if end is not None else None
 
             # Base-fee split: pre-compute the per-device kWh map once for the
             # whole batch so a single by_kwh invoice run sees the same totals
@@ -2087,7 +2465,7 @@ class ActionDispatcher:
             if split_mode == "by_kwh":
                 s_ts = int(pd.Timestamp(start).timestamp()) if start is not None else None
                 e_ts = int(pd.Timestamp(end).timestamp()) if end is not None else None
-                for _d in self.cfg.devices:
+                for _d in devices:
                     try:
                         df_h = self.storage.db.query_hourly(_d.key, start_ts=s_ts, end_ts=e_ts)
                         if df_h is not None and not df_h.empty and "kwh" in df_h.columns:
@@ -2097,8 +2475,8 @@ class ActionDispatcher:
                     except Exception:
                         period_kwh_by_device[_d.key] = 0.0
 
-            for d in self.cfg.devices:
-                cd = load_device(self.storage, d)
+            def _invoice(d: Any) -> Dict[str, str]:
+                cd = self._load_device_cached(d)
                 df_inv = filter_by_time(cd.df, start=start, end=end)
                 kwh, _avgp, _maxp = summarize(df_inv)
                 if start is None and end is None:
@@ -2122,7 +2500,7 @@ class ActionDispatcher:
                         suffix = f"{(start.date().isoformat() if start is not None else 'x')}-{(end.date().isoformat() if end is not None else 'y')}"
 
                 invoice_no = f"{self.cfg.billing.invoice_prefix}-{ts_str}-{d.key}-{period}-{suffix}"
-                safe = "".join(ch if ch.isalnum() or ch in ("-", "_") else "_" for ch in d.name).strip("_")
+                safe = d.name.translate(_SAFE_NAME_TABLE).strip("_")
                 out_inv = inv_dir / f"invoice_{invoice_no}_{safe or d.key}.pdf"
                 line = InvoiceLine(
                     description=self.t("pdf.invoice.line_energy", device=d.name, period=period_label),
@@ -2138,15 +2516,16 @@ class ActionDispatcher:
                 if base_year > 0:
                     if start is None and end is None:
                         if not df_inv.empty:
-                            s_eff = pd.Timestamp(df_inv['timestamp'].min()).normalize()
-                            e_eff = pd.Timestamp(df_inv['timestamp'].max()).normalize()
+                            ts_arr = df_inv['timestamp'].to_numpy()
+                            s_eff = pd.Timestamp(ts_arr.min()).normalize()
+                            e_eff = pd.Timestamp(ts_arr.max()).normalize()
                         else:
-                            s_eff = pd.Timestamp(date.today()).normalize()
+                            s_eff = today_norm
                             e_eff = s_eff
                     else:
                         _have_ts = (df_inv is not None and not df_inv.empty
                                     and 'timestamp' in df_inv.columns)
-                        _fb = pd.Timestamp(end if end is not None else (start if start is not None else date.today())).normalize()
+                        _fb = end_norm if end_norm is not None else (start_norm if start_norm is not None else today_norm)
 
                         def _edge(agg):
                             if _have_ts:
@@ -2157,8 +2536,8 @@ class ActionDispatcher:
                                 except Exception:
                                     pass
                             return _fb
-                        s_eff = pd.Timestamp(start).normalize() if start is not None else _edge(lambda s: s.min())
-                        e_eff = pd.Timestamp(end).normalize() if end is not None else _edge(lambda s: s.max())
+                        s_eff = start_norm if start_norm is not None else _edge(lambda s: s.min())
+                        e_eff = end_norm if end_norm is not None else _edge(lambda s: s.max())
                     days = int((e_eff.date() - s_eff.date()).days) + 1
                     days = max(1, days)
                     base_day_net_full = float(self.cfg.pricing.base_fee_day_net())
@@ -2192,8 +2571,9 @@ class ActionDispatcher:
                     lang=self.lang,
                     logo_path=getattr(self.cfg.billing, "invoice_logo_path", ""),
                 )
-                files.append({"name": out_inv.name, "url": f"/files/web/invoices/{out_inv.name}"})
+                return {"name": out_inv.name, "url": f"/files/web/invoices/{out_inv.name}"}
 
+            files: List[Dict[str, str]] = self._map_devices(_invoice, devices)
             return {"ok": True, "files": files}
 
         if action == "export_excel":
@@ -2207,7 +2587,7 @@ class ActionDispatcher:
             web_dir.mkdir(parents=True, exist_ok=True)
             sheets: Dict[str, Any] = {}
             for d in self.cfg.devices:
-                cd = load_device(self.storage, d)
+                cd = self._load_device_cached(d)
                 df_ex = filter_by_time(cd.df, start=start, end=end)
                 if not df_ex.empty:
                     sheets[d.name[:31]] = df_ex
@@ -2223,7 +2603,7 @@ class ActionDispatcher:
                 _today_start = _now.replace(hour=0, minute=0, second=0, microsecond=0)
                 _month_start = _today_start.replace(day=1)
 
-                _profile_id = str(params.get("profile", "") or "").strip()
+                _profile_id = _as_str(params.get("profile"))
                 _profile = None
                 if _profile_id:
                     for wp in (getattr(self.cfg.ui, "widget_profiles", []) or []):
@@ -3060,11 +3440,9 @@ class ActionDispatcher:
 
         # --- Report Button ---
         if action == "report":
-            period = str(params.get("period") or params.get("kind") or "day").strip().lower()
+            period = _as_str(params.get("period") or params.get("kind"), "day").lower()
             anchor = _pdate(params.get("anchor"))
-            if anchor is None:
-                anchor = pd.Timestamp(date.today())
-            anchor = pd.Timestamp(anchor)
+            anchor = pd.Timestamp(anchor) if anchor is not None else pd.Timestamp(date.today())
 
             _tz_r = ZoneInfo("Europe/Berlin")
 
@@ -3094,37 +3472,35 @@ class ActionDispatcher:
             prev_end_dt = datetime.combine(prev_end_d, datetime.min.time(), tzinfo=_tz_r)
 
             if progress:
-                try:
-                    progress("report", 0, 3, "Daten sammeln \u2026")
-                except Exception:
-                    pass
+                progress("report", 0, 3, "Daten sammeln \u2026")
 
             # Skip _build_email_report_data; use fallback path
             report_data = None
 
             if progress:
-                try:
-                    progress("report", 1, 3, "PDF erzeugen \u2026")
-                except Exception:
-                    pass
+                progress("report", 1, 3, "PDF erzeugen \u2026")
 
             rep_dir = out_root / "web" / "reports"
             rep_dir.mkdir(parents=True, exist_ok=True)
             out_path_r = rep_dir / fname
 
             if report_data is not None:
-                from shelly_analyzer.services.export import export_pdf_email_daily, export_pdf_email_monthly
                 if is_monthly:
                     export_pdf_email_monthly(report_data, out_path_r, lang=self.lang)
                 else:
                     export_pdf_email_daily(report_data, out_path_r, lang=self.lang)
             else:
-                from shelly_analyzer.services.export import export_pdf_energy_report_variant1
-                devices_payload: List[Tuple[str, str, pd.DataFrame]] = []
-                for d in self.cfg.devices:
-                    cd = load_device(self.storage, d)
-                    df_use = filter_by_time(cd.df, start=pd.Timestamp(start_d), end=pd.Timestamp(end_d))
-                    devices_payload.append((d.key, d.name, df_use))
+                start_ts_r = pd.Timestamp(start_d)
+                end_ts_r = pd.Timestamp(end_d)
+
+                def _report_rows(d: Any) -> Tuple[str, str, pd.DataFrame]:
+                    cd = self._load_device_range(d, start_ts_r, end_ts_r)
+                    return d.key, d.name, filter_by_time(cd.df, start=start_ts_r, end=end_ts_r)
+
+                # Device reads overlap on the export pool; payload keeps config order.
+                devices_payload: List[Tuple[str, str, pd.DataFrame]] = self._map_devices(
+                    _report_rows, self.cfg.devices
+                )
                 try:
                     unit_gross = float(self.cfg.pricing.unit_price_gross())
                 except Exception:
@@ -3140,10 +3516,7 @@ class ActionDispatcher:
                 )
 
             if progress:
-                try:
-                    progress("report", 3, 3, "OK")
-                except Exception:
-                    pass
+                progress("report", 3, 3, "OK")
 
             period_label = f"{format_date_local(self.lang, pd.Timestamp(start_d))} \u2013 {format_date_local(self.lang, pd.Timestamp(end_d - timedelta(days=1)))}"
             return {
@@ -3167,32 +3540,35 @@ class ActionDispatcher:
             zpath = web_dir / f"bundle_{ts_str}.zip"
 
             exp_root = out_root
-            wanted_ext = {".pdf", ".png", ".jpg", ".jpeg", ".xlsx", ".csv", ".json", ".txt", ".log"}
-            paths: List[Path] = []
-            for p in exp_root.rglob("*"):
+            wanted_ext = frozenset({".pdf", ".png", ".jpg", ".jpeg", ".xlsx", ".csv", ".json", ".txt", ".log"})
+            # (mtime, path, size) from a single stat per candidate; newest first.
+            found: List[Tuple[float, str, int]] = []
+            # Filter on file mtime only: a directory's mtime does not change when
+            # a nested subdirectory or an overwritten file gets newer content.
+            for e in _scan_files(str(exp_root)):
+                name = e.name
+                ext = os.path.splitext(name)[1].lower()
+                if ext not in wanted_ext:
+                    continue
+                if name.startswith("bundle_") and ext == ".zip":
+                    continue
                 try:
-                    if not p.is_file():
-                        continue
-                    if p.suffix.lower() not in wanted_ext:
-                        continue
-                    if p.name.startswith("bundle_") and p.suffix.lower() == ".zip":
-                        continue
-                    if p.stat().st_mtime < since:
-                        continue
-                    paths.append(p)
-                except Exception:
+                    st = e.stat(follow_symlinks=False)
+                except OSError:
                     continue
-            paths.sort(key=lambda x: x.stat().st_mtime if x.exists() else 0.0, reverse=True)
+                if st.st_mtime < since:
+                    continue
+                found.append((st.st_mtime, e.path, st.st_size))
+            found.sort(reverse=True)
+            paths: List[Path] = [Path(fp) for _mt, fp, _sz in found]
+            sizes: List[int] = [sz for _mt, _fp, sz in found]
 
             total = max(1, len(paths))
             done = 0
             if progress:
-                try:
-                    progress("bundle", 0, total, f"ZIP (letzte {hours}h) \u2026")
-                except Exception:
-                    pass
+                progress("bundle", 0, total, f"ZIP (letzte {hours}h) \u2026")
 
-            with ZipFile(zpath, "w", compression=ZIP_DEFLATED) as zf:
+            with ZipFile(zpath, "w", compression=ZIP_STORED, allowZip64=True) as zf:
                 try:
                     snap = {
                         "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
@@ -3207,40 +3583,78 @@ class ActionDispatcher:
                         },
                         "devices": [{"key": d.key, "name": d.name, "host": d.host} for d in self.cfg.devices],
                     }
-                    zf.writestr("config_snapshot.json", json.dumps(snap, indent=2, ensure_ascii=False))
+                    zf.writestr(
+                        "config_snapshot.json",
+                        json.dumps(snap, ensure_ascii=False, separators=(",", ":")),
+                        compress_type=ZIP_DEFLATED,
+                    )
                 except Exception:
                     pass
 
-                for p in paths:
-                    rel = p.relative_to(exp_root)
-                    try:
-                        zf.write(p, arcname=str(rel))
-                    except Exception:
-                        pass
-                    done += 1
-                    if progress and (done % 5 == 0 or done == total):
+                def _read_entry(p: Path) -> Tuple[ZipInfo, Optional[bytes], Optional[int]]:
+                    zi = ZipInfo.from_file(p, arcname=str(p.relative_to(exp_root)))
+                    level: Optional[int] = None
+                    if p.suffix.lower() in _BUNDLE_DEFLATE_EXT:
+                        zi.compress_type = ZIP_DEFLATED
+                        level = 3
+                    else:
+                        zi.compress_type = ZIP_STORED
+                    if zi.file_size > _BUNDLE_BUFFER_MAX:
+                        return zi, None, level
+                    return zi, p.read_bytes(), level
+
+                # Readers run ahead of the writer by a bounded window, limited
+                # both in entries and in buffered bytes; entries are written in
+                # `paths` order so the archive stays deterministic.
+                with ThreadPoolExecutor(max_workers=_BUNDLE_READERS) as ex:
+                    todo = iter(zip(paths, sizes))
+                    pending: deque = deque()
+                    nxt: Optional[Tuple[Path, int]] = next(todo, None)
+                    queued_bytes = 0
+
+                    def _fill() -> None:
+                        nonlocal nxt, queued_bytes
+                        while nxt is not None and len(pending) < 2 * _BUNDLE_READERS:
+                            fp, size = nxt
+                            # Files above _BUNDLE_BUFFER_MAX are streamed, not buffered.
+                            cost = size if size <= _BUNDLE_BUFFER_MAX else 0
+                            if pending and queued_bytes + cost > _BUNDLE_READAHEAD_BYTES:
+                                return
+                            queued_bytes += cost
+                            pending.append((fp, cost, ex.submit(_read_entry, fp)))
+                            nxt = next(todo, None)
+
+                    _fill()
+                    while pending:
+                        p, cost, fut = pending.popleft()
+                        queued_bytes -= cost
                         try:
-                            progress("bundle", done, total, f"{done}/{total} Dateien")
+                            zi, data, level = fut.result()
+                            if data is None:
+                                zf.write(p, arcname=zi.filename, compress_type=zi.compress_type, compresslevel=level)
+                            else:
+                                zf.writestr(zi, data, compresslevel=level)
                         except Exception:
                             pass
+                        _fill()
+                        done += 1
+                        if progress:
+                            progress("bundle", done, total, f"{done}/{total} Dateien")
 
             if progress:
-                try:
-                    progress("bundle", total, total, "OK")
-                except Exception:
-                    pass
+                progress("bundle", total, total, "OK")
 
             return {"ok": True, "files": [{"name": zpath.name, "url": f"/files/web/{zpath.name}"}], "count": len(paths), "hours": hours}
 
         # --- Heatmap data ---
         if action == "heatmap":
             try:
-                device_key = str(params.get("device") or "").strip()
+                device_key = _as_str(params.get("device"))
                 try:
                     year = int(params.get("year") or datetime.now().year)
                 except Exception:
                     year = datetime.now().year
-                unit_h = str(params.get("unit") or "kWh").strip()
+                unit_h = _as_str(params.get("unit"), "kWh")
                 use_eur = (unit_h.lower() in ("eur", "\u20ac", "euro"))
                 use_co2 = (unit_h.lower() in ("co2", "g co\u2082", "gco2"))
                 try:
@@ -3317,15 +3731,17 @@ class ActionDispatcher:
 
                 if hourly_df is not None and not hourly_df.empty and "hour_ts" in hourly_df.columns and "kwh" in hourly_df.columns:
                     daily_totals: Dict[str, float] = {}
-                    for _, row in hourly_df.iterrows():
+                    # Plain column values + struct_time: no per-row Series or
+                    # datetime objects (a year is ~8760 rows).
+                    for ts_raw, kwh_raw in zip(hourly_df["hour_ts"].tolist(), hourly_df["kwh"].tolist()):
                         try:
-                            ts_val = int(row["hour_ts"])
-                            kwh_val = float(row["kwh"] or 0.0)
+                            ts_val = int(ts_raw)
+                            kwh_val = float(kwh_raw or 0.0)
                             if _child_hourly:
                                 # net of children wired behind this meter (>=0)
                                 kwh_val = max(0.0, kwh_val - _child_hourly.get(ts_val, 0.0))
-                            dt_local = datetime.fromtimestamp(ts_val)
-                            date_str = dt_local.strftime("%Y-%m-%d")
+                            lt = time.localtime(ts_val)
+                            date_str = f"{lt.tm_year:04d}-{lt.tm_mon:02d}-{lt.tm_mday:02d}"
 
                             if use_co2:
                                 intensity = co2_intensity_map.get(ts_val, _co2_fallback_g)
@@ -3334,8 +3750,8 @@ class ActionDispatcher:
                                 val_h = kwh_val
 
                             daily_totals[date_str] = daily_totals.get(date_str, 0.0) + val_h
-                            wd = dt_local.weekday()
-                            h = dt_local.hour
+                            wd = lt.tm_wday
+                            h = lt.tm_hour
                             hourly_matrix[wd][h] += val_h
                             hourly_counts[wd][h] += 1
                         except Exception:
@@ -3544,7 +3960,6 @@ class ActionDispatcher:
         if action == "save_solar_config":
             try:
                 from shelly_analyzer.io.config import SolarConfig as _SC
-                import dataclasses
                 _old = getattr(self.cfg, "solar", _SC())
                 _new = _SC(
                     enabled=bool(params.get("enabled", getattr(_old, "enabled", False))),
@@ -3555,7 +3970,7 @@ class ActionDispatcher:
                     battery_kwh=float(params.get("battery_kwh", getattr(_old, "battery_kwh", 0.0))),
                     co2_production_kg_per_kwp=float(params.get("co2_production_kg_per_kwp", getattr(_old, "co2_production_kg_per_kwp", 1000.0))),
                 )
-                self.cfg = dataclasses.replace(self.cfg, solar=_new)
+                self.cfg = replace(self.cfg, solar=_new)
                 save_config(self.cfg, self.cfg_path)
                 return {"ok": True}
             except Exception as e:
@@ -3596,10 +4011,10 @@ class ActionDispatcher:
                 except Exception:
                     pass
 
-                dev_key = str(params.get("device_key", "")).strip()
+                dev_key = _as_str(params.get("device_key"))
                 dev = None
                 if dev_key:
-                    dev = next((d for d in self.cfg.devices if d.key == dev_key), None)
+                    dev = self._devices_by_key().get(dev_key)
                 if dev is None and self.cfg.devices:
                     dev = self.cfg.devices[0]
                 if dev is None:
@@ -3768,7 +4183,7 @@ class ActionDispatcher:
                 if not signed_key:
                     return {"ok": True, "configured": False, "devices": _all_devs_s, "config": _scfg_resp}
 
-                period_s = str(params.get("period") or "today").strip()
+                period_s = _as_str(params.get("period"), "today")
                 _tz3 = ZoneInfo("Europe/Berlin")
                 _now3 = datetime.now(_tz3)
                 _today3 = _now3.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -3972,8 +4387,8 @@ class ActionDispatcher:
         # --- Compare data ---
         if action == "compare":
             try:
-                device_a = str(params.get("device_a") or "").strip()
-                device_b = str(params.get("device_b") or "").strip()
+                device_a = _as_str(params.get("device_a"))
+                device_b = _as_str(params.get("device_b"))
                 if not device_a and self.cfg.devices:
                     device_a = self.cfg.devices[0].key
                 if not device_b and self.cfg.devices:
@@ -4000,16 +4415,16 @@ class ActionDispatcher:
                 if to_b < from_b:
                     from_b, to_b = to_b, from_b
 
-                unit_c = str(params.get("unit") or "kWh").strip()
+                unit_c = _as_str(params.get("unit"), "kWh")
                 use_eur = unit_c.lower() in ("eur", "\u20ac", "euro")
                 try:
                     _price4 = float(self.cfg.pricing.unit_price_gross())
                 except Exception:
                     _price4 = 0.30
 
-                gran = str(params.get("gran") or "total").strip()
+                gran = _as_str(params.get("gran"), "total")
 
-                preset = str(params.get("preset") or "").strip()
+                preset = _as_str(params.get("preset"))
                 if preset:
                     _now4 = today4
                     if preset == "month":
@@ -4043,7 +4458,7 @@ class ActionDispatcher:
                         from_b = date(_now4.year - 1, 1, 1)
                         to_b = date(_now4.year - 1, 12, 31)
 
-                _spot_mode4 = str(params.get("mode") or "").strip() == "spot"
+                _spot_mode4 = _as_str(params.get("mode")) == "spot"
 
                 if _spot_mode4:
                     daily_a = self._cmp_load_daily(device_a, from_a, to_a, True, _price4)
@@ -4302,7 +4717,7 @@ class ActionDispatcher:
         if action == "forecast":
             try:
                 from shelly_analyzer.services.forecast import compute_forecast
-                dk = str(params.get("device_key", "") or "")
+                dk = _as_str(params.get("device_key"))
                 if not dk and self.cfg.devices:
                     dk = self.cfg.devices[0].key
                 dev_name = dk
@@ -4414,7 +4829,7 @@ class ActionDispatcher:
         if action == "sankey":
             try:
                 from shelly_analyzer.services.sankey import compute_sankey, sankey_to_plotly_dict
-                period_sk = str(params.get("period", "today") or "today")
+                period_sk = _as_str(params.get("period"), "today")
                 # Net "meter behind meter": subtract sub-meters wired behind a
                 # meter (e.g. wallbox behind the house meter) so the flow isn't
                 # double-counted. ?raw=1 shows gross. Same map as Live/Plots/Heatmap.
@@ -4807,7 +5222,6 @@ class ActionDispatcher:
 
         if action == "ev_sessions":
             try:
-                import time as _t
                 from shelly_analyzer.services.ev_charging_log import detect_charging_sessions, get_monthly_summary
                 dev_key = str(getattr(self.cfg.ev_charging, "wallbox_device_key", "") or "")
                 if not dev_key:
@@ -4820,7 +5234,7 @@ class ActionDispatcher:
                 except (TypeError, ValueError):
                     days = 30
                 days = max(1, min(days, 730))
-                start_ts = int(_t.time()) - days * 86400
+                start_ts = int(time.time()) - days * 86400
                 df_ev = self.storage.read_device_df(dev_key, start_ts=start_ts)
                 df_ev = self._ev_extend_with_live(df_ev, dev_key)
                 sessions = detect_charging_sessions(
@@ -4832,10 +5246,8 @@ class ActionDispatcher:
                 )
                 # Drop sessions the user manually deleted (persisted ignore-list).
                 try:
-                    import json as _json
-                    from pathlib import Path as _Path
-                    _dp = _Path(getattr(self.storage, "base_dir", ".")) / "ev_deleted_sessions.json"
-                    _del = set(_json.loads(_dp.read_text())) if _dp.exists() else set()
+                    _dp = Path(getattr(self.storage, "base_dir", ".")) / "ev_deleted_sessions.json"
+                    _del = set(json.loads(_dp.read_text())) if _dp.exists() else set()
                 except Exception:
                     _del = set()
                 if _del:
@@ -4947,19 +5359,17 @@ class ActionDispatcher:
 
         if action == "ev_session_delete":
             try:
-                import json as _json
-                from pathlib import Path as _Path
                 sid = str((params.get("id") or params.get("session_id") or "")).strip()
                 if not sid:
                     return {"ok": False, "error": "missing session id"}
-                _dp = _Path(getattr(self.storage, "base_dir", ".")) / "ev_deleted_sessions.json"
+                _dp = Path(getattr(self.storage, "base_dir", ".")) / "ev_deleted_sessions.json"
                 try:
-                    _ids = set(_json.loads(_dp.read_text())) if _dp.exists() else set()
+                    _ids = set(json.loads(_dp.read_text())) if _dp.exists() else set()
                 except Exception:
                     _ids = set()
                 _ids.add(sid)
                 _dp.parent.mkdir(parents=True, exist_ok=True)
-                _dp.write_text(_json.dumps(sorted(_ids)))
+                _dp.write_text(json.dumps(sorted(_ids)))
                 return {"ok": True, "data": {"deleted": sid, "count": len(_ids)}}
             except Exception as e:
                 return {"ok": False, "error": str(e)}
@@ -5083,12 +5493,12 @@ class ActionDispatcher:
     def _web_plots_data(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Build JSON payload for the Plotly /plots page."""
         try:
-            view = str(params.get("view") or "timeseries")
-            devices_raw = str(params.get("devices") or "")
+            view = _as_str(params.get("view"), "timeseries")
+            devices_raw = _as_str(params.get("devices"))
             dev_keys_in = [k.strip() for k in devices_raw.split(",") if k and str(k).strip()]
             lang = str(params.get("lang") or self.lang or "de")
 
-            dev_cfgs = {d.key: d for d in self.cfg.devices}
+            dev_cfgs = self._devices_by_key()
 
             # Net "meter behind meter" display: subtract a device wired behind
             # another from its parent's series (Live + Plots share this map).
@@ -5100,20 +5510,10 @@ class ActionDispatcher:
             except Exception:
                 _submap = {}
 
-            def _norm(s: str) -> str:
-                s = (s or "").strip().lower()
-                s = s.replace("\u00e4", "ae").replace("\u00f6", "oe").replace("\u00fc", "ue").replace("\u00df", "ss")
-                for ch in [" ", "-", "_", "."]:
-                    s = s.replace(ch, "")
-                return s
-
-            alias: Dict[str, str] = {}
-            for d in self.cfg.devices:
-                alias[_norm(getattr(d, "key", ""))] = d.key
-                alias[_norm(getattr(d, "name", ""))] = d.key
+            alias = self._device_aliases()
             dev_keys: List[str] = []
             for raw in dev_keys_in:
-                k = alias.get(_norm(raw), raw)
+                k = alias.get(_alias_norm(raw), raw)
                 if k and k not in dev_keys:
                     dev_keys.append(k)
 
@@ -5130,9 +5530,9 @@ class ActionDispatcher:
             start = None
             end = None
             try:
-                if str(params.get("start") or "").strip():
+                if _as_str(params.get("start")):
                     start = _parse_date_flexible(str(params.get("start")))
-                if str(params.get("end") or "").strip():
+                if _as_str(params.get("end")):
                     end = _parse_date_flexible(str(params.get("end")))
             except Exception:
                 start = None
@@ -5159,19 +5559,19 @@ class ActionDispatcher:
                     _range_end_ts = None
 
             if view == "kwh":
-                mode = str(params.get("mode") or "days")
+                mode = _as_str(params.get("mode"), "days")
                 # Fast path: aggregate from the pre-built hourly_energy rollup
                 # (far fewer rows than raw samples → fast even on a cold cache).
                 # ?src=raw forces the legacy raw-sample path (for verification).
                 _use_raw_src = str(params.get("src", "")).lower() == "raw"
 
                 try:
-                    if start is None and end is None and str(params.get("len") or "").strip():
+                    if start is None and end is None and _as_str(params.get("len")):
                         try:
                             ln_kwh = float(params.get("len") or 24.0)
                         except Exception:
                             ln_kwh = 24.0
-                        unit_kwh = str(params.get("unit") or "hours")
+                        unit_kwh = _as_str(params.get("unit"), "hours")
                         delta_kwh = pd.Timedelta(hours=ln_kwh)
                         if unit_kwh.startswith("min"):
                             delta_kwh = pd.Timedelta(minutes=ln_kwh)
@@ -5216,13 +5616,6 @@ class ActionDispatcher:
                         diag["counts"][k] = int(len(df))
                         lbls, vals = self._stats_series(df, mode)
                     s = pd.Series(vals, index=[str(x) for x in lbls], dtype="float64")
-
-                    idx = [str(x) for x in s.index.tolist()]
-                    if not labels:
-                        labels = idx
-                    else:
-                        all_lab = sorted(set(labels).union(idx))
-                        labels = all_lab
                     name = dev_cfgs.get(k).name if k in dev_cfgs else k
                     traces.append({"key": k, "name": name, "series": s})
 
@@ -5272,15 +5665,28 @@ class ActionDispatcher:
                         if tr["key"] in _kwh_cache:
                             tr["series"] = _kwh_cache[tr["key"]]
 
+                # Label axis: the first non-empty device's labels as-is, or the
+                # sorted union once more than one device contributes. Netting
+                # above keeps each parent's own index, so this is unchanged.
+                for _pos, tr in enumerate(traces):
+                    if len(tr["series"]):
+                        if _pos == len(traces) - 1:
+                            labels = list(tr["series"].index)
+                        else:
+                            _idxs = [t2["series"].index for t2 in traces[_pos:]]
+                            if all(ix.is_monotonic_increasing for ix in _idxs):
+                                # Buckets come back time-ordered: one linear merge.
+                                labels = list(dict.fromkeys(heapq.merge(*_idxs)))
+                            else:
+                                labels = sorted(set().union(*_idxs))
+                        break
+                _label_idx = pd.Index(labels, dtype=object)
                 out_traces: List[Dict[str, Any]] = []
                 for tr in traces:
                     s = tr["series"]
-                    y = []
-                    for lab in labels:
-                        try:
-                            y.append(float(s.get(lab, 0.0)))
-                        except Exception:
-                            y.append(0.0)
+                    # Ambiguous (duplicate) labels count as 0, like a failed lookup.
+                    s = s[~s.index.duplicated(keep=False)]
+                    y = s.reindex(_label_idx, fill_value=0.0).to_numpy(dtype="float64").tolist()
                     out_traces.append({"key": tr["key"], "name": tr["name"], "y": y})
 
                 # Parse bucket unit from mode ("hours" / "days" / "weeks" / "months" / "hours:24" …)
@@ -5582,18 +5988,18 @@ class ActionDispatcher:
                 }
 
             # timeseries
-            metric = str(params.get("metric") or "W").upper().strip()
+            metric = _as_str(params.get("metric"), "W").upper()
             metric_norm = metric
             metric_label = {'W':'W','V':'V','A':'A','VAR':'VAR','Q':'VAR','COSPHI':'cos \u03c6','PF':'cos \u03c6','POWERFACTOR':'cos \u03c6'}.get(metric_norm, metric_norm)
 
-            series = str(params.get("series") or "total").lower().strip()
+            series = _as_str(params.get("series"), "total").lower()
             series_mode = 'phases' if series.startswith('phase') else 'total'
 
             try:
                 ln = float(params.get("len") or 24.0)
             except Exception:
                 ln = 24.0
-            unit_ts = str(params.get("unit") or "hours")
+            unit_ts = _as_str(params.get("unit"), "hours")
             delta = pd.Timedelta(hours=ln)
             if unit_ts.startswith("min"):
                 delta = pd.Timedelta(minutes=ln)
@@ -5608,6 +6014,8 @@ class ActionDispatcher:
                 "base_dir": str(getattr(self.storage, "base_dir", "")),
             }
             _delta_s = int(delta.total_seconds())
+            # Full-resolution totals for the meter-behind-meter netting below.
+            _full_totals: Dict[str, pd.Series] = {}
             for k in dev_keys:
                 _s_ts = _range_start_ts
                 _e_ts = _range_end_ts
@@ -5629,22 +6037,29 @@ class ActionDispatcher:
                 s_total, ylab = self._wva_series(dff, metric)
                 phases = self._wva_phase_series(dff, metric)
                 try:
-                    if not isinstance(s_total.index, pd.DatetimeIndex) and 'timestamp' in dff.columns:
-                        ts_idx = pd.to_datetime(dff['timestamp'], errors='coerce')
-                        s_total = pd.Series(pd.to_numeric(s_total, errors='coerce').to_numpy(), index=pd.DatetimeIndex(ts_idx)).dropna().sort_index()
+                    # Only series that came back without a DatetimeIndex need the
+                    # raw timestamps (_wva_series/_wva_phase_series normally align
+                    # them already); parse at most once per device for those.
+                    _need_total = not isinstance(s_total.index, pd.DatetimeIndex)
+                    _raw_phases = [
+                        kk for kk, ps in (phases.items() if isinstance(phases, dict) else ())
+                        if ps is not None and not isinstance(ps.index, pd.DatetimeIndex)
+                    ]
+                    ts_idx = None
+                    if (_need_total or _raw_phases) and 'timestamp' in dff.columns:
+                        ts_idx = pd.DatetimeIndex(pd.to_datetime(dff['timestamp'], errors='coerce'))
+                    if _need_total and ts_idx is not None:
+                        s_total = pd.Series(pd.to_numeric(s_total, errors='coerce').to_numpy(), index=ts_idx).dropna().sort_index()
                         if s_total.index.has_duplicates:
                             s_total = s_total.groupby(level=0).mean()
-                    if isinstance(phases, dict) and phases and 'timestamp' in dff.columns:
-                        ts_idx = pd.DatetimeIndex(pd.to_datetime(dff['timestamp'], errors='coerce'))
-                        msk = ~pd.isna(ts_idx)
-                        for kk in list(phases.keys()):
+                    if _raw_phases and ts_idx is not None:
+                        msk = ts_idx.notna() if ts_idx.hasnans else None
+                        for kk in _raw_phases:
                             try:
-                                ps = phases.get(kk)
-                                if ps is None:
-                                    continue
-                                if not isinstance(ps.index, pd.DatetimeIndex):
-                                    ps = pd.Series(pd.to_numeric(ps, errors='coerce').to_numpy(), index=ts_idx)
-                                ps = ps[msk].dropna().sort_index()
+                                ps = pd.Series(pd.to_numeric(phases[kk], errors='coerce').to_numpy(), index=ts_idx)
+                                if msk is not None:
+                                    ps = ps[msk]
+                                ps = ps.dropna().sort_index()
                                 if ps.index.has_duplicates:
                                     ps = ps.groupby(level=0).mean()
                                 phases[kk] = ps
@@ -5661,41 +6076,12 @@ class ActionDispatcher:
 
                 def _downsample(s: pd.Series) -> pd.Series:
                     try:
-                        if len(s) <= 2500:
-                            return s
-                        span = (s.index.max() - s.index.min()) if len(s) else pd.Timedelta(hours=0)
-                        rule = "1min"
-                        if span > pd.Timedelta(days=14):
-                            rule = "30min"
-                        elif span > pd.Timedelta(days=3):
-                            rule = "10min"
-                        elif span > pd.Timedelta(hours=12):
-                            rule = "2min"
-                        return s.resample(rule).mean().dropna()
+                        return _minmax_downsample(s)
                     except Exception:
                         return s
 
-                s_total = _downsample(s_total)
-                _idx = pd.to_datetime(getattr(s_total, "index", []), errors="coerce")
-
-                def _iso_ts(x: Any) -> str:
-                    try:
-                        if x is pd.NaT or x != x:
-                            return ""
-                        ts_v = pd.Timestamp(x)
-                        try:
-                            return ts_v.to_pydatetime(warn=False).isoformat()
-                        except TypeError:
-                            try:
-                                ts_v = ts_v.floor("us")
-                            except Exception:
-                                pass
-                            return ts_v.isoformat()
-                    except Exception:
-                        return ""
-
-                xs = [_iso_ts(x) for x in _idx]
-                ys = [float(v) if v == v else 0.0 for v in s_total.values.tolist()]
+                _full_totals[k] = s_total
+                xs, ys = _series_xy(_downsample(s_total))
                 dev_name = dev_cfgs.get(k).name if k in dev_cfgs else k
                 out_d: Dict[str, Any] = {"key": k, "name": dev_name, "x": xs, "y": ys}
                 if series_mode == "phases":
@@ -5710,11 +6096,8 @@ class ActionDispatcher:
                 if phases:
                     ph_out: Dict[str, Any] = {}
                     for pk, ps in phases.items():
-                        ps = _downsample(ps)
-                        ph_out[pk] = {
-                            "x": [_iso_ts(x) for x in pd.to_datetime(getattr(ps, "index", []), errors="coerce")],
-                            "y": [float(v) if v == v else 0.0 for v in ps.values.tolist()],
-                        }
+                        pxs, pys = _series_xy(_downsample(ps))
+                        ph_out[pk] = {"x": pxs, "y": pys}
                     if series_mode == "phases":
                         out_d["phases"] = ph_out
                 out_devs.append(out_d)
@@ -5722,17 +6105,20 @@ class ActionDispatcher:
             # Net "meter behind meter": for the power-over-time total (W) view,
             # subtract each flagged child's series from its parent's, aligned by
             # nearest timestamp. Only meaningful for power totals \u2014 voltages,
-            # currents etc. are never netted. Fully guarded: any failure leaves
-            # the gross series untouched.
+            # currents etc. are never netted. Netting runs on the full-resolution
+            # series and the result is reduced afterwards. Fully guarded: any
+            # failure leaves the gross series untouched.
             if _submap and series_mode == "total" and metric_norm == "W":
                 try:
                     _by_ts = {d["key"]: d for d in out_devs}
 
                     def _ts_series_for(_k: str) -> "pd.Series":
-                        _d = _by_ts.get(_k)
-                        if _d is not None:
-                            _ix = pd.to_datetime(_d.get("x") or [], errors="coerce")
-                            return pd.Series(_d.get("y") or [], index=_ix).dropna().sort_index()
+                        _st = _full_totals.get(_k)
+                        if _st is not None:
+                            _st = pd.to_numeric(_st, errors="coerce").dropna()
+                            if not isinstance(_st.index, pd.DatetimeIndex):
+                                return pd.Series(dtype="float64")
+                            return _st if _st.index.is_monotonic_increasing else _st.sort_index()
                         _s2 = _range_start_ts
                         _e2 = _range_end_ts
                         if _s2 is None and _e2 is None:
@@ -5752,7 +6138,7 @@ class ActionDispatcher:
                                 pd.to_numeric(_st, errors="coerce").to_numpy(),
                                 index=pd.DatetimeIndex(pd.to_datetime(_df["timestamp"], errors="coerce")),
                             ).dropna().sort_index()
-                        return _downsample(_st)
+                        return _st
 
                     for _parent, _kids in _submap.items():
                         _pd = _by_ts.get(_parent)
@@ -5761,14 +6147,8 @@ class ActionDispatcher:
                         _base = _ts_series_for(_parent)
                         if _base.empty:
                             continue
-                        for _c in _kids:
-                            _cs = _ts_series_for(_c)
-                            if _cs.empty:
-                                continue
-                            _aligned = _cs.reindex(_base.index, method="nearest",
-                                                   tolerance=pd.Timedelta("180s")).fillna(0.0)
-                            _base = _base.subtract(_aligned)
-                        _pd["y"] = [float(v) if v == v else 0.0 for v in _base.values.tolist()]
+                        _base = _net_of_children(_base, [_ts_series_for(_c) for _c in _kids])
+                        _pd["x"], _pd["y"] = _series_xy(_downsample(_base))
                         _pd["net_of_children"] = list(_kids)
                 except Exception:
                     pass
@@ -2,19 +2,16 @@
 from __future__ import annotations
 
 import inspect
-import json
 import logging
 import threading
 import time
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from shelly_analyzer.i18n import get_lang_map, normalize_lang
-from shelly_analyzer.i18n import t as _t
-from shelly_analyzer.io.config import AppConfig, load_config, save_config
+from shelly_analyzer.i18n import normalize_lang
+from shelly_analyzer.io.config import AppConfig
 from shelly_analyzer.io.storage import Storage
 from shelly_analyzer.services.webdash import (
-    LivePoint,
     LiveStateStore,
     _plotly_min_js_bytes,
     _SCRIPTABLE_WIDGET_JS,
@@ -62,26 +59,22 @@ class AppState:
             loaded = self.live_store.load_from_path(hist_path,
                                                    max_age_seconds=retention_m * 60)
             if loaded:
-                import logging
-                logging.getLogger(__name__).info(
+                logger.info(
                     "Restored %d live points from %s", loaded, hist_path)
         except Exception:
             pass
 
         # Device metadata
-        self.devices_meta: List[Dict[str, Any]] = [
-            {
-                "key": d.key,
-                "name": d.name,
-                "kind": str(getattr(d, "kind", "") or ""),
-                "phases": int(getattr(d, "phases", 3)),
-            }
-            for d in cfg.devices
-        ]
+        self._devices_meta_src: Any = None
+        self.devices_meta: List[Dict[str, Any]] = []
+        self.devices_meta_by_key: Dict[str, Dict[str, Any]] = {}
+        self._refresh_devices_meta(cfg)
 
         # Window settings
         self.window_minutes = int(cfg.ui.live_window_minutes)
         self.refresh_seconds = float(cfg.ui.live_web_refresh_seconds)
+        self._window_lock = threading.Lock()
+        self._window_timer: Optional[threading.Timer] = None
         self.available_windows = [5, 10, 15, 30, 60, 120]
         if self.window_minutes not in self.available_windows:
             self.available_windows.append(self.window_minutes)
@@ -100,8 +93,23 @@ class AppState:
         # Action handler (set by background service manager)
         self.on_action: Optional[Callable] = None
 
-        # Plotly JS bytes (cached)
+        # Plotly JS bytes (cached) and their gzip copy; see get_plotly_js_gz()
         self._plotly_js: Optional[bytes] = None
+        self._plotly_js_gz: Optional[bytes] = None
+
+        # Per-config derived device lookups; see _device_snapshot()
+        self._dev_snap_lock = threading.Lock()
+        # (config, snapshot) as one attribute so readers never pair a snapshot
+        # with the wrong config.
+        self._dev_snap: Optional[Tuple[AppConfig, Dict[str, Any]]] = None
+
+        # /api/config feature flags, rebuilt per config object; see _config_features()
+        self._features_snap: Optional[Tuple[AppConfig, Dict[str, bool]]] = None
+
+        # Rendered HTML pages: name -> (raw, gzipped); see page_html()
+        self._pages_lock = threading.Lock()
+        self._pages: Dict[str, Tuple[bytes, bytes]] = {}
+        self._pages_stale: set = set()
 
         # Port (set after server starts)
         self.port = int(cfg.ui.live_web_port)
@@ -118,22 +126,12 @@ class AppState:
         to the disk value (which is always whatever was there before we
         forced English on startup).
         """
-        import gzip
         new_lang = normalize_lang(lang)
         if new_lang == getattr(self, "lang", None):
             return
         self.lang = new_lang
-        try:
-            from shelly_analyzer.web import _render_dashboard_html, _render_plots_html, _render_control_html
-            self._dashboard_html = _render_dashboard_html(self)
-            self._dashboard_html_gz = gzip.compress(self._dashboard_html, compresslevel=6)
-            self._plots_html = _render_plots_html(self)
-            self._plots_html_gz = gzip.compress(self._plots_html, compresslevel=6)
-            self._control_html = _render_control_html(self)
-            self._control_html_gz = gzip.compress(self._control_html, compresslevel=6)
-            logger.info("Language set: %s – HTML templates re-rendered", new_lang)
-        except Exception as e:
-            logger.warning("HTML re-render after language switch failed: %s", e)
+        self.invalidate_pages()
+        logger.info("Language set: %s – HTML templates marked for re-render", new_lang)
 
     def _apply_compensation(self) -> None:
         """Push per-device measurement-compensation factors into the DB read
@@ -188,21 +186,10 @@ class AppState:
         else (device edits, alert rules, sync config, …) goes through
         this method without affecting language.
         """
-        import gzip
         self.cfg = cfg
         # Re-push measurement-compensation factors after any config change.
         self._apply_compensation()
-        self.devices_meta = [
-            {
-                "key": d.key,
-                "name": d.name,
-                "kind": str(getattr(d, "kind", "") or ""),
-                "phases": int(getattr(d, "phases", 3)),
-            }
-            for d in cfg.devices
-        ]
-        # Language or device list changed: re-render cached HTML templates
-        # (dashboard/plots/control pages embed translations + device chips at startup).
+        self._refresh_devices_meta(cfg)
         # Propagate config to background service manager (alert rules, Telegram, etc.)
         bg = getattr(self, "_bg", None)
         if bg is not None:
@@ -214,17 +201,111 @@ class AppState:
                 dispatcher.reload(cfg)
             except Exception:
                 pass
+        # Language or device list changed: the cached HTML pages embed
+        # translations + device chips. Re-render lazily on the next request –
+        # the setup wizard saves config several times in a row and the user
+        # only ever opens one of the pages afterwards.
+        self.invalidate_pages()
 
-        try:
+    # ── Device snapshots ───────────────────────────────────────────────
+
+    def _refresh_devices_meta(self, cfg: AppConfig) -> None:
+        """Rebuild ``devices_meta`` only when the device list itself changed.
+
+        ``replace(cfg, ui=...)`` & co. keep the same ``devices`` list object,
+        so config saves that don't touch devices reuse the existing metadata.
+        """
+        devices = cfg.devices
+        if devices is self._devices_meta_src:
+            return
+        meta = [
+            {
+                "key": d.key,
+                "name": d.name,
+                "kind": str(getattr(d, "kind", "") or ""),
+                "phases": int(getattr(d, "phases", 3)),
+            }
+            for d in devices
+        ]
+        self.devices_meta = meta
+        self.devices_meta_by_key = {m["key"]: m for m in meta if m["key"]}
+        self._devices_meta_src = devices
+
+    def _device_snapshot(self) -> Dict[str, Any]:
+        """Device lookups derived from the current config, built once per config.
+
+        Keyed on the config object itself: every device edit swaps in a new
+        AppConfig (``state.cfg = new_cfg``), so a stale snapshot can't survive
+        even when a caller skips :meth:`reload_config`.
+        """
+        cfg = self.cfg
+        cached = self._dev_snap
+        if cached is not None and cached[0] is cfg:
+            return cached[1]
+        with self._dev_snap_lock:
+            cached = self._dev_snap
+            if cached is not None and cached[0] is cfg:
+                return cached[1]
+            from shelly_analyzer.services.net_display import net_display_children
+            devices = tuple(getattr(cfg, "devices", None) or ())
+            by_key: Dict[str, Any] = {}
+            for d in devices:
+                by_key.setdefault(d.key, d)  # first match wins, like next(...)
+            snap = {
+                "devices": devices,
+                "by_key": by_key,
+                "net_display": net_display_children(devices),
+            }
+            self._dev_snap = (cfg, snap)
+            return snap
+
+    @property
+    def devices(self) -> Tuple[Any, ...]:
+        """Configured devices (read-only snapshot of ``cfg.devices``)."""
+        return self._device_snapshot()["devices"]
+
+    def device_by_key(self, key: str) -> Optional[Any]:
+        return self._device_snapshot()["by_key"].get(key)
+
+    def net_display_submap(self) -> Dict[str, List[str]]:
+        """Cached :func:`net_display_children` for the current devices. Read-only."""
+        return self._device_snapshot()["net_display"]
+
+    # ── Cached HTML pages ──────────────────────────────────────────────
+
+    def invalidate_pages(self) -> None:
+        """Mark all cached HTML pages stale; they re-render on next access."""
+        with self._pages_lock:
+            self._pages_stale.update(self._pages.keys())
+
+    def page_html(self, name: str) -> Tuple[bytes, bytes]:
+        """Return ``(raw, gzipped)`` HTML for ``dashboard``/``plots``/``control``.
+
+        Renders on first access after :meth:`invalidate_pages`. If a re-render
+        fails the previous version keeps being served.
+        """
+        import gzip
+        with self._pages_lock:
+            cached = self._pages.get(name)
+            if cached is not None and name not in self._pages_stale:
+                return cached
             from shelly_analyzer.web import _render_dashboard_html, _render_plots_html, _render_control_html
-            self._dashboard_html = _render_dashboard_html(self)
-            self._dashboard_html_gz = gzip.compress(self._dashboard_html, compresslevel=6)
-            self._plots_html = _render_plots_html(self)
-            self._plots_html_gz = gzip.compress(self._plots_html, compresslevel=6)
-            self._control_html = _render_control_html(self)
-            self._control_html_gz = gzip.compress(self._control_html, compresslevel=6)
-        except Exception as e:
-            logger.warning("HTML re-render after config reload failed: %s", e)
+            renderer = {
+                "dashboard": _render_dashboard_html,
+                "plots": _render_plots_html,
+                "control": _render_control_html,
+            }[name]
+            try:
+                raw = renderer(self)
+            except Exception as e:
+                if cached is None:
+                    raise
+                logger.warning("HTML re-render of %s page failed: %s", name, e)
+                return cached
+            page = (raw, gzip.compress(raw, compresslevel=6))
+            self._pages[name] = page
+            self._pages_stale.discard(name)
+            return page
 
     # ── Job management (same as LiveWebDashboard) ──────────────────────
 
@@ -345,33 +426,45 @@ class AppState:
 
     # ── Config endpoint ────────────────────────────────────────────────
 
+    def _config_features(self) -> Dict[str, bool]:
+        """Feature flags for /api/config. The config sections are frozen, so the
+        flags only change when a new AppConfig is swapped in. Read-only."""
+        cfg = self.cfg
+        snap = self._features_snap
+        if snap is not None and snap[0] is cfg:
+            return snap[1]
+        features = {
+            "solar": bool(getattr(cfg.solar, "enabled", False)),
+            "weather": bool(getattr(cfg.weather, "enabled", False)),
+            "co2": bool(getattr(cfg.co2, "enabled", False)),
+            "anomalies": bool(getattr(cfg.anomaly, "enabled", False)),
+            "forecast": bool(getattr(cfg.forecast, "enabled", False)),
+            "ev": bool(getattr(cfg.ev_charging, "enabled", False)),
+            "ev_log": bool(getattr(cfg.ev_charging, "enabled", False)),
+            "smart_sched": bool(getattr(cfg.smart_schedule, "enabled", False)),
+            "tariff": bool(getattr(cfg.tariff_compare, "enabled", False)),
+            "battery": bool(getattr(cfg.battery, "enabled", False)),
+            "advisor": bool(getattr(cfg.advisor, "enabled", False)),
+            "goals": bool(getattr(cfg.gamification, "enabled", False)),
+            "tenants": bool(getattr(cfg.tenant, "enabled", False)),
+            "device_control": bool(getattr(cfg.device_control, "enabled", False)),
+        }
+        # One tuple, so a concurrent reader never pairs new cfg with old flags.
+        self._features_snap = (cfg, features)
+        return features
+
     def get_config_response(self) -> Dict[str, Any]:
         """Data for /api/config endpoint."""
-        cfg = self.cfg
+        # window_minutes / refresh_seconds are coerced once when they are set.
         return {
-            "window_minutes": int(self.window_minutes),
-            "refresh_seconds": float(self.refresh_seconds),
+            "window_minutes": self.window_minutes,
+            "refresh_seconds": self.refresh_seconds,
             "available_windows": list(self.available_windows),
             "analyzer_running": True,  # Flask IS the analyzer
             "analyzer_heartbeat_ts": int(time.time()),
             "devices_meta": self.devices_meta,
             "lang": self.lang,
-            "features": {
-                "solar": bool(getattr(cfg.solar, "enabled", False)),
-                "weather": bool(getattr(cfg.weather, "enabled", False)),
-                "co2": bool(getattr(cfg.co2, "enabled", False)),
-                "anomalies": bool(getattr(cfg.anomaly, "enabled", False)),
-                "forecast": bool(getattr(cfg.forecast, "enabled", False)),
-                "ev": bool(getattr(cfg.ev_charging, "enabled", False)),
-                "ev_log": bool(getattr(cfg.ev_charging, "enabled", False)),
-                "smart_sched": bool(getattr(cfg.smart_schedule, "enabled", False)),
-                "tariff": bool(getattr(cfg.tariff_compare, "enabled", False)),
-                "battery": bool(getattr(cfg.battery, "enabled", False)),
-                "advisor": bool(getattr(cfg.advisor, "enabled", False)),
-                "goals": bool(getattr(cfg.gamification, "enabled", False)),
-                "tenants": bool(getattr(cfg.tenant, "enabled", False)),
-                "device_control": bool(getattr(cfg.device_control, "enabled", False)),
-            },
+            "features": self._config_features(),
         }
 
     def set_window_minutes(self, minutes: int) -> int:
@@ -382,14 +475,29 @@ class AppState:
             self.available_windows.append(minutes)
             self.available_windows = sorted(set(self.available_windows))
         self.window_minutes = minutes
-        approx_points = int(minutes * 60 * 2) + 100
+        # Growing the live store copies every device deque. Presets clicked in
+        # quick succession are coalesced into one resize for the last window.
+        if self._window_points(minutes) > self.live_store.max_points:
+            with self._window_lock:
+                if self._window_timer is None:
+                    self._window_timer = threading.Timer(0.15, self._flush_window_change)
+                    self._window_timer.daemon = True
+                    self._window_timer.start()
+        return minutes
+
+    @staticmethod
+    def _window_points(minutes: int) -> int:
+        return int(minutes * 60 * 2) + 100
+
+    def _flush_window_change(self) -> None:
+        with self._window_lock:
+            self._window_timer = None
         try:
             self.live_store.set_max_points(
-                max(self.live_store.max_points, approx_points)
+                max(self.live_store.max_points, self._window_points(self.window_minutes))
             )
         except Exception:
             pass
-        return minutes
 
     # ── File serving ───────────────────────────────────────────────────
 
@@ -490,3 +598,11 @@ class AppState:
         if self._plotly_js is None:
             self._plotly_js = _plotly_min_js_bytes()
         return self._plotly_js or b""
+
+    def get_plotly_js_gz(self) -> bytes:
+        """plotly.min.js gzipped once (~4.8 MB -> ~1.5 MB), reused per request."""
+        if self._plotly_js_gz is None:
+            import gzip
+            raw = self.get_plotly_js()
+            self._plotly_js_gz = gzip.compress(raw, compresslevel=6) if raw else b""
+        return self._plotly_js_gz
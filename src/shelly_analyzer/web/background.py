@@ -7,7 +7,8 @@ from __future__ import annotations
 
 import json
 import logging
-import math
+import operator
+import queue
 import re
 import threading
 import time
@@ -16,7 +17,7 @@ import urllib.request
 import urllib.error
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from shelly_analyzer.io.config import AppConfig
 from shelly_analyzer.io.storage import Storage
@@ -24,6 +25,90 @@ from shelly_analyzer.services.webdash import LivePoint, LiveStateStore
 
 logger = logging.getLogger(__name__)
 
+_ZERO_ABC = (0.0, 0.0, 0.0)
+_EMPTY: Dict[str, Any] = {}
+
+# Alert metric kind -> LiveSample field it reads
+_ALERT_FIELDS = {
+    "W": "power_w", "V": "voltage_v", "A": "current_a",
+    "VAR": "reactive_var", "PF": "cosphi", "HZ": "freq_hz",
+}
+# Parsed alert metric strings: metric -> (kind, phase or None)
+_ALERT_METRICS: Dict[str, Tuple[str, Optional[str]]] = {}
+
+
+def _parse_alert_metric(metric: str) -> Tuple[str, Optional[str]]:
+    m0 = (metric or "W").strip().upper()
+    m = m0.replace(" ", "").replace("Φ", "PHI")
+    phase = None
+    base = m
+    if m.endswith("_L1"):
+        phase = "a"; base = m[:-3]
+    elif m.endswith("_L2"):
+        phase = "b"; base = m[:-3]
+    elif m.endswith("_L3"):
+        phase = "c"; base = m[:-3]
+    if base in {"W", "P", "POWER"}:
+        return "W", phase
+    if base in {"V", "VOLT", "VOLTAGE"}:
+        return "V", phase
+    if base in {"A", "AMP", "CURRENT"}:
+        return "A", phase
+    if base in {"VAR", "Q", "REACTIVE"}:
+        return "VAR", phase
+    if base in {"COSPHI", "PF", "POWERFACTOR"}:
+        return "PF", phase
+    if base in {"HZ", "FREQ", "FREQUENCY"}:
+        return "HZ", None
+    return "W", None
+
+
+def _mean_abc(d: Dict[str, Any]) -> float:
+    vals = [x for x in (float(d.get(k, 0) or 0) for k in ("a", "b", "c")) if x != 0]
+    if vals:
+        return sum(vals) / len(vals)
+    return float(d.get("total", 0) or 0)
+
+
+def _sum_abc(d: Dict[str, Any]) -> float:
+    s = sum(float(d.get(k, 0) or 0) for k in ("a", "b", "c"))
+    return s if s != 0 else float(d.get("total", 0) or 0)
+
+
+def _abc(d: Dict[str, float], scale: float = 1.0) -> Tuple[float, float, float]:
+    """Per-phase a/b/c values of a LiveSample field (missing -> 0.0).
+
+    The pollers' parse_*_fields already coerce every value to float, so they
+    are trusted here. Empty dicts (switches have no V/A/VAR phases) skip the
+    lookups entirely."""
+    if not d:
+        return _ZERO_ABC
+    get = d.get
+    if scale == 1.0:
+        return get("a", 0.0), get("b", 0.0), get("c", 0.0)
+    return get("a", 0.0) * scale, get("b", 0.0) * scale, get("c", 0.0) * scale
+
+
+_ALERT_OPS: Dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt, "<": operator.lt,
+    ">=": operator.ge, "=>": operator.ge,
+    "<=": operator.le, "=<": operator.le,
+    "=": operator.eq, "==": operator.eq,
+}
+
+
+def _drain_queue(q: "queue.Queue[Any]") -> List[Any]:
+    """Take everything currently queued under one lock acquisition.
+
+    Cheaper than a get_nowait()/queue.Empty loop. Pollers only use
+    put_nowait/put (no join), so waking blocked producers suffices.
+    """
+    with q.mutex:
+        items = list(q.queue)
+        q.queue.clear()
+        q.not_full.notify_all()
+    return items
+
 
 class BackgroundServiceManager:
     """Manages all background services that run alongside Flask."""
@@ -67,13 +152,38 @@ class BackgroundServiceManager:
         self._today_state: Dict[str, Dict[str, Any]] = {}
         self._today_kwh_lock = threading.Lock()
 
+        # Per-sample device lookups for the feed loop, rebuilt when
+        # cfg.devices is a different list: (devices, key -> DeviceConfig,
+        # key -> comp factor) kept as one tuple so readers never mix lists
+        self._dev_maps: Optional[Tuple[Any, Dict[str, Any], Dict[str, float]]] = None
+        # (day_start_ts, next_day_start_ts, local date) of the last sample seen,
+        # so per-sample day lookups skip datetime.fromtimestamp.
+        self._local_day_span: Tuple[int, int, Optional[date]] = (0, 0, None)
+        # local date -> gross unit price (EUR/kWh), rebuilt when cfg.pricing is
+        # a different object, so hot-reloaded tariffs are picked up
+        self._unit_price_src: Any = None
+        self._unit_price_by_day: Dict[date, float] = {}
+        # Hot-path caches, declared here so the per-sample readers can use
+        # plain attribute access instead of getattr() with a default.
+        # key -> (calendar day, running high) for monotonic MQTT daily values
+        self._daily_mono: Dict[str, Tuple[date, float]] = {}
+        # (fetched_at, g/kWh) and (fetched_at, net, effective EUR/kWh), 60 s TTL
+        self._co2_intensity_cache: Optional[Tuple[float, float]] = None
+        self._spot_price_cache: Optional[Tuple[float, float, float]] = None
+
         # NILM (non-intrusive load monitoring) transition learners per device
         self._nilm_learners: Dict[str, Any] = {}
-        self._nilm_last_cluster_ts: float = 0.0
         self._nilm_cluster_interval: float = 300.0  # re-cluster every 5 min
+        # time.monotonic() deadline of the next re-cluster, so the per-sample
+        # gate is one compare and immune to wall-clock jumps
+        self._nilm_next_cluster_at: float = 0.0
 
         # Alert rule evaluation state: {rule_id: {start_ts, triggered, last_trigger_ts}}
         self._alert_state: Dict[str, Dict[str, Any]] = {}
+        # device_key -> enabled rules that can match it, rebuilt when cfg.alerts
+        # is a different object (AppConfig is replaced on every save)
+        self._alert_rules_src: Any = None
+        self._alert_rules_by_key: Dict[str, Tuple[Any, ...]] = {}
         # Summary scheduling thread
         self._summary_thread: Optional[threading.Thread] = None
         self._summary_last_daily: str = ""   # YYYY-MM-DD
@@ -195,151 +305,170 @@ class BackgroundServiceManager:
 
     def _feed_loop(self) -> None:
         """Drain live samples from poller queue into LiveStateStore."""
-        import queue
-        from datetime import datetime, date as _date
-
-        # Cache the effective price per date so we both honor the tariff schedule
-        # and pick up config hot-reloads without an app restart.
-        _price_cache: Dict[_date, float] = {}
-
-        def _price_for(day: _date) -> float:
-            p = _price_cache.get(day)
-            if p is not None:
-                return p
-            try:
-                p = float(self.cfg.pricing.effective_pricing_for_date(day).unit_price_gross())
-            except Exception:
-                p = float(getattr(self.cfg.pricing, "electricity_price_eur_per_kwh", 0.30) or 0.30)
-            _price_cache[day] = p
-            # Keep cache small: only today + yesterday are ever needed.
-            if len(_price_cache) > 4:
-                for old in list(_price_cache.keys()):
-                    if old != day:
-                        _price_cache.pop(old, None)
-            return p
-
-        while not self._stop_event.is_set():
+        # Bound to the poller this thread was started for. A reload starts a
+        # new poller and feed thread, so this one exits instead of competing
+        # for the new poller's queue.
+        poller = self._live_poller
+        if poller is None:
+            return
+        samples = poller.samples
+        # Nothing reads poll errors here (the pollers already log each
+        # failure), but the bounded queue must not stay full: every further
+        # failure would then raise queue.Full in the poller.
+        errors = getattr(poller, "errors", None)
+
+        while not self._stop_event.is_set() and self._live_poller is poller:
+            if errors is not None and errors.queue:
+                _drain_queue(errors)
             try:
-                sample = self._live_poller.samples.get(timeout=1.0)
+                first = samples.get(timeout=1.0)
             except queue.Empty:
                 continue
             except Exception:
                 break
+            # Take everything else that queued up meanwhile in one go instead
+            # of one get() per sample.
+            batch = [first]
+            batch.extend(_drain_queue(samples))
+
+            # Grid-wide MQTT values (tariff, spot, CO2) don't depend on the
+            # sample: build them at most once per drained batch.
+            grid_data: Optional[Dict[str, Any]] = None
+            # Bind the per-sample callees once per batch rather than looking
+            # them up on self for every sample.
+            comp_factor = self._comp_factor
+            accumulate_kwh = self._accumulate_today_kwh
+            local_day = self._local_day
+            unit_price_for = self._unit_price_for
+            observe_nilm = self._observe_nilm
+            store_update = self.live_store.update
+            alert_rules_for = self._alert_rules_for
+            for sample in batch:
+                try:
+                    dk = sample.device_key
+                    p = sample.power_w or {}
+                    v = sample.voltage_v or {}
+                    c = sample.current_a or {}
+                    r = sample.reactive_var or {}
+                    cp = sample.cosphi or {}
+                    f = sample.freq_hz or {}
+                    raw = sample.raw or {}
+
+                    # kWh-today: trapezoidal integration of power_w.total since start
+                    # of local day. Reset accumulator at midnight.
+                    ts_i = int(sample.ts or time.time())
+                    _cf = comp_factor(dk)
+                    power_total = p.get("total", 0.0) * _cf
+                    kwh_today = accumulate_kwh(dk, ts_i, power_total)
+                    cost_today = kwh_today * unit_price_for(local_day(ts_i)[0])
+                    # Feed NILM learner
+                    observe_nilm(dk, ts_i, power_total)
+
+                    va, vb, vc = _abc(v)
+                    ia, ib, ic = _abc(c)
+                    pa, pb, pc = _abc(p, _cf)
+                    qa, qb, qc = _abc(r)
+                    pfa, pfb, pfc = _abc(cp)
+                    point = LivePoint(
+                        ts=ts_i,
+                        power_total_w=power_total,
+                        va=va, vb=vb, vc=vc,
+                        ia=ia, ib=ib, ic=ic,
+                        pa=pa, pb=pb, pc=pc,
+                        q_total_var=r.get("total", 0.0),
+                        qa=qa, qb=qb, qc=qc,
+                        cosphi_total=cp.get("total", 0.0),
+                        pfa=pfa, pfb=pfb, pfc=pfc,
+                        kwh_today=kwh_today,
+                        cost_today=cost_today,
+                        freq_hz=f.get("total") or 50.0,
+                        i_n=float(raw.get("i_n", 0) or 0),
+                        raw=raw,
+                    )
+                    store_update(dk, point)
 
-            try:
-                p = sample.power_w or {}
-                v = sample.voltage_v or {}
-                c = sample.current_a or {}
-                r = sample.reactive_var or {}
-                cp = sample.cosphi or {}
-                f = sample.freq_hz or {}
-                raw = sample.raw or {}
-
-                # kWh-today: trapezoidal integration of power_w.total since start
-                # of local day. Reset accumulator at midnight.
-                ts_i = int(sample.ts or time.time())
-                _cf = self._comp_factor(sample.device_key)
-                power_total = float(p.get("total", 0) or 0) * _cf
-                kwh_today = self._accumulate_today_kwh(sample.device_key, ts_i, power_total)
-                cost_today = kwh_today * _price_for(datetime.fromtimestamp(ts_i).date())
-                # Feed NILM learner
-                self._observe_nilm(sample.device_key, ts_i, power_total)
-
-                point = LivePoint(
-                    ts=int(sample.ts or time.time()),
-                    power_total_w=power_total,
-                    va=float(v.get("a", 0) or 0),
-                    vb=float(v.get("b", 0) or 0),
-                    vc=float(v.get("c", 0) or 0),
-                    ia=float(c.get("a", 0) or 0),
-                    ib=float(c.get("b", 0) or 0),
-                    ic=float(c.get("c", 0) or 0),
-                    pa=float(p.get("a", 0) or 0) * _cf,
-                    pb=float(p.get("b", 0) or 0) * _cf,
-                    pc=float(p.get("c", 0) or 0) * _cf,
-                    q_total_var=float(r.get("total", 0) or 0),
-                    qa=float(r.get("a", 0) or 0),
-                    qb=float(r.get("b", 0) or 0),
-                    qc=float(r.get("c", 0) or 0),
-                    cosphi_total=float(cp.get("total", 0) or 0),
-                    pfa=float(cp.get("a", 0) or 0),
-                    pfb=float(cp.get("b", 0) or 0),
-                    pfc=float(cp.get("c", 0) or 0),
-                    kwh_today=kwh_today,
-                    cost_today=cost_today,
-                    freq_hz=float(f.get("total", 50) or 50),
-                    i_n=float(raw.get("i_n", 0) or 0),
-                    raw=raw,
-                )
-                self.live_store.update(sample.device_key, point)
-
-                # Wire the MqttPublisher into the live feed: publish each sample
-                # so Home Assistant MQTT auto-discovery actually receives data.
-                if self._mqtt_publisher is not None:
-                    try:
-                        _dn = sample.device_key
-                        for _d in (getattr(self.cfg, "devices", []) or []):
-                            _k = _d.get("key") if isinstance(_d, dict) else getattr(_d, "key", None)
-                            if _k == sample.device_key:
-                                _nm = _d.get("name") if isinstance(_d, dict) else getattr(_d, "name", None)
-                                _dn = _nm or sample.device_key
-                                break
-                        self._mqtt_publisher.publish_device_data(
-                            sample.device_key, _dn,
-                            {
-                                "power_w": point.power_total_w,
-                                "power_l1": point.pa, "power_l2": point.pb, "power_l3": point.pc,
-                                "voltage_v": point.va,
-                                "voltage_l1": point.va, "voltage_l2": point.vb, "voltage_l3": point.vc,
-                                "current_a": (point.ia + point.ib + point.ic),
-                                "current_l1": point.ia, "current_l2": point.ib, "current_l3": point.ic,
-                                "energy_kwh": self._mqtt_energy_today(sample.device_key, point.kwh_today),
-                                "freq_hz": point.freq_hz,
-                                "cosphi": point.cosphi_total,
-                                "co2_g_per_h": round((point.power_total_w / 1000.0) * self._current_co2_intensity(), 1),
-                                "cost_eur_today": self._mqtt_daily_monotonic(
-                                    sample.device_key + "::cost", round(point.cost_today, 2)),
-                            },
-                        )
-                    except Exception:
-                        logger.debug("MQTT publish_device_data failed", exc_info=True)
-
-                if self._mqtt_publisher is not None:
-                    try:
-                        self._mqtt_publisher.publish_grid_data({
-                            "spot_price_eur_kwh": self._current_spot_price(),
-                            "spot_price_net_eur_kwh": self._current_spot_price_net(),
-                            "tariff_price_eur_kwh": round(self._current_tariff_price(), 4),
-                            "co2_intensity_g_per_kwh": round(
-                                self._current_co2_intensity(), 1),
-                        })
-                    except Exception:
-                        logger.debug("MQTT publish_grid_data failed", exc_info=True)
-
-                # Evaluate alert rules against this sample
+                    # Wire the MqttPublisher into the live feed so Home Assistant
+                    # MQTT auto-discovery actually receives data. The publisher
+                    # rate-limits per key, so only build payloads it will send.
+                    mqtt = self._mqtt_publisher
+                    if mqtt is not None and mqtt.is_due(dk):
+                        try:
+                            _d = self._device_maps()[0].get(dk)
+                            _dn = (getattr(_d, "name", None) if _d is not None else None) or dk
+                            mqtt.publish_device_data(
+                                dk, _dn,
+                                {
+                                    "power_w": point.power_total_w,
+                                    "power_l1": point.pa, "power_l2": point.pb, "power_l3": point.pc,
+                                    "voltage_v": point.va,
+                                    "voltage_l1": point.va, "voltage_l2": point.vb, "voltage_l3": point.vc,
+                                    "current_a": (point.ia + point.ib + point.ic),
+                                    "current_l1": point.ia, "current_l2": point.ib, "current_l3": point.ic,
+                                    "energy_kwh": self._mqtt_energy_today(dk, point.kwh_today),
+                                    "freq_hz": point.freq_hz,
+                                    "cosphi": point.cosphi_total,
+                                    "co2_g_per_h": round((point.power_total_w / 1000.0) * self._current_co2_intensity(), 1),
+                                    "cost_eur_today": self._mqtt_daily_monotonic(
+                                        dk + "::cost", round(point.cost_today, 2)),
+                                },
+                            )
+                        except Exception:
+                            logger.debug("MQTT publish_device_data failed", exc_info=True)
+                    if mqtt is not None and mqtt.is_due("__netz__"):
+                        try:
+                            if grid_data is None:
+                                grid_data = {
+                                    "spot_price_eur_kwh": self._current_spot_price(),
+                                    "spot_price_net_eur_kwh": self._current_spot_price_net(),
+                                    "tariff_price_eur_kwh": round(self._current_tariff_price(), 4),
+                                    "co2_intensity_g_per_kwh": round(
+                                        self._current_co2_intensity(), 1),
+                                }
+                            mqtt.publish_grid_data(grid_data)
+                        except Exception:
+                            logger.debug("MQTT publish_grid_data failed", exc_info=True)
+
+                    # Evaluate alert rules against this sample (skipped outright for
+                    # devices no enabled rule can match, the common case). Last
+                    # step, so the per-sample handler below covers its errors.
+                    if alert_rules_for(dk):
+                        self._alerts_process_sample(sample)
+                except Exception as e:
+                    logger.debug("Feed loop error: %s", e)
+
+    def _device_maps(self) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """(key -> DeviceConfig, key -> comp factor), memoized on the identity
+        of ``cfg.devices`` so the feed loop does O(1) lookups per sample."""
+        devices = self.cfg.devices
+        maps = self._dev_maps
+        if maps is None or maps[0] is not devices:
+            by_key: Dict[str, Any] = {}
+            comp: Dict[str, float] = {}
+            for d in (devices or []):
+                if d.key in by_key:
+                    continue  # first match wins, like the previous scans
+                by_key[d.key] = d
                 try:
-                    self._alerts_process_sample(sample)
+                    hist = getattr(d, "compensation_history", ()) or ()
+                    if hist:
+                        last = hist[-1]
+                        comp[d.key] = 1.0 + float(getattr(last, "percent", 0.0) or 0.0) / 100.0
+                    else:
+                        comp[d.key] = 1.0 + float(getattr(d, "compensation_percent", 0.0) or 0.0) / 100.0
                 except Exception:
-                    pass
-            except Exception as e:
-                logger.debug("Feed loop error: %s", e)
+                    comp[d.key] = 1.0
+            maps = (devices, by_key, comp)
+            self._dev_maps = maps
+        return maps[1], maps[2]
 
     def _comp_factor(self, device_key: str) -> float:
         """Measurement-compensation factor for a device (1 + percent/100) at
         the *current* time. 0 % -> 1.0 -> no-op. With a calibration history,
         the latest history entry wins; without it, the legacy scalar applies."""
         try:
-            for d in (self.cfg.devices or []):
-                if d.key != device_key:
-                    continue
-                hist = getattr(d, "compensation_history", ()) or ()
-                if hist:
-                    last = hist[-1]
-                    return 1.0 + float(getattr(last, "percent", 0.0) or 0.0) / 100.0
-                return 1.0 + float(getattr(d, "compensation_percent", 0.0) or 0.0) / 100.0
+            return self._device_maps()[1].get(device_key, 1.0)
         except Exception:
-            pass
-        return 1.0
+            return 1.0
 
     def _mqtt_daily_monotonic(self, key: str, raw: float) -> float:
         """Clamp a daily-resetting cumulative value (energy or cost) so it is
@@ -358,10 +487,7 @@ class BackgroundServiceManager:
             raw = float(raw)
         except (TypeError, ValueError):
             return raw
-        store = getattr(self, "_daily_mono", None)
-        if store is None:
-            store = {}
-            self._daily_mono = store
+        store = self._daily_mono
         today = date.today()
         rec = store.get(key)
         if rec is None:
@@ -413,7 +539,7 @@ class BackgroundServiceManager:
                         try:
                             if df["timestamp"].dt.tz is None:
                                 df["timestamp"] = df["timestamp"].dt.tz_localize("UTC")
-                            from datetime import datetime, timezone
+                            from datetime import datetime
                             local_tz = datetime.now().astimezone().tzinfo
                             df["timestamp"] = df["timestamp"].dt.tz_convert(local_tz)
                         except Exception:
@@ -450,17 +576,32 @@ class BackgroundServiceManager:
             logger.debug("Baseline lookup failed for %s: %s", device_key, e)
             return 0.0, int(day_start_ts)
 
+    def _local_day(self, ts: int) -> Tuple[date, int]:
+        """Local date of ``ts`` and the epoch of its local midnight. Only
+        recomputed when ``ts`` leaves the cached day (DST-aware via mktime)."""
+        start, end, day = self._local_day_span
+        if day is None or not (start <= ts < end):
+            day = datetime.fromtimestamp(ts).date()
+            start = int(datetime(day.year, day.month, day.day).timestamp())
+            nxt = day + timedelta(days=1)
+            end = int(datetime(nxt.year, nxt.month, nxt.day).timestamp())
+            self._local_day_span = (start, end, day)
+        return day, start
+
     def _accumulate_today_kwh(self, device_key: str, ts: int, power_w: float) -> float:
         """Trapezoid-integrate power (W) samples into kWh for the current local day,
         starting from the DB baseline (already-synced hours of today).
 
         Resets automatically at local midnight. Returns total kWh for today.
-        """
-        from datetime import datetime
 
-        ts_dt = datetime.fromtimestamp(int(ts))
-        day = ts_dt.date()
-        day_start = int(datetime(day.year, day.month, day.day).timestamp())
+        This is a constant-time step per sample (one trapezoid against the
+        previous point), so arguments are coerced once up front and the state
+        dict's keys are read directly.
+        """
+        ts = int(ts)
+        power_w = float(power_w)
+        day, day_start = self._local_day(ts)
+        now = int(time.time())
 
         with self._today_kwh_lock:
             st = self._today_state.get(device_key)
@@ -475,7 +616,7 @@ class BackgroundServiceManager:
                     st is not None
                     and st.get("date") is not None
                     and st.get("date") != day
-                    and (ts_dt - datetime(day.year, day.month, day.day)).total_seconds() < 3600
+                    and ts - day_start < 3600
                 )
                 if live_rollover:
                     base_kwh, base_last_ts = 0.0, day_start
@@ -488,13 +629,13 @@ class BackgroundServiceManager:
                     "live_kwh": 0.0,
                     "last_ts": None,
                     "last_p": None,
-                    "baseline_refreshed_at": int(time.time()),
+                    "baseline_refreshed_at": now,
                 }
                 self._today_state[device_key] = st
 
             # Periodically refresh baseline from DB (after each auto-sync the DB has
             # grown; we must pick that up and reset live accumulator to avoid double counting).
-            if int(time.time()) - int(st.get("baseline_refreshed_at", 0)) > 600:
+            if now - int(st.get("baseline_refreshed_at", 0)) > 600:
                 base_kwh, base_last_ts = self._load_today_baseline(device_key, day_start)
                 old_last = int(st.get("base_last_ts", 0))
                 if int(base_last_ts) > old_last:
@@ -506,28 +647,19 @@ class BackgroundServiceManager:
                     st["last_p"] = None
                 st["baseline_refreshed_at"] = int(time.time())
 
-            base_last_ts = int(st.get("base_last_ts", day_start))
-
-            # Only accumulate samples after the DB baseline end
-            if int(ts) <= base_last_ts:
-                st["last_ts"] = int(ts)
-                st["last_p"] = float(power_w)
-            else:
-                last_ts = st.get("last_ts")
-                last_p = st.get("last_p")
-                # If previous sample was within the baseline window, restart from here
-                if last_ts is None or last_p is None or int(last_ts) <= base_last_ts:
-                    st["last_ts"] = int(ts)
-                    st["last_p"] = float(power_w)
-                else:
-                    dt = float(int(ts) - int(last_ts))
-                    if 0 < dt <= 300:
-                        wh = (float(last_p) + float(power_w)) / 2.0 * (dt / 3600.0)
-                        st["live_kwh"] = float(st.get("live_kwh", 0.0) or 0.0) + (wh / 1000.0)
-                    st["last_ts"] = int(ts)
-                    st["last_p"] = float(power_w)
+            base_last_ts = st["base_last_ts"]
+            last_ts = st["last_ts"]
+            last_p = st["last_p"]
+            # Only accumulate samples after the DB baseline end. If the previous
+            # sample was within the baseline window, restart from here.
+            if ts > base_last_ts and last_ts is not None and last_p is not None and last_ts > base_last_ts:
+                dt = ts - last_ts
+                if 0 < dt <= 300:
+                    st["live_kwh"] += (last_p + power_w) / 2.0 * (dt / 3600.0) / 1000.0
+            st["last_ts"] = ts
+            st["last_p"] = power_w
 
-            return float(st.get("base_kwh", 0.0) or 0.0) + float(st.get("live_kwh", 0.0) or 0.0)
+            return st["base_kwh"] + st["live_kwh"]
 
     # ── NILM ───────────────────────────────────────────────────────────
 
@@ -578,9 +710,9 @@ class BackgroundServiceManager:
         except Exception:
             pass
         # Periodically re-cluster and push to store
-        now = time.time()
-        if (now - self._nilm_last_cluster_ts) >= self._nilm_cluster_interval:
-            self._nilm_last_cluster_ts = now
+        now = time.monotonic()
+        if now >= self._nilm_next_cluster_at:
+            self._nilm_next_cluster_at = now + self._nilm_cluster_interval
             self._push_nilm_to_store()
 
     def _push_nilm_to_store(self) -> None:
@@ -621,10 +753,10 @@ class BackgroundServiceManager:
             all_transitions.sort(key=lambda x: x["ts"], reverse=True)
             store = self.live_store
             if store is not None:
-                store._nilm_clusters = all_clusters  # type: ignore[attr-defined]
-                store._nilm_transition_count = total_trans  # type: ignore[attr-defined]
-                store._nilm_transitions = all_transitions[:500]  # type: ignore[attr-defined]
-                store._nilm_device_count = len(self._nilm_learners)  # type: ignore[attr-defined]
+                store._nilm_clusters = all_clusters
+                store._nilm_transition_count = total_trans
+                store._nilm_transitions = all_transitions[:500]
+                store._nilm_device_count = len(self._nilm_learners)
         except Exception as e:
             logger.debug("NILM push failed: %s", e)
 
@@ -683,10 +815,8 @@ class BackgroundServiceManager:
                         _pw,
                     )
 
-            dev_map = {d.key: d for d in self.cfg.devices}
-
             def _switch(device_key: str, switch_id: int, on: bool) -> None:
-                dev = dev_map.get(device_key)
+                dev = self._device_maps()[0].get(device_key)
                 if dev is None or not getattr(dev, "host", ""):
                     raise RuntimeError(f"device {device_key!r} not found or no host")
                 set_switch_state(http_client, dev.host, int(switch_id), bool(on))
@@ -799,9 +929,8 @@ class BackgroundServiceManager:
 
         Cached for 60s. Falls back to pricing.co2_intensity_g_per_kwh (380).
         """
-        import time as _t
-        now = _t.time()
-        cached = getattr(self, "_co2_intensity_cache", None)
+        now = time.time()
+        cached = self._co2_intensity_cache
         if cached and (now - cached[0]) < 60:
             return cached[1]
         val = 0.0
@@ -832,9 +961,8 @@ class BackgroundServiceManager:
         """(net, effective) day-ahead price EUR/kWh, configured spot zone, 60s
         cache. effective = (net + total_markup_ct/100) * (1.19 if include_vat
         else 1.0) — mirrors the analyzer's own surcharge+VAT handling."""
-        import time as _t
-        now = _t.time()
-        cached = getattr(self, "_spot_price_cache", None)
+        now = time.time()
+        cached = self._spot_price_cache
         if cached and (now - cached[0]) < 60:
             return cached[1], cached[2]
         net = 0.0
@@ -874,6 +1002,26 @@ class BackgroundServiceManager:
         """Raw EPEX day-ahead exchange price (EUR/kWh, net, excl. surcharges)."""
         return self._spot_prices()[0]
 
+    def _unit_price_for(self, day: date) -> float:
+        """Gross unit price (EUR/kWh) of the tariff in effect on ``day``,
+        memoized per day on the identity of ``cfg.pricing``."""
+        pricing = self.cfg.pricing
+        if pricing is not self._unit_price_src:
+            self._unit_price_by_day = {}
+            self._unit_price_src = pricing
+        cache = self._unit_price_by_day
+        p = cache.get(day)
+        if p is None:
+            try:
+                p = float(pricing.effective_pricing_for_date(day).unit_price_gross())
+            except Exception:
+                p = float(getattr(pricing, "electricity_price_eur_per_kwh", 0.30) or 0.30)
+            # Keep cache small: only today + yesterday are ever needed.
+            if len(cache) >= 4:
+                cache.clear()
+            cache[day] = p
+        return p
+
     def _current_tariff_price(self) -> float:
         """Current effective consumer unit price (EUR/kWh, gross) the analyzer
         actually bills with — published so Home Assistant can use it as the
@@ -890,12 +1038,7 @@ class BackgroundServiceManager:
                     return float(v)
         except Exception:
             pass
-        try:
-            return float(self.cfg.pricing.effective_pricing_for_date(
-                date.today()).unit_price_gross())
-        except Exception:
-            return float(getattr(self.cfg.pricing,
-                                 "electricity_price_eur_per_kwh", 0.30) or 0.30)
+        return self._unit_price_for(date.today())
 
     def _start_co2_fetcher(self) -> None:
         """Start periodic CO₂ intensity fetch if enabled. Dispatches to
@@ -1182,101 +1325,84 @@ class BackgroundServiceManager:
 
     def _alerts_value(self, s: Any, metric: str) -> float:
         """Extract a numeric metric value from a live sample."""
-        m0 = (metric or "W").strip().upper()
-        m = m0.replace(" ", "").replace("Φ", "PHI")
-
-        phase = None
-        if m.endswith("_L1"):
-            phase = "a"; base = m[:-3]
-        elif m.endswith("_L2"):
-            phase = "b"; base = m[:-3]
-        elif m.endswith("_L3"):
-            phase = "c"; base = m[:-3]
-        else:
-            base = m
-
-        def _mean_abc(d: dict) -> float:
-            vals = [float(d.get(k, 0) or 0) for k in ("a", "b", "c") if float(d.get(k, 0) or 0) != 0]
-            if vals:
-                return sum(vals) / len(vals)
-            return float(d.get("total", 0) or 0)
-
-        def _sum_abc(d: dict) -> float:
-            s = sum(float(d.get(k, 0) or 0) for k in ("a", "b", "c"))
-            return s if s != 0 else float(d.get("total", 0) or 0)
-
-        if base in {"W", "P", "POWER"}:
-            d = getattr(s, "power_w", {}) or {}
-            return float(d.get(phase, 0) or 0) if phase else float(d.get("total", 0) or 0)
-        if base in {"V", "VOLT", "VOLTAGE"}:
-            d = getattr(s, "voltage_v", {}) or {}
-            return float(d.get(phase, 0) or 0) if phase else _mean_abc(d)
-        if base in {"A", "AMP", "CURRENT"}:
-            d = getattr(s, "current_a", {}) or {}
-            if m0 == "A_N":
+        parsed = _ALERT_METRICS.get(metric)
+        if parsed is None:
+            parsed = _parse_alert_metric(metric)
+            if len(_ALERT_METRICS) < 256:
+                _ALERT_METRICS[metric] = parsed
+        kind, phase = parsed
+        # One attribute read per evaluation; missing/None fields share _EMPTY.
+        d = getattr(s, _ALERT_FIELDS[kind], None) or _EMPTY
+        if phase:
+            return float(d.get(phase, 0) or 0)
+        if kind == "V":
+            return _mean_abc(d)
+        if kind == "A":
+            return _sum_abc(d)
+        return float(d.get("total", 0) or 0)
+
+    def _alert_rules_for(self, device_key: str) -> Tuple[Any, ...]:
+        """Enabled alert rules whose device_key is ``*`` or ``device_key``,
+        memoized per device on the identity of ``cfg.alerts``.
+
+        Each entry is ``(rule, devk, rid, op, cmp, thr, dur, cd, metric)`` so the
+        per-sample loop doesn't re-read and re-parse the rule fields."""
+        alerts = getattr(self.cfg, "alerts", None)
+        if alerts is not self._alert_rules_src:
+            self._alert_rules_by_key = {}
+            self._alert_rules_src = alerts
+        by_key = self._alert_rules_by_key
+        rules = by_key.get(device_key)
+        if rules is None:
+            picked = []
+            for r in (alerts or ()):
                 try:
-                    ia = float(d.get("a", 0) or 0)
-                    ib = float(d.get("b", 0) or 0)
-                    ic = float(d.get("c", 0) or 0)
-                    if ia > 0 or ib > 0 or ic > 0:
-                        inner = ia**2 + ib**2 + ic**2 - ia*ib - ib*ic - ia*ic
-                        return math.sqrt(max(0, inner))
+                    if not getattr(r, "enabled", True):
+                        continue
+                    devk = str(getattr(r, "device_key", "*") or "*").strip()
+                    if devk not in {"*", device_key}:
+                        continue
+                    metric = str(getattr(r, "metric", "W") or "W")
+                    rid = str(getattr(r, "rule_id", "") or "") or f"{devk}:{metric}"
+                    op = str(getattr(r, "op", ">") or ">").strip()
+                    picked.append((
+                        r, devk, rid, op, _ALERT_OPS.get(op, operator.gt),
+                        float(getattr(r, "threshold", 0) or 0),
+                        int(getattr(r, "duration_seconds", 10) or 0),
+                        int(getattr(r, "cooldown_seconds", 120) or 0),
+                        metric,
+                    ))
                 except Exception:
-                    pass
-                return 0.0
-            return float(d.get(phase, 0) or 0) if phase else _sum_abc(d)
-        if base in {"VAR", "Q", "REACTIVE"}:
-            d = getattr(s, "reactive_var", {}) or {}
-            return float(d.get(phase, 0) or 0) if phase else float(d.get("total", 0) or 0)
-        if base in {"COSPHI", "PF", "POWERFACTOR"}:
-            d = getattr(s, "cosphi", {}) or {}
-            return float(d.get(phase, 0) or 0) if phase else float(d.get("total", 0) or 0)
-        if base in {"HZ", "FREQ", "FREQUENCY"}:
-            return float((getattr(s, "freq_hz", {}) or {}).get("total", 0) or 0)
-        return float((getattr(s, "power_w", {}) or {}).get("total", 0) or 0)
+                    continue
+            rules = by_key[device_key] = tuple(picked)
+        return rules
 
     def _alerts_process_sample(self, s: Any) -> None:
         """Evaluate all configured alert rules against a live sample."""
-        rules = list(getattr(self.cfg, "alerts", []) or [])
+        rules = self._alert_rules_for(getattr(s, "device_key", ""))
         if not rules:
             return
         logger.debug("Evaluating %d alert rules for %s", len(rules), getattr(s, "device_key", "?"))
 
-        for r in rules:
+        now_ts = int(getattr(s, "ts", 0) or 0)
+        alert_state = self._alert_state
+        for r, devk, rid, op, cmp, thr, dur, cd, metric in rules:
             try:
-                if not getattr(r, "enabled", True):
-                    continue
-                devk = str(getattr(r, "device_key", "*") or "*").strip()
-                if devk not in {"*", getattr(s, "device_key", "")}:
-                    continue
-
-                rid = str(getattr(r, "rule_id", "") or "") or f"{devk}:{getattr(r, 'metric', 'W')}"
-                op = str(getattr(r, "op", ">") or ">").strip()
-                thr = float(getattr(r, "threshold", 0) or 0)
-                dur = int(getattr(r, "duration_seconds", 10) or 0)
-                cd = int(getattr(r, "cooldown_seconds", 120) or 0)
-                metric = str(getattr(r, "metric", "W") or "W")
                 val = self._alerts_value(s, metric)
 
-                cond = (
-                    (val > thr) if op == ">" else
-                    (val < thr) if op == "<" else
-                    (val >= thr) if op in {">=", "=>"} else
-                    (val <= thr) if op in {"<=", "=<"} else
-                    (val == thr) if op in {"=", "=="} else
-                    (val > thr)
-                )
-
-                st = self._alert_state.setdefault(rid, {"start_ts": None, "triggered": False, "last_trigger_ts": 0})
-                if not cond:
+                # get() first: setdefault() would build the default dict on
+                # every evaluation, not just the first one per rule.
+                st = alert_state.get(rid)
+                if st is None:
+                    st = alert_state[rid] = {"start_ts": None, "triggered": False, "last_trigger_ts": 0}
+                if not cmp(val, thr):
                     st["start_ts"] = None
                     st["triggered"] = False
                     continue
                 if st["start_ts"] is None:
-                    st["start_ts"] = int(getattr(s, "ts", 0) or 0)
+                    st["start_ts"] = now_ts
                 if st.get("triggered"):
                     continue
-                now_ts = int(getattr(s, "ts", 0) or 0)
                 if dur > 0 and (now_ts - int(st["start_ts"] or now_ts)) < dur:
                     continue
                 if cd > 0 and (now_ts - int(st.get("last_trigger_ts", 0) or 0)) < cd:
@@ -1291,7 +1417,7 @@ class BackgroundServiceManager:
                 msg = msg_custom or f"Alert: {devname} – {metric} {op} {thr} (value: {round(val, 2)})"
 
                 # Build detailed message
-                ts_str = datetime.fromtimestamp(now_ts).strftime("%Y-%m-%d %H:%M:%S")
+                ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now_ts))
                 detail_msg = (
                     f"🚨 Shelly Alert\n"
                     f"Time: {ts_str}\n"
@@ -1613,7 +1739,6 @@ class BackgroundServiceManager:
     def _query_device_hourly(self, device_key: str, start_ts: int, end_ts: int):
         """Query hourly data for a device. Returns DataFrame with kwh, avg_power_w, hour_ts."""
         try:
-            import pandas as pd
             df = self.storage.db.query_hourly(device_key, start_ts=start_ts, end_ts=end_ts)
             if df is not None and not df.empty:
                 return df
@@ -2487,10 +2612,8 @@ class BackgroundServiceManager:
     def _style_dark_ax(self, ax) -> None:
         ax.set_facecolor("#0b0f14")
         ax.tick_params(colors="#9fb0c3", labelsize=7)
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
-        for spine in ax.spines.values():
-            spine.set_color("#333")
+        ax.spines[["top", "right"]].set_visible(False)
+        ax.spines[:].set_color("#333")
 
     def _generate_summary_chart(self, chart_type: str, data: Optional[Dict[str, Any]] = None) -> Optional[Path]:
         """Generate a 4-panel summary chart as PNG. Returns path or None.
@@ -2518,6 +2641,8 @@ class BackgroundServiceManager:
             return None
 
     def _render_daily_chart(self, data: Dict[str, Any], plt) -> Optional[Path]:
+        from shelly_analyzer.services.export import tight_layout_once
+
         fig, axes = plt.subplots(2, 2, figsize=(11, 7), facecolor="#121821")
         for row in axes:
             for ax in row:
@@ -2613,14 +2738,19 @@ class BackgroundServiceManager:
             f"Shelly Energy Analyzer · Daily Report · {data['date_label']}",
             color="#e8eef6", fontsize=13, fontweight="bold", y=0.995,
         )
-        plt.tight_layout(pad=1.2, rect=(0, 0, 1, 0.96))
+        # tight_layout_once is the single layout pass; bbox_inches="tight" or the
+        # engine tight_layout leaves behind would make savefig lay out the whole
+        # 4-panel figure once more before rendering it.
+        tight_layout_once(fig, pad=1.2, rect=(0, 0, 1, 0.96))
         out = self.out_dir / "data" / "runtime" / "summary_daily.png"
         out.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(str(out), dpi=150, bbox_inches="tight", facecolor="#121821")
+        fig.savefig(str(out), dpi=150, facecolor="#121821")
         plt.close(fig)
         return out
 
     def _render_monthly_chart(self, data: Dict[str, Any], plt) -> Optional[Path]:
+        from shelly_analyzer.services.export import tight_layout_once
+
         fig, axes = plt.subplots(2, 2, figsize=(11, 7), facecolor="#121821")
         for row in axes:
             for ax in row:
@@ -2658,9 +2788,8 @@ class BackgroundServiceManager:
                 wedgeprops={"width": 0.4, "edgecolor": "#0b0f14"},
                 textprops={"color": "#e8eef6", "fontsize": 7},
             )
-            for at in autotexts:
-                at.set_fontsize(7)
-                at.set_color("#ffffff")
+            # textprops already sets fontsize 7; only the % labels turn white.
+            plt.setp(autotexts, color="#ffffff")
             ax2.set_title(
                 f"Device share – {data['total_kwh']:.0f} kWh",
                 color="#e8eef6", fontsize=11, fontweight="bold",
@@ -2701,10 +2830,10 @@ class BackgroundServiceManager:
             f"Shelly Energy Analyzer · Monthly Report · {data['month_label']}",
             color="#e8eef6", fontsize=13, fontweight="bold", y=0.995,
         )
-        plt.tight_layout(pad=1.2, rect=(0, 0, 1, 0.96))
+        tight_layout_once(fig, pad=1.2, rect=(0, 0, 1, 0.96))
         out = self.out_dir / "data" / "runtime" / "summary_monthly.png"
         out.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(str(out), dpi=150, bbox_inches="tight", facecolor="#121821")
+        fig.savefig(str(out), dpi=150, facecolor="#121821")
         plt.close(fig)
         return out
 
@@ -1,8 +1,7 @@
 """API endpoints for POST actions: /api/run, /api/set_window."""
 from __future__ import annotations
 
-import json
-from typing import Any, Dict, Optional
+from typing import Optional
 
 from flask import Blueprint, current_app, jsonify, request
 
@@ -1,7 +1,6 @@
 """API endpoints for data: costs, heatmap, solar, co2, compare, etc."""
 from __future__ import annotations
 
-from urllib.parse import parse_qs, urlparse
 from typing import Any, Dict
 
 from flask import Blueprint, current_app, jsonify, request
@@ -5,7 +5,8 @@ import json
 import math
 import time as _time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List
 
 from flask import Blueprint, Response, current_app, jsonify, request
 
@@ -18,9 +19,16 @@ bp = Blueprint("api_state", __name__)
 _SYNTH_KEYS = ("pv", "battery", "grid_ext")
 
 
+@lru_cache(maxsize=64)
+def _synth_name(lang: str, dkey: str) -> str:
+    # Translation tables are static after import → safe to memoize; /api/state
+    # is polled every second per open tab.
+    return _t(lang, "live.synth." + dkey)
+
+
 def _device_name(meta: Dict[str, Any], dkey: str, lang: str) -> str:
     if not meta.get("name") and dkey in _SYNTH_KEYS:
-        return _t(lang, "live.synth." + dkey)
+        return _synth_name(lang, dkey)
     return str(meta.get("name") or dkey)
 
 
@@ -171,12 +179,9 @@ def api_state():
 
     appliances_map: Dict[str, List[Any]] = raw_snap.get("_appliances", {})
     switch_states_map: Dict[str, Any] = raw_snap.get("_switch_states", {})
-    dev_meta_by_key: Dict[str, Dict[str, Any]] = {
-        d.get("key", ""): d
-        for d in (state.devices_meta or [])
-        if isinstance(d, dict) and d.get("key")
-    }
+    dev_meta_by_key: Dict[str, Dict[str, Any]] = state.devices_meta_by_key
 
+    lang = getattr(state, "lang", "en")
     devices_list: List[Dict[str, Any]] = []
     for dkey, points in raw_snap.items():
         if dkey.startswith("_") or not isinstance(points, list) or not points:
@@ -187,7 +192,7 @@ def api_state():
             continue
         latest: Dict[str, Any] = points[-1]
         meta = dev_meta_by_key.get(dkey, {})
-        name = _device_name(meta, dkey, getattr(state, "lang", "en"))
+        name = _device_name(meta, dkey, lang)
 
         va = float(latest.get("va") or 0)
         vb = float(latest.get("vb") or 0)
@@ -267,7 +272,7 @@ def api_state():
             continue
         devices_list.append({
             "key": k,
-            "name": _device_name(m, k, getattr(state, "lang", "en")),
+            "name": _device_name(m, k, lang),
             "kind": str(m.get("kind") or "em"),
             "power_w": 0.0,
             "today_kwh": 0.0,
@@ -297,10 +302,8 @@ def api_state():
     _raw_view = str(request.args.get("raw", "")).strip().lower() in ("1", "true", "yes", "on")
     if not _raw_view:
         try:
-            from shelly_analyzer.services.net_display import (
-                net_display_children, apply_live_subtraction)
-            _cfg = getattr(state, "cfg", None)
-            _submap = net_display_children(getattr(_cfg, "devices", []) or []) if _cfg else {}
+            from shelly_analyzer.services.net_display import apply_live_subtraction
+            _submap = state.net_display_submap()
             if _submap:
                 apply_live_subtraction(devices_list, _submap)
         except Exception:
@@ -441,10 +444,8 @@ def api_history():
     _raw_view = str(request.args.get("raw", "")).strip().lower() in ("1", "true", "yes", "on")
     if not _raw_view:
         try:
-            from shelly_analyzer.services.net_display import (
-                net_display_children, apply_history_subtraction)
-            _cfg = getattr(state, "cfg", None)
-            _submap = net_display_children(getattr(_cfg, "devices", []) or []) if _cfg else {}
+            from shelly_analyzer.services.net_display import apply_history_subtraction
+            _submap = state.net_display_submap()
             if _submap:
                 apply_history_subtraction(hist, _submap)
         except Exception:
@@ -30,7 +30,7 @@ def index():
     state = _get_state()
     # First-run: no devices configured AND wizard not explicitly dismissed
     try:
-        devs = list(getattr(state.cfg, "devices", []) or [])
+        devs = getattr(state.cfg, "devices", None) or ()
         if not devs and request.args.get("skip_wizard") != "1":
             # Safety: if config on disk has devices but state lost them (e.g. after
             # a settings save that didn't preserve the devices list), reload first.
@@ -38,12 +38,11 @@ def index():
                 from shelly_analyzer.io.config import load_config
                 cfg_path = getattr(state, "_cfg_path", None)
                 if cfg_path:
-                    from pathlib import Path
                     fresh = load_config(str(cfg_path))
                     if fresh.devices:
                         state.cfg = fresh
                         state.reload_config(fresh)
-                        devs = list(fresh.devices)
+                        devs = fresh.devices
             except Exception:
                 pass
             if not devs:
@@ -51,7 +50,7 @@ def index():
                 return redirect("/setup")
     except Exception:
         pass
-    return _gzip_response(state._dashboard_html, state._dashboard_html_gz)
+    return _gzip_response(*state.page_html("dashboard"))
 
 
 @bp.route("/setup")
@@ -71,14 +70,14 @@ def setup_page():
 @bp.route("/plots/<path:subpath>")
 def plots(subpath=None):
     state = _get_state()
-    return _gzip_response(state._plots_html, state._plots_html_gz)
+    return _gzip_response(*state.page_html("plots"))
 
 
 @bp.route("/control")
 @bp.route("/control/<path:subpath>")
 def control(subpath=None):
     state = _get_state()
-    return _gzip_response(state._control_html, state._control_html_gz)
+    return _gzip_response(*state.page_html("control"))
 
 
 @bp.route("/settings")
@@ -103,12 +102,19 @@ def setup_enable_demo():
     state = _get_state()
     try:
         scenario = (request.get_json(silent=True) or {}).get("scenario", "household")
-        new_demo = DemoConfig(enabled=True, seed=1234, scenario=str(scenario or "household"))
+        scenario = str(scenario or "household")
+        cur_demo = state.cfg.demo
+        if cur_demo.enabled and cur_demo.scenario == scenario:
+            new_demo = cur_demo
+        else:
+            new_demo = DemoConfig(enabled=True, seed=1234, scenario=scenario)
         existing_keys = {d.key for d in (state.cfg.devices or [])}
-        new_devices = list(state.cfg.devices or [])
-        for d in default_demo_devices():
-            if d.key not in existing_keys:
-                new_devices.append(d)
+        missing = [d for d in default_demo_devices() if d.key not in existing_keys]
+        # Re-clicking "demo" in the wizard: nothing to change → skip the
+        # config write and the full service reload.
+        if new_demo is cur_demo and not missing:
+            return Response('{"ok": true, "devices_added": 0}', content_type="application/json")
+        new_devices = list(state.cfg.devices or []) + missing
         new_cfg = replace(state.cfg, demo=new_demo, devices=new_devices)
         cfg_path = getattr(state, "_cfg_path", None)
         if cfg_path:
@@ -117,7 +123,7 @@ def setup_enable_demo():
         if hasattr(state, "reload_config"):
             state.reload_config(new_cfg)
         return Response(
-            '{"ok": true, "devices_added": ' + str(len(new_devices) - len(existing_keys)) + '}',
+            '{"ok": true, "devices_added": ' + str(len(missing)) + '}',
             content_type="application/json",
         )
     except Exception as e:
@@ -1,7 +1,6 @@
 """Device management API: CRUD + discovery."""
 from __future__ import annotations
 
-import json
 import logging
 from dataclasses import replace
 from pathlib import Path
@@ -10,12 +9,10 @@ from typing import Any, Dict, List
 from flask import Blueprint, current_app, jsonify, request
 
 from shelly_analyzer.io.config import (
-    AppConfig,
     CompensationEntry,
     DeviceConfig,
     MainMeter,
     MeterReading,
-    load_config,
     save_config,
 )
 from shelly_analyzer.i18n import t as _t
@@ -276,28 +273,46 @@ def discover_devices():
         existing_hosts = {(d.host or "").strip().lower() for d in _get_state().cfg.devices}
         devices = []
         for r in results:
-            host = getattr(r, "host", "") or ""
-            name = getattr(r, "name", "") or ""
-            # Derive a stable key from the mDNS instance name (e.g. shellyem-84CCA8C1...)
-            key = name.lower()
-            gen = int(getattr(r, "gen", 0) or 0)
-            model = getattr(r, "model", "") or ""
-            d = {
+            # MdnsShelly is a dataclass → read its fields directly instead of
+            # a getattr-with-default chain per discovered device.
+            host = r.host or ""
+            if not host:
+                continue
+            name = r.name or ""
+            gen = r.gen
+            if not isinstance(gen, int):
+                gen = int(gen or 0)
+            devices.append({
                 "host": host,
                 "name": name,
-                "key": key,
+                # Derive a stable key from the mDNS instance name (e.g. shellyem-84CCA8C1...)
+                "key": name.lower(),
                 "kind": "em",
                 "gen": gen,
-                "model": model,
+                "model": r.model or "",
                 "already_added": host.strip().lower() in existing_hosts,
-            }
-            if host:
-                devices.append(d)
+            })
         return jsonify({"ok": True, "devices": devices})
     except Exception as e:
         return jsonify({"ok": False, "error": str(e), "devices": []})
 
 
+def _discovered_to_dict(result) -> Dict[str, Any]:
+    """DiscoveredDevice is a dataclass → expose as dict for the JSON response."""
+    return {
+        "host": result.host,
+        "gen": int(result.gen),
+        "model": result.model,
+        "kind": result.kind,
+        "component_id": int(result.component_id),
+        "phases": int(result.phases),
+        "supports_emdata": bool(result.supports_emdata),
+        "product_name": getattr(result, "product_name", "") or "",
+        "category": getattr(result, "category", "") or "",
+        "series": getattr(result, "series", "") or "",
+    }
+
+
 @bp.route("/api/devices/probe", methods=["POST"])
 def probe_device_endpoint():
     """Probe a specific IP/host for a Shelly device.
@@ -305,14 +320,38 @@ def probe_device_endpoint():
     Optionally accepts ``username`` + ``password`` for password-protected
     devices. Returns ``{ok: false, error: 'auth_required'}`` with HTTP 401
     when the device responded with a 401 and no credentials were supplied.
+
+    A ``hosts`` list (or comma/whitespace separated string) probes all of
+    them concurrently and returns ``{ok, devices: [...], errors: {host: msg}}``;
+    hosts that are already configured are flagged with ``already_added``.
     """
     try:
         body = request.get_json(silent=True) or {}
+        username = str(body.get("username", "admin") or "admin")
+        password = str(body.get("password", "") or "")
+
+        hosts = body.get("hosts")
+        if hosts:
+            if isinstance(hosts, str):
+                hosts = hosts.replace(",", " ").replace(";", " ").split()
+            from shelly_analyzer.services.discovery import probe_devices
+            results = probe_devices(hosts, username=username, password=password)
+            # Only membership is needed → a host set, not a host→DeviceConfig map.
+            existing_hosts = {(d.host or "").strip().lower() for d in _get_state().cfg.devices}
+            devices: List[Dict[str, Any]] = []
+            errors: Dict[str, str] = {}
+            for h, res in results.items():
+                if isinstance(res, Exception):
+                    errors[h] = str(res)
+                    continue
+                info = _discovered_to_dict(res)
+                info["already_added"] = h.lower() in existing_hosts
+                devices.append(info)
+            return jsonify({"ok": True, "devices": devices, "errors": errors})
+
         host = str(body.get("host", "") or "").strip()
         if not host:
             return jsonify({"ok": False, "error": "host is required"}), 400
-        username = str(body.get("username", "admin") or "admin")
-        password = str(body.get("password", "") or "")
 
         from shelly_analyzer.services.discovery import probe_device
         try:
@@ -325,19 +364,7 @@ def probe_device_endpoint():
                     "message": f"{host} is password-protected. Provide username and password.",
                 }), 401
             return jsonify({"ok": False, "error": f"No Shelly at {host}: {ve}"})
-        # DiscoveredDevice is a dataclass → expose as dict for the JSON response
-        return jsonify({"ok": True, "device": {
-            "host": result.host,
-            "gen": int(result.gen),
-            "model": result.model,
-            "kind": result.kind,
-            "component_id": int(result.component_id),
-            "phases": int(result.phases),
-            "supports_emdata": bool(result.supports_emdata),
-            "product_name": getattr(result, "product_name", "") or "",
-            "category": getattr(result, "category", "") or "",
-            "series": getattr(result, "series", "") or "",
-        }})
+        return jsonify({"ok": True, "device": _discovered_to_dict(result)})
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)})
 
@@ -380,7 +407,7 @@ def devices_kwh():
 def update_firmware(key: str):
     """Trigger firmware update for a device."""
     state = _get_state()
-    d = next((d for d in state.cfg.devices if d.key == key), None)
+    d = state.device_by_key(key)
     if not d:
         return jsonify({"ok": False, "error": f"Device '{key}' not found"}), 404
 
@@ -508,7 +535,7 @@ def calibrate_compensation():
     db = state.storage.db
 
     def _raw_kwh(dkey: str) -> float:
-        dev = next((x for x in state.cfg.devices if x.key == dkey), None)
+        dev = state.device_by_key(dkey)
         cf = 1.0 + float(getattr(dev, "compensation_percent", 0.0) or 0.0) / 100.0 if dev else 1.0
         try:
             dfh = db.query_hourly(dkey, start_ts=t0, end_ts=t1)
@@ -540,7 +567,7 @@ def calibrate_compensation():
 # ── Time-stamped calibration history ──────────────────────────────────────
 
 def _comp_history_for_device(state, device_key: str) -> List[CompensationEntry]:
-    d = next((x for x in state.cfg.devices if x.key == device_key), None)
+    d = state.device_by_key(device_key)
     if d is None:
         return []
     return list(getattr(d, "compensation_history", ()) or ())
@@ -606,7 +633,7 @@ def add_compensation_history():
     device_key = str(body.get("device", "")).strip()
     if not device_key:
         return jsonify({"ok": False, "error": "missing device"}), 400
-    dev = next((x for x in state.cfg.devices if x.key == device_key), None)
+    dev = state.device_by_key(device_key)
     if dev is None:
         return jsonify({"ok": False, "error": f"unknown device {device_key}"}), 404
 
@@ -738,7 +765,7 @@ def _raw_kwh_over(state, db, dkey: str, t0: int, t1: int) -> float:
             dfh = db.query_hourly(dkey, start_ts=t0, end_ts=t1, compensate=False)
         except TypeError:
             # DB without the compensate kwarg → undo the current scalar factor.
-            dev = next((x for x in state.cfg.devices if x.key == dkey), None)
+            dev = state.device_by_key(dkey)
             cf = 1.0 + float(getattr(dev, "compensation_percent", 0.0) or 0.0) / 100.0 if dev else 1.0
             dfh = db.query_hourly(dkey, start_ts=t0, end_ts=t1)
             if dfh is not None and not dfh.empty and "kwh" in dfh.columns:
@@ -786,7 +813,7 @@ def _comp_kwh_over(state, db, dkey: str, t0: int, t1: int) -> float:
     except TypeError:
         # DB without the compensate kwarg → apply the scalar factor to raw.
         raw = _raw_kwh_over(state, db, dkey, t0, t1)
-        dev = next((x for x in state.cfg.devices if x.key == dkey), None)
+        dev = state.device_by_key(dkey)
         cf = 1.0 + float(getattr(dev, "compensation_percent", 0.0) or 0.0) / 100.0 if dev else 1.0
         return raw * (cf or 1.0)
     except Exception:
@@ -94,7 +94,7 @@ def health_all():
 def trigger_firmware_update(device_key: str):
     """Trigger OTA firmware update for a Shelly device."""
     state = _get_state()
-    d = next((d for d in state.cfg.devices if d.key == device_key), None)
+    d = state.device_by_key(device_key)
     if not d:
         return jsonify({"ok": False, "error": "Device not found"}), 404
 
@@ -160,7 +160,7 @@ def trigger_firmware_update(device_key: str):
 def health_device(device_key: str):
     """Ping a single device."""
     state = _get_state()
-    d = next((d for d in state.cfg.devices if d.key == device_key), None)
+    d = state.device_by_key(device_key)
     if not d:
         return jsonify({"ok": False, "error": "Device not found"}), 404
 
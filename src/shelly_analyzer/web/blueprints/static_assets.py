@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from flask import Blueprint, Response, current_app, jsonify, request, send_file
+from flask import Blueprint, Response, current_app, jsonify, request
 
 bp = Blueprint("static_assets", __name__)
 logger = logging.getLogger(__name__)
@@ -39,10 +39,16 @@ def plotly_js():
             status=404,
             content_type="application/javascript; charset=utf-8",
         )
+    headers = {"Cache-Control": "public, max-age=3600", "Vary": "Accept-Encoding"}
+    if "gzip" in (request.headers.get("Accept-Encoding") or "").lower():
+        gz = state.get_plotly_js_gz()
+        if gz:
+            body = gz
+            headers["Content-Encoding"] = "gzip"
     return Response(
         body,
         content_type="application/javascript; charset=utf-8",
-        headers={"Cache-Control": "public, max-age=3600"},
+        headers=headers,
     )
 
 
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict
 
 from flask import Blueprint, current_app, jsonify, request
 
@@ -2,8 +2,6 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import asdict
-from typing import Any, Dict
 
 from flask import Blueprint, current_app, jsonify, request
 
@@ -155,7 +153,6 @@ def compute_bills():
         if tariff_mode == "dynamic":
             try:
                 import datetime as _dt
-                from shelly_analyzer.io.config import SpotPriceConfig
                 spot_cfg = getattr(state.cfg, "spot_price", None)
                 if spot_cfg is not None:
                     zone = str(getattr(spot_cfg, "bidding_zone", "DE-LU") or "DE-LU")
@@ -263,7 +260,6 @@ def export_tenant_invoice():
     try:
         from pathlib import Path
         from datetime import date as _date, timedelta as _td
-        from shelly_analyzer.io.config import TenantDef as CfgTenantDef
         from shelly_analyzer.services.tenant import (
             generate_tenant_bills,
             TenantDef as SvcTenantDef,
@@ -9,7 +9,6 @@ import tempfile
 import threading
 import urllib.request
 import zipfile
-from dataclasses import asdict
 from pathlib import Path
 
 from flask import Blueprint, current_app, jsonify, request
@@ -20,7 +19,6 @@ from shelly_analyzer.services.updater import (
     check_latest_release,
     fetch_releases,
     is_newer,
-    parse_version,
 )
 
 logger = logging.getLogger(__name__)
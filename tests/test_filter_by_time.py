@@ -0,0 +1,60 @@
+"""filter_by_time: the bisect fast path matches the boolean-mask semantics.
+
+Regression guard for the sorted-timestamp fast path — both bounds stay
+inclusive, unsorted frames still go through the masks, and the result is
+always a copy.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from shelly_analyzer.core.energy import filter_by_time
+
+
+def _masked(df, start, end):
+    m = pd.Series(True, index=df.index)
+    if start is not None:
+        m &= df["timestamp"] >= start
+    if end is not None:
+        m &= df["timestamp"] <= end
+    return df.loc[m]
+
+
+def _make_df(shuffle=False):
+    ts = pd.to_datetime(np.arange(0, 86400, 60), unit="s")
+    df = pd.DataFrame({"timestamp": ts, "total_power": np.arange(len(ts), dtype=float)})
+    if shuffle:
+        df = df.sample(frac=1.0, random_state=0)
+    return df
+
+
+def test_sorted_matches_masks_with_inclusive_bounds():
+    df = _make_df()
+    cases = [
+        (pd.Timestamp(3600, unit="s"), pd.Timestamp(7200, unit="s")),  # exact sample hits
+        (pd.Timestamp(3630, unit="s"), pd.Timestamp(7230, unit="s")),  # between samples
+        (None, pd.Timestamp(600, unit="s")),
+        (pd.Timestamp(86000, unit="s"), None),
+        (pd.Timestamp(-10, unit="s"), pd.Timestamp(10**6, unit="s")),
+        (pd.Timestamp(5000, unit="s"), pd.Timestamp(4000, unit="s")),  # empty
+    ]
+    for start, end in cases:
+        got = filter_by_time(df, start, end)
+        assert got.equals(_masked(df, start, end)), (start, end)
+
+
+def test_unsorted_falls_back_to_masks():
+    df = _make_df(shuffle=True)
+    start, end = pd.Timestamp(3600, unit="s"), pd.Timestamp(7200, unit="s")
+    assert filter_by_time(df, start, end).equals(_masked(df, start, end))
+
+
+def test_result_is_a_copy():
+    df = _make_df()
+    out = filter_by_time(df, pd.Timestamp(0, unit="s"), pd.Timestamp(600, unit="s"))
+    out["total_power"] = -1.0
+    assert (df["total_power"] >= 0).all()
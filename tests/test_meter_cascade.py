@@ -78,6 +78,9 @@ class _FakeState:
     def reload_config(self, cfg):
         pass
 
+    def device_by_key(self, key):
+        return next((d for d in self.cfg.devices if d.key == key), None)
+
 
 def _app(cfg, db):
     state = _FakeState(cfg, db, os.path.join(tempfile.mkdtemp(), "config.json"))
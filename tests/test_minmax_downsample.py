@@ -0,0 +1,46 @@
+"""_minmax_downsample: plot series are capped without losing their extremes.
+
+Regression guard for the plots-data reduction — short series pass through,
+long ones stay within the point budget, keep every bucket's min/max sample
+(so a single spike is still plotted) and remain in timestamp order.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from shelly_analyzer.web.action_dispatch import _minmax_downsample
+
+
+def _series(n, step_s=10):
+    idx = pd.to_datetime(np.arange(n) * step_s, unit="s")
+    rng = np.random.default_rng(0)
+    return pd.Series(500.0 + rng.normal(0.0, 20.0, n), index=idx)
+
+
+def test_short_series_unchanged():
+    s = _series(2500)
+    assert _minmax_downsample(s, 2500) is s
+
+
+def test_long_series_capped_sorted_and_keeps_extremes():
+    s = _series(100_000)
+    s.iloc[54_321] = 9_000.0   # one-sample spike
+    s.iloc[12_345] = -3_000.0  # one-sample dip
+    out = _minmax_downsample(s, 2000)
+    assert len(out) <= 2000
+    assert out.index.is_monotonic_increasing
+    assert out.max() == 9_000.0 and out.min() == -3_000.0
+    # Every kept sample is an original (timestamp, value) pair.
+    assert out.equals(s.loc[out.index])
+
+
+def test_nan_samples_dropped_when_reduced():
+    s = _series(10_000)
+    s.iloc[::7] = np.nan
+    out = _minmax_downsample(s, 1000)
+    assert len(out) <= 1000
+    assert not out.isna().any()
@@ -0,0 +1,52 @@
+"""_net_of_children: meter-behind-meter netting of the power timeseries view.
+
+Regression guard for netting on long ranges — the plots data used to net
+parent and child after min/max reduction, where each series keeps its extremes
+at its own timestamps and most parent samples found no child within the
+alignment tolerance (so the "net" curve stayed close to gross).
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from shelly_analyzer.web.action_dispatch import _minmax_downsample, _net_of_children
+
+
+def _pair(days, step_s=60):
+    n = days * 86400 // step_s
+    rng = np.random.default_rng(0)
+    t = np.arange(n) * step_s
+    child_w = 300.0 + rng.normal(0.0, 80.0, n)
+    # Parent = child + 100 W base load, own sample times and independent noise.
+    parent = pd.Series(child_w + 100.0 + rng.normal(0.0, 10.0, n),
+                       index=pd.to_datetime(t + 7, unit="s"))
+    child = pd.Series(child_w, index=pd.to_datetime(t, unit="s"))
+    return parent, child
+
+
+def test_netted_long_range_is_parent_minus_child():
+    for days in (30, 365):
+        parent, child = _pair(days)
+        net = _minmax_downsample(_net_of_children(parent, [child]))
+        assert len(net) <= 2500
+        # min/max keeps noise extremes, so compare against the spread.
+        assert abs(float(net.mean()) - 100.0) < 10.0, days
+        assert float(net.max()) < 200.0, days
+
+
+def test_samples_without_child_nearby_stay_gross():
+    parent, child = _pair(1)
+    child = child[child.index >= child.index[len(child) // 2]]
+    net = _net_of_children(parent, [child])
+    half = parent.index < child.index[0] - pd.Timedelta("180s")
+    assert net[half].equals(parent[half])
+    assert abs(float(net[~half].mean()) - 100.0) < 2.0
+
+
+def test_empty_and_missing_children_are_ignored():
+    parent, _ = _pair(1)
+    assert _net_of_children(parent, [pd.Series(dtype="float64"), None]).equals(parent)
@@ -0,0 +1,49 @@
+"""generate_metrics: /metrics renders device and per-phase gauges.
+
+Regression guard for the Prometheus exporter — it must accept the dict from
+LiveStateStore.snapshot() (it used to call .snapshot() on it and emit only the
+HELP/TYPE headers) and read the per-phase pa/va/ia row keys; switches have no
+phases and get no phase lines.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from shelly_analyzer.io.config import DeviceConfig
+from shelly_analyzer.services.prometheus_export import generate_metrics
+from shelly_analyzer.services.webdash import LivePoint, LiveStateStore
+
+
+def _metrics():
+    store = LiveStateStore()
+    store.update("em1", LivePoint(
+        ts=1_700_000_000, power_total_w=900.0,
+        va=230.0, vb=231.0, vc=232.0, ia=1.0, ib=2.0, ic=3.0,
+        pa=200.0, pb=300.0, pc=400.0, freq_hz=50.0,
+    ))
+    store.update("sw1", LivePoint(
+        ts=1_700_000_000, power_total_w=42.0,
+        va=229.0, vb=0.0, vc=0.0, ia=0.2, ib=0.0, ic=0.0, pa=42.0,
+    ))
+    devices = [
+        DeviceConfig(key="em1", name="House", host="10.0.0.2", kind="em", phases=3),
+        DeviceConfig(key="sw1", name="Plug", host="10.0.0.3", kind="switch", phases=1),
+    ]
+    return generate_metrics(store.snapshot(), devices, None).splitlines()
+
+
+def test_device_and_phase_lines_from_snapshot():
+    lines = _metrics()
+    assert 'shelly_power_watts{device="em1",name="House"} 900.0' in lines
+    assert 'shelly_frequency_hz{device="em1",name="House"} 50.0' in lines
+    assert 'shelly_power_watts{device="em1",name="House",phase="a"} 200.0' in lines
+    assert 'shelly_power_watts{device="em1",name="House",phase="c"} 400.0' in lines
+    assert 'shelly_voltage_volts{device="em1",name="House",phase="a"} 230.0' in lines
+    assert 'shelly_current_amps{device="em1",name="House",phase="b"} 2.0' in lines
+
+
+def test_switch_gets_no_phase_lines():
+    lines = _metrics()
+    assert 'shelly_power_watts{device="sw1",name="Plug"} 42.0' in lines
+    assert not [ln for ln in lines if 'device="sw1"' in ln and "phase=" in ln]